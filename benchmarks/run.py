@@ -0,0 +1,247 @@
+"""
+Benchmarks of the parsers and loaders on a synthetic match.
+
+Each benchmark reports its best wall time over `--repeat` runs and its peak
+traced memory (from a separate run under tracemalloc). Results can be saved
+with `--output` and compared against a previous run with `--baseline`; the
+exit code is 1 if any benchmark regressed by more than `--tolerance`.
+
+    python -m benchmarks.run --players 100 --output bench.json
+    python -m benchmarks.run --players 100 --baseline bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.synthetic import generate_match
+
+
+MATCH_ID = "synthetic"
+
+# Optional third-party packages; a benchmark that needs a missing one is
+# skipped. Any other import error (e.g. a broken first-party import) fails.
+OPTIONAL_DEPENDENCIES = {"boto3", "botocore", "duckdb", "orjson", "pyarrow", "simdjson"}
+
+
+class BenchContext:
+    """Working directory of a benchmark run, holding the synthetic match."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.match_id = MATCH_ID
+        self.match_dir = root / "data" / "raw" / f"match_{MATCH_ID}"
+        self._databases = 0
+
+    def read_log(self, name: str):
+        with open(self.match_dir / f"{name}.json", "r") as f:
+            return json.load(f)
+
+    def new_session(self):
+        """Returns a session on a new, empty embedded SQLite database."""
+        from etl.db.models import Base, get_engine, get_session
+
+        self._databases += 1
+        url = f"sqlite:///{self.root / f'bench_{self._databases}.db'}"
+        Base.metadata.create_all(get_engine(url))
+        return get_session(url)
+
+
+# Each benchmark does its setup and returns the callable to time
+
+def bench_parse_damage_dealt(ctx: BenchContext) -> Callable:
+    from etl.parsing.match_parsing import parse_damage_dealt
+    return lambda: parse_damage_dealt(ctx.match_id)
+
+
+def bench_parse_elims(ctx: BenchContext) -> Callable:
+    from etl.parsing.match_parsing import parse_elims
+    return lambda: parse_elims(ctx.match_id)
+
+
+def bench_parse_assists(ctx: BenchContext) -> Callable:
+    from etl.parsing.match_parsing import parse_assists
+    return lambda: parse_assists(ctx.match_id)
+
+
+def bench_get_match_object(ctx: BenchContext) -> Callable:
+    from etl.parsing.replay_parsing import get_match_object
+    return lambda: get_match_object(ctx.match_id, hz=20)
+
+
+def bench_hit_attempts(ctx: BenchContext) -> Callable:
+    from etl.parsing.match_parsing import excluded_player_ids
+    from etl.parsing.shot_attempts_vectorized import get_hit_attempt_events
+
+    # the detection reads the legacy wrapped logs and a teammate map
+    players = ctx.read_log("players")["players"]
+    teammates = {
+        p["epicId"]: [q["epicId"] for q in players if q["teamIndex"] == p["teamIndex"]]
+        for p in players
+    }
+    movement_path = ctx.root / "hit_attempts_movement.json"
+    shots_path = ctx.root / "hit_attempts_shots.json"
+    movement_path.write_text(json.dumps({"events": ctx.read_log("movement_events")}))
+    shots_path.write_text(json.dumps({"hitscanEvents": ctx.read_log("shot_events")}))
+    (ctx.root / "data" / "processed").mkdir(parents=True, exist_ok=True)
+    (ctx.root / "data" / "processed" / "test_teammate_map.json").write_text(json.dumps(teammates))
+
+    excluded = excluded_player_ids(ctx.match_id)
+    return lambda: get_hit_attempt_events(str(shots_path), str(movement_path), excluded)
+
+
+def bench_load_match_players(ctx: BenchContext) -> Callable:
+    from etl.db.loader import load_match_players
+    from etl.parsing.match_parsing import parse_match_players
+
+    players = parse_match_players(ctx.match_id)
+    session = ctx.new_session()
+
+    def run():
+        load_match_players(players, ctx.match_id, session, upsert=True)
+        session.commit()
+    return run
+
+
+def bench_load_damage_dealt_events(ctx: BenchContext) -> Callable:
+    from etl.db.loader import load_damage_dealt_events
+    from etl.parsing.match_parsing import parse_damage_dealt
+
+    rows = parse_damage_dealt(ctx.match_id)
+    session = ctx.new_session()
+
+    def run():
+        load_damage_dealt_events(rows, ctx.match_id, session, upsert=True)
+        session.commit()
+    return run
+
+
+def bench_load_elimination_events(ctx: BenchContext) -> Callable:
+    from etl.db.loader import load_elimination_events
+    from etl.parsing.match_parsing import parse_elims
+
+    rows = parse_elims(ctx.match_id)
+    session = ctx.new_session()
+
+    def run():
+        load_elimination_events(rows, ctx.match_id, session, upsert=True)
+        session.commit()
+    return run
+
+
+BENCHMARKS: dict[str, Callable[[BenchContext], Callable]] = {
+    "parse_damage_dealt": bench_parse_damage_dealt,
+    "parse_elims": bench_parse_elims,
+    "parse_assists": bench_parse_assists,
+    "get_match_object": bench_get_match_object,
+    "hit_attempts": bench_hit_attempts,
+    "load_match_players": bench_load_match_players,
+    "load_damage_dealt_events": bench_load_damage_dealt_events,
+    "load_elimination_events": bench_load_elimination_events,
+}
+
+
+def run_benchmark(ctx: BenchContext, setup: Callable[[BenchContext], Callable], repeat: int) -> dict:
+    """
+    Times `repeat` runs of a benchmark (each after a fresh setup) and traces
+    the peak memory of one more. The parsers' progress output is discarded.
+    """
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            fn = setup(ctx)
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+
+        fn = setup(ctx)
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {"seconds": min(times), "peak_mb": peak / 2**20}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Returns a description of every benchmark slower or bigger than its baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or "seconds" not in result or "seconds" not in base:
+            continue
+        for metric in ("seconds", "peak_mb"):
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {base[metric]:.3f} -> {result[metric]:.3f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parsers and loaders on a synthetic match.")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=1500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=None)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against results from a previous --output")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative slowdown/memory growth over the baseline")
+    args = parser.parse_args()
+
+    # Resolved before the working directory changes
+    output = Path(args.output).resolve() if args.output else None
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+
+    cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # the parsers read from data/raw relative to the working directory
+        os.chdir(tmp)
+        try:
+            counts = generate_match(
+                "data/raw", MATCH_ID, args.players, args.duration, seed=args.seed
+            )
+            print(
+                f"Synthetic match: {args.players} players, {args.duration:.0f}s, "
+                f"{counts['movement_events']} movement and {counts['shot_events']} shot events"
+            )
+
+            ctx = BenchContext(Path(tmp))
+            for name in args.only or BENCHMARKS:
+                try:
+                    results[name] = run_benchmark(ctx, BENCHMARKS[name], args.repeat)
+                    print(f"  {name:<28} {results[name]['seconds']:>9.3f}s {results[name]['peak_mb']:>9.1f} MB")
+                except ModuleNotFoundError as e:
+                    if (e.name or "").split(".")[0] not in OPTIONAL_DEPENDENCIES:
+                        raise
+                    results[name] = {"skipped": str(e)}
+                    print(f"  {name:<28} skipped ({e})")
+        finally:
+            os.chdir(cwd)
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results saved to {output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) over {args.tolerance:.0%}:")
+            for r in regressions:
+                print(f"  - {r}")
+            sys.exit(1)
+        print("✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
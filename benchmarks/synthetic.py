@@ -0,0 +1,267 @@
+"""
+Deterministic synthetic matches for benchmarking the parsers and loaders.
+
+Writes the same files as the fetchers (`info.json`, `players.json`,
+`weapons.json`, movement, shot, health/shield, knock, elimination and zone
+logs) to `<out_dir>/match_<match_id>/`, for any player count and match
+length.
+
+    python -m benchmarks.synthetic --players 100 --duration 1500
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+
+# 2024-01-01, in microseconds like every timestamp in the logs
+MATCH_START = 1_704_067_200_000_000
+
+# Half the width of the map (centimeters)
+MAP_RADIUS = 150_000
+
+# Weapon id -> (damage per hit, hits per shot fired)
+WEAPONS = {
+    "WID_Assault_FirePetal_Fast_Athena_UC": (32.0, 0.35),
+    "WID_Assault_Infantry_Athena_R": (36.0, 0.35),
+    "WID_Shotgun_Standard_Athena_UC": (90.0, 0.5),
+    "WID_Shotgun_SemiAuto_Athena_VR": (75.0, 0.45),
+    "WID_SMG_Standard_Athena_R": (19.0, 0.3),
+    "WID_Pistol_Standard_Athena_C": (24.0, 0.3),
+    "WID_Sniper_BoltAction_Scope_Athena_SR": (110.0, 0.2),
+}
+
+ZONE_PHASES = 12
+
+
+def _location(xyz) -> dict:
+    return {"x": float(xyz[0]), "y": float(xyz[1]), "z": float(xyz[2])}
+
+
+def _ts(seconds: float) -> int:
+    return MATCH_START + int(seconds * 1e6)
+
+
+def generate_match(
+    out_dir: str = "data/raw",
+    match_id: str = "synthetic",
+    players: int = 100,
+    duration: float = 1500,
+    team_size: int = 2,
+    movement_interval: float = 1.0,
+    shots_per_minute: float = 20,
+    bot_fraction: float = 0.1,
+    seed: int = 0
+) -> dict:
+    """
+    Generates a synthetic match and writes its logs.
+
+    Players are split into teams and eliminated one by one until a single
+    team is left. Each player random-walks across the map until eliminated,
+    with a movement sample every `movement_interval` seconds, and fires at
+    living opponents at `shots_per_minute` on average. The same arguments
+    always produce the same files.
+
+    Args:
+        out_dir: Directory holding the `match_<id>` directories
+        match_id: Id of the generated match
+        players: Number of players in the lobby
+        duration: Length of the match (seconds)
+        team_size: Players per team
+        movement_interval: Seconds between movement samples of a player
+        shots_per_minute: Average shots fired per living player per minute
+        bot_fraction: Fraction of the players flagged as bots
+        seed: Random seed
+
+    Returns:
+        dict: Number of events written per log
+    """
+    rng = np.random.default_rng(seed)
+    match_dir = Path(out_dir) / f"match_{match_id}"
+    match_dir.mkdir(parents=True, exist_ok=True)
+
+    player_ids = [rng.bytes(16).hex() for _ in range(players)]
+    teams = np.arange(players) // team_size
+    is_bot = np.zeros(players, dtype=bool)
+    is_bot[rng.choice(players, int(players * bot_fraction), replace=False)] = True
+
+    # Everyone but the winning team is eliminated, in random order
+    death_times = np.full(players, float(duration))
+    losers = np.flatnonzero(teams != teams[-1])
+    rng.shuffle(losers)
+    death_times[losers] = np.sort(rng.uniform(60, duration * 0.95, len(losers)))
+
+    # Movement: a random walk per player until eliminated
+    movement_events = []
+    tracks = []
+    for i, player_id in enumerate(player_ids):
+        times = np.arange(0, death_times[i], movement_interval)
+        times = np.clip(times + rng.uniform(0, movement_interval / 2, len(times)), 0, death_times[i])
+        steps = rng.normal(0, 300 * movement_interval, (len(times), 3)) * (1, 1, 0.1)
+        xyz = rng.uniform(-MAP_RADIUS, MAP_RADIUS, 3) * (1, 1, 0) + np.cumsum(steps, axis=0)
+        yaw = (np.cumsum(rng.normal(0, 30, len(times))) + 180) % 360 - 180
+        tracks.append((times, xyz))
+        movement_events.extend(
+            {
+                "epicId": player_id,
+                "timestamp": _ts(t),
+                "movementData": {"location": _location(p), "rotationYaw": float(y)},
+            }
+            for t, p, y in zip(times, xyz, yaw)
+        )
+    movement_events.sort(key=lambda e: e["timestamp"])
+
+    def position(i: int, t: float) -> np.ndarray:
+        times, xyz = tracks[i]
+        return xyz[min(np.searchsorted(times, t), len(times) - 1)]
+
+    # Shots at random living opponents
+    weapon_ids = list(WEAPONS)
+    shot_events = []
+    health_events = []
+    shield_events = []
+    health = np.full(players, 100.0)
+    shield = np.full(players, 100.0)
+    n_shots = rng.poisson(shots_per_minute * death_times / 60)
+    shots = sorted(
+        (float(t), i)
+        for i in range(players)
+        for t in rng.uniform(0, death_times[i], n_shots[i])
+    )
+    for t, actor in shots:
+        target = int(rng.integers(players))
+        if teams[target] == teams[actor] or death_times[target] <= t:
+            continue
+        weapon_id = weapon_ids[rng.integers(len(weapon_ids))]
+        damage, accuracy = WEAPONS[weapon_id]
+        p_actor = position(actor, t)
+        p_target = position(target, t)
+        hit = bool(rng.random() < accuracy)
+        if hit:
+            location = p_target + rng.normal(0, 30, 3)
+        else:
+            location = p_actor + (p_target - p_actor) * rng.uniform(0.3, 1.2) + rng.normal(0, 500, 3)
+
+        shot_events.append({
+            "epicId": player_ids[actor],
+            "hitEpicId": player_ids[target] if hit else None,
+            "timestamp": _ts(t),
+            "hitPlayer": hit,
+            "hitFatal": False,
+            "hitPlayerBuild": bool(not hit and rng.random() < 0.3),
+            "damage": damage if hit else 0.0,
+            "weaponId": weapon_id,
+            "location": _location(location),
+        })
+        if hit:
+            absorbed = min(shield[target], damage)
+            shield[target] -= absorbed
+            health[target] = max(1.0, health[target] - (damage - absorbed))
+            if absorbed:
+                shield_events.append({"epicId": player_ids[target], "timestamp": _ts(t), "value": float(shield[target])})
+            if damage > absorbed:
+                health_events.append({"epicId": player_ids[target], "timestamp": _ts(t), "value": float(health[target])})
+
+    # Knocks and eliminations by a living opponent
+    knock_events = []
+    elim_events = []
+    for target in losers:
+        t = death_times[target]
+        opponents = np.flatnonzero((teams != teams[target]) & (death_times > t))
+        actor = int(rng.choice(opponents))
+        if team_size > 1:
+            knock_events.append({
+                "epicId": player_ids[actor],
+                "targetId": player_ids[target],
+                "timestamp": _ts(max(0.0, t - rng.uniform(2, 10))),
+            })
+        elim = {
+            "epicId": player_ids[actor],
+            "targetId": player_ids[target],
+            "timestamp": _ts(t),
+            "gunType": int(rng.integers(1, 10)),
+            "selfElimination": False,
+            "targetLocation": _location(position(target, t)),
+        }
+        # like the real logs, storm eliminations have no actor location
+        if rng.random() < 0.9:
+            elim["playerLocation"] = _location(position(actor, t))
+        elim_events.append(elim)
+    elim_events.sort(key=lambda e: e["timestamp"])
+
+    zone_events = [
+        {
+            "currentPhase": phase,
+            "shrinkStartTime": _ts(duration * (phase + 0.5) / (ZONE_PHASES + 1)),
+            "shrinkEndTime": _ts(duration * (phase + 1) / (ZONE_PHASES + 1)),
+            "radius": float(MAP_RADIUS * (1 - phase / ZONE_PHASES)),
+        }
+        for phase in range(ZONE_PHASES)
+    ]
+
+    info = {
+        "matchId": match_id,
+        "eventId": "synthetic_event",
+        "eventWindowId": "synthetic_event_window",
+        "gameMode": "synthetic",
+        "mapPath": "/Game/Athena/Maps/Athena_Terrain",
+        "playerCount": players,
+        "aircraftStartTime": MATCH_START,
+        "startTimestamp": MATCH_START,
+        "endTimestamp": _ts(duration),
+        "lengthMs": int(duration * 1000),
+    }
+    players_data = {
+        "players": [
+            {
+                "epicId": player_id,
+                "epicUsername": f"player_{i}",
+                "teamIndex": int(teams[i]),
+                "isBot": bool(is_bot[i]),
+                "isSpectator": False,
+            }
+            for i, player_id in enumerate(player_ids)
+        ]
+    }
+
+    human_ids = {player_ids[i] for i in range(players) if not is_bot[i]}
+    logs = {
+        "info": info,
+        "players": players_data,
+        "movement_events": movement_events,
+        "shot_events": shot_events,
+        "human_shot_events": [e for e in shot_events if e["epicId"] in human_ids],
+        "eliminationEvents": elim_events,
+        "human_elim_events": [e for e in elim_events if e["epicId"] in human_ids],
+        "knockedDownEvents": knock_events,
+        "healthUpdateEvents": health_events,
+        "shieldUpdateEvents": shield_events,
+        "reviveEvents": [],
+        "rebootEvents": [],
+        "safeZoneUpdateEvents": zone_events,
+        "weapons": {
+            "weapons": [
+                {"weaponId": weapon_id, "weaponType": weapon_id.split("_")[1].upper()}
+                for weapon_id in WEAPONS
+            ]
+        },
+    }
+    for name, data in logs.items():
+        with open(match_dir / f"{name}.json", "w") as f:
+            json.dump(data, f)
+
+    return {name: len(data) for name, data in logs.items() if isinstance(data, list)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic match to disk.")
+    parser.add_argument("--out-dir", default="data/raw")
+    parser.add_argument("--match-id", default="synthetic")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=1500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    counts = generate_match(args.out_dir, args.match_id, args.players, args.duration, seed=args.seed)
+    print(f"✅ Wrote match {args.match_id}: " + ", ".join(f"{v} {k}" for k, v in counts.items()))
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+# The API client refuses to import without a key, and tests must not append
+# to the real metrics log
+os.environ.setdefault("API_KEY", "test")
+os.environ["ETL_METRICS_PATH"] = ""
+
+SYNTHETIC_MATCH_ID = "m1"
+SYNTHETIC_EVENT_WINDOW_ID = "EW1"
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Runs the test from an empty directory, since the ETL reads and writes `data/` relative to it."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def synthetic_match(workdir) -> str:
+    """Writes a small synthetic match to data/raw and returns its id."""
+    from benchmarks.synthetic import generate_match
+
+    generate_match("data/raw", SYNTHETIC_MATCH_ID, players=20, duration=600)
+    return SYNTHETIC_MATCH_ID
+
+
+@pytest.fixture
+def db_url(workdir, monkeypatch) -> str:
+    """A fresh SQLite database in the test directory, used as DATABASE_URL."""
+    import etl.db.weapon_catalog as weapon_catalog
+    from etl.db.models import init_db
+
+    url = f"sqlite:///{workdir / 'etl.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.setattr(weapon_catalog, "_catalog", None)
+    init_db(url)
+    return url
+
+
+@pytest.fixture
+def session(db_url):
+    from etl.db.models import get_session
+
+    session = get_session(db_url)
+    yield session
+    session.close()
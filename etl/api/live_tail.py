@@ -0,0 +1,208 @@
+# python -m etl.api.live_tail <match_id>
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import etl.api.osirion_client as osr
+from etl.api.manifest import write_atomic
+from etl.log import configure_logging
+
+
+# Logs whose endpoints accept a startTimeRelative/endTimeRelative window
+TAIL_LOGS: dict[str, Callable] = {
+    "movement_events": osr.get_match_movement_events,
+    "shot_events": osr.get_match_shot_events,
+}
+
+# Longest match length requested by the full fetchers (seconds)
+MAX_RELATIVE_TIME = 1650
+
+TAIL_STATE_FILE = "tail_state.json"
+
+
+def event_key(event: dict) -> str:
+    """Returns a stable key of an event's contents, to drop the ones already seen."""
+    return hashlib.sha1(json.dumps(event, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class MatchTail:
+    """
+    Incrementally fetches the movement and shot logs of an in-progress match.
+
+    For each log it remembers the end of the last requested window (seconds
+    relative to the match start), the last event timestamp seen and the keys
+    of the events of the last `overlap_seconds`. Each poll requests the new
+    interval plus that overlap, and drops the events it has already seen, so
+    events sharing the boundary timestamp or delivered up to
+    `overlap_seconds` late by the API are not lost. The overlap defaults to
+    the expected API lag, so each poll only re-reads that much.
+
+    New events are appended to `<log>.tail.jsonl` in the match directory and
+    passed to `on_events(log_name, events)`, e.g. to feed incremental
+    parsers. The state only advances once `on_events` returns, so events
+    whose callback raised are delivered again by the next poll (at least
+    once delivery; the upsert loaders make repeats harmless).
+    """
+
+    def __init__(
+        self,
+        match_id: str,
+        out_dir: str = "data/raw",
+        on_events: Callable[[str, list[dict]], None] | None = None,
+        lag_seconds: float = 10,
+        overlap_seconds: float | None = None
+    ):
+        self.match_id = match_id
+        self.match_dir = Path(out_dir) / f"match_{match_id}"
+        self.on_events = on_events
+        # The API only has events some time after they happen
+        self.lag_seconds = lag_seconds
+        # How late events can be delivered and still be picked up
+        self.overlap_seconds = lag_seconds if overlap_seconds is None else overlap_seconds
+        self.state_path = self.match_dir / TAIL_STATE_FILE
+        self.state = self._load_state()
+        self._truncate_uncommitted()
+
+    def _load_state(self) -> dict:
+        if self.state_path.exists():
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        return {
+            log: {"end_relative": 0, "last_timestamp": 0, "tail_bytes": 0, "recent_keys": {}}
+            for log in TAIL_LOGS
+        }
+
+    def _truncate_uncommitted(self):
+        """
+        Drops anything appended to a tail file after the last saved state
+        (e.g. by a poll that crashed), since that interval is refetched.
+        """
+        for log in TAIL_LOGS:
+            path = self.tail_path(log)
+            if path.exists() and path.stat().st_size > self.state[log]["tail_bytes"]:
+                with open(path, "r+b") as f:
+                    f.truncate(self.state[log]["tail_bytes"])
+
+    def _save_state(self):
+        write_atomic(self.state_path, json.dumps(self.state, indent=2).encode())
+
+    def tail_path(self, log: str) -> Path:
+        return self.match_dir / f"{log}.tail.jsonl"
+
+    def poll(self, until_relative: float) -> dict[str, list[dict]]:
+        """
+        Fetches the events of every tailed log between the end of the previous
+        poll and `until_relative`. Returns the new events per log.
+        """
+        self.match_dir.mkdir(parents=True, exist_ok=True)
+        until_relative = min(until_relative, MAX_RELATIVE_TIME)
+        new_events = {}
+
+        for log, fetch in TAIL_LOGS.items():
+            log_state = self.state[log]
+            start = log_state["end_relative"]
+            if until_relative <= start:
+                new_events[log] = []
+                continue
+
+            overlap_us = self.overlap_seconds * 1_000_000
+            events = fetch(self.match_id, max(0, start - self.overlap_seconds), until_relative)
+
+            # keys (-> timestamp) of the events already seen in the overlap
+            recent = dict(log_state.get("recent_keys", {}))
+            cutoff = log_state["last_timestamp"] - overlap_us
+            new = []
+            for e in events:
+                key = event_key(e)
+                if e["timestamp"] < cutoff or key in recent:
+                    continue
+                recent[key] = e["timestamp"]
+                new.append(e)
+            events = sorted(new, key=lambda e: e["timestamp"])
+
+            new_state = {**log_state, "end_relative": until_relative}
+            try:
+                if events:
+                    with open(self.tail_path(log), "ab") as f:
+                        f.write("".join(json.dumps(e) + "\n" for e in events).encode())
+                        new_state["tail_bytes"] = f.tell()
+                    new_state["last_timestamp"] = max(log_state["last_timestamp"], events[-1]["timestamp"])
+                    if self.on_events is not None:
+                        self.on_events(log, events)
+            except BaseException:
+                # Leave the state as it was, so the next poll refetches and
+                # delivers these events again
+                self._truncate_uncommitted()
+                raise
+
+            cutoff = new_state["last_timestamp"] - overlap_us
+            new_state["recent_keys"] = {k: ts for k, ts in recent.items() if ts >= cutoff}
+
+            # Only advance once the events are on disk and delivered
+            self.state[log] = new_state
+            self._save_state()
+            new_events[log] = events
+
+        return new_events
+
+    def read_log(self, log: str) -> list[dict]:
+        """Returns every event tailed so far for `log`."""
+        path = self.tail_path(log)
+        if not path.exists():
+            return []
+        with open(path, "r") as f:
+            return [json.loads(line) for line in f]
+
+    def finalize(self):
+        """
+        Consolidates the tailed logs into the regular `<log>.json` files once
+        the match is over, and removes the tail files.
+        """
+        for log in TAIL_LOGS:
+            osr._save_json(self.read_log(log), str(self.match_dir / f"{log}.json"))
+            self.tail_path(log).unlink(missing_ok=True)
+        self.state_path.unlink(missing_ok=True)
+
+
+def tail_match(
+    match_id: str,
+    out_dir: str = "data/raw",
+    poll_interval: float = 15,
+    on_events: Callable[[str, list[dict]], None] | None = None,
+    lag_seconds: float = 10,
+    overlap_seconds: float | None = None
+) -> MatchTail:
+    """
+    Tails an in-progress match until it ends, polling every `poll_interval`
+    seconds, then consolidates the tailed logs. See MatchTail for
+    `lag_seconds` and `overlap_seconds`.
+    """
+    tail = MatchTail(match_id, out_dir, on_events, lag_seconds, overlap_seconds)
+
+    while True:
+        info = osr.get_match_info(match_id)
+        start_s = info["startTimestamp"] / 1e6
+        ended = bool(info.get("endTimestamp"))
+
+        until = MAX_RELATIVE_TIME if ended else time.time() - start_s - tail.lag_seconds
+        new_events = tail.poll(until)
+        print(
+            f"[{match_id}] t={until:.0f}s: "
+            + ", ".join(f"{len(v)} new {k}" for k, v in new_events.items())
+        )
+
+        if ended or until >= MAX_RELATIVE_TIME:
+            break
+        time.sleep(poll_interval)
+
+    tail.finalize()
+    print(f"✅ Finished tailing match {match_id}")
+    return tail
+
+
+if __name__ == "__main__":
+    configure_logging()
+    tail_match(sys.argv[1])
@@ -0,0 +1,264 @@
+import os
+import json
+import fcntl
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+MANIFEST_FILE = "manifest.jsonl"
+LOCK_FILE = "manifest.jsonl.lock"
+
+# One manifest per data directory, shared by every caller in the process
+_manifests: dict[str, "RawManifest"] = {}
+
+
+def write_atomic(path: str | Path, payload: bytes):
+    """
+    Writes `payload` to `path` so that readers only ever see the old file or
+    the complete new one: the data goes to a temp file in the same directory,
+    is fsynced, and then renamed over `path`.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    # Persist the rename itself
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def match_key(match_id: str) -> str:
+    return f"match_{match_id}"
+
+
+def event_window_key(event_window_id: str) -> str:
+    return f"event_window_{event_window_id}"
+
+
+class RawManifest:
+    """
+    Index of the raw files saved under a data directory (e.g. `data/raw`).
+
+    For every match/event window directory it records the files present, their
+    sizes, SHA-256 hashes and fetch times. The manifest is an append-only JSON
+    lines file: each save appends a single line in one write, so a crash can
+    at most leave a truncated final line, which is ignored on load. Lookups
+    are served from an in-memory dict.
+
+    An entry is only recorded after its file has been completely written and
+    renamed into place, so it doubles as the file's completeness marker: a
+    file on disk without an entry is treated as missing.
+
+    Several processes can share a manifest. Appends and compactions hold an
+    exclusive lock on LOCK_FILE, and every process picks up the others'
+    lines on refresh (re-reading the whole file after a compaction).
+    """
+
+    def __init__(self, data_dir: str | Path = "data/raw"):
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / MANIFEST_FILE
+        self.lock_path = self.data_dir / LOCK_FILE
+        # directory name -> file name -> {"size", "sha256", "fetched_at"}
+        self.entries: dict[str, dict[str, dict]] = {}
+        self._offset = 0
+        # inode of the manifest read so far, which changes when it is compacted
+        self._inode = None
+        self.refresh()
+
+    @contextmanager
+    def _locked(self):
+        """Holds the exclusive lock of the manifest's writers."""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """Applies any lines appended to the manifest since the last read."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+
+        with f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self._inode:
+                # compacted (or created) since the last read: start over
+                if self._inode is not None:
+                    self.entries = {}
+                self._inode = stat.st_ino
+                self._offset = 0
+            if stat.st_size <= self._offset:
+                return
+            f.seek(self._offset)
+            chunk = f.read()
+
+        # Only consume complete lines; a partial tail is still being written
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError):
+                continue
+        self._offset += end
+
+    def _apply(self, entry: dict):
+        files = self.entries.setdefault(entry["dir"], {})
+        if entry.get("removed"):
+            files.pop(entry["file"], None)
+            return
+        files[entry["file"]] = {
+            "size": entry["size"],
+            "sha256": entry["sha256"],
+            "fetched_at": entry["fetched_at"],
+        }
+
+    def _append(self, entry: dict):
+        line = (json.dumps(entry) + "\n").encode()
+        with self._locked():
+            # Catch up with the lines of other processes first, so advancing
+            # the offset past our line does not skip theirs
+            self.refresh()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                stat = os.fstat(fd)
+                if stat.st_ino != self._inode:
+                    self._inode = stat.st_ino
+                    self._offset = 0
+                if stat.st_size > self._offset:
+                    # Only a line truncated by a crash is left unread:
+                    # terminate it so it is skipped on load
+                    line = b"\n" + line
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self._offset = stat.st_size + len(line)
+
+    def record(self, path: str | Path, payload: bytes):
+        """
+        Records `payload` as the contents just saved to `path`, which must be
+        a file directly inside a directory of the manifest's data directory.
+        """
+        self.refresh()
+        path = Path(path)
+        entry = {
+            "dir": path.parent.name,
+            "file": path.name,
+            "size": len(payload),
+            "sha256": hashlib.sha256(payload).hexdigest(),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._append(entry)
+        self._apply(entry)
+
+    def invalidate(self, dir_name: str, file_name: str):
+        """Removes a file's entry, e.g. after it failed verification."""
+        self.refresh()
+        entry = {"dir": dir_name, "file": file_name, "removed": True}
+        self._append(entry)
+        self._apply(entry)
+
+    def files(self, dir_name: str) -> dict[str, dict]:
+        """Returns the recorded files of a directory, keyed by file name."""
+        self.refresh()
+        return self.entries.get(dir_name, {})
+
+    def has(self, dir_name: str, file_name: str) -> bool:
+        return file_name in self.files(dir_name)
+
+    def compact(self):
+        """
+        Rewrites the manifest with one line per file, dropping superseded
+        entries. The new file replaces the old one atomically, under the
+        writers' lock so no concurrent append is lost.
+        """
+        with self._locked():
+            self.refresh()
+            lines = [
+                json.dumps({"dir": dir_name, "file": file_name, **meta}) + "\n"
+                for dir_name, files in self.entries.items()
+                for file_name, meta in files.items()
+            ]
+            write_atomic(self.path, "".join(lines).encode())
+            stat = self.path.stat()
+            self._inode = stat.st_ino
+            self._offset = stat.st_size
+
+
+def is_valid_json(payload: bytes) -> bool:
+    try:
+        json.loads(payload)
+    except ValueError:
+        return False
+    return True
+
+
+def get_manifest(data_dir: str | Path = "data/raw") -> RawManifest:
+    """
+    Returns the shared manifest for `data_dir`. If none exists yet but the
+    directory already holds raw data, the manifest is rebuilt from disk once.
+    """
+    key = str(Path(data_dir).resolve())
+    manifest = _manifests.get(key)
+    if manifest is None:
+        manifest_path = Path(data_dir) / MANIFEST_FILE
+        if not manifest_path.exists() and Path(data_dir).is_dir():
+            manifest = rebuild_manifest(data_dir)
+        else:
+            manifest = RawManifest(data_dir)
+        _manifests[key] = manifest
+    return manifest
+
+
+def rebuild_manifest(data_dir: str | Path = "data/raw") -> RawManifest:
+    """
+    Rebuilds the manifest of `data_dir` by hashing every raw JSON file on
+    disk. Used to index data fetched before the manifest existed. Files that
+    do not decode (e.g. truncated by a killed write) are left out, so they
+    are refetched.
+    """
+    data_dir = Path(data_dir)
+    manifest = RawManifest(data_dir)
+    manifest.entries = {}
+
+    print(f"Rebuilding raw data manifest for {data_dir}...")
+    skipped = 0
+    for path in sorted(data_dir.glob("*/*.json")):
+        payload = path.read_bytes()
+        if not is_valid_json(payload):
+            skipped += 1
+            continue
+        manifest._apply({
+            "dir": path.parent.name,
+            "file": path.name,
+            "size": len(payload),
+            "sha256": hashlib.sha256(payload).hexdigest(),
+            "fetched_at": datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).isoformat(),
+        })
+
+    manifest.compact()
+    print(f"✅ Indexed {sum(len(f) for f in manifest.entries.values())} files")
+    if skipped:
+        print(f"⚠️  Skipped {skipped} corrupt file(s)")
+    return manifest
+
+
+if __name__ == "__main__":
+    rebuild_manifest()
@@ -1,9 +1,12 @@
 import os
+import hashlib
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable
 
 import etl.api.osirion_client as osr
+from etl.api.manifest import get_manifest, match_key, event_window_key
 
 
 EVENT_TYPES = {
@@ -19,18 +22,18 @@ EVENT_TYPES = {
 
 
 def event_window_fetched(event_window_id, data_dir: str = "data/raw"):
-    base_path = Path(data_dir) / f"event_window_{event_window_id}"
+    files = get_manifest(data_dir).files(event_window_key(event_window_id))
     
     # Define required files for an event window
     required_files = {
-        'info': base_path / "info.json",
-        'matches': base_path / "matches.json"
+        'info': "info.json",
+        'matches': "matches.json"
     }
     
-    # Check existence of each file
+    # Check each file against the raw data manifest
     result = {
-        file_type: file_path.exists() 
-        for file_type, file_path in required_files.items()
+        file_type: file_name in files
+        for file_type, file_name in required_files.items()
     }
     
     # Add summary key
@@ -53,13 +56,11 @@ def fetch_match_missing(
 
     print(f"Fetching all missing data for match {match_id}...")
 
-    match_dir = Path(out_dir) / f"match_{match_id}"
-    
-    missing = []
-    for event_type in event_types.keys():
-        filepath = match_dir / f"{event_type}.json"
-        if not filepath.exists():
-            missing.append(event_type)
+    files = get_manifest(out_dir).files(match_key(match_id))
+    missing = [
+        event_type for event_type in event_types.keys()
+        if f"{event_type}.json" not in files
+    ]
 
     if not missing:
         print(f"All files exist for match {match_id}")
@@ -85,6 +86,116 @@ def fetch_match_missing(
     }
 
 
+def find_missing(
+    match_ids: list[str],
+    data_dir: str = "data/raw",
+    event_types: dict[str, Callable] | None = None
+) -> dict[str, list[str]]:
+    """
+    Returns, for each match in `match_ids` with missing data, the
+    `event_types` not yet fetched. Reads the raw data manifest once instead of
+    checking every file on disk, which makes it cheap to plan large backfills.
+    """
+    if event_types is None:
+        event_types = EVENT_TYPES
+
+    manifest = get_manifest(data_dir)
+    # one read of the manifest file for every match
+    manifest.refresh()
+    missing = {}
+    for match_id in match_ids:
+        files = manifest.entries.get(match_key(match_id), {})
+        match_missing = [
+            event_type for event_type in event_types.keys()
+            if f"{event_type}.json" not in files
+        ]
+        if match_missing:
+            missing[match_id] = match_missing
+
+    return missing
+
+
+def _verify_file(path: Path, meta: dict) -> bool:
+    """Returns True if the file on disk matches its manifest size and hash."""
+    try:
+        payload = path.read_bytes()
+    except FileNotFoundError:
+        return False
+    return (
+        len(payload) == meta["size"]
+        and hashlib.sha256(payload).hexdigest() == meta["sha256"]
+    )
+
+
+def verify_raw_data(
+    match_ids: list[str] | None = None,
+    data_dir: str = "data/raw",
+    max_workers: int = 8
+) -> dict[str, list[str]]:
+    """
+    Checks the recorded files of `match_ids` (every match in the manifest if
+    None) against their manifest size and hash, in parallel. Files that are
+    missing, truncated or otherwise corrupt are invalidated in the manifest,
+    so only they are refetched by the next fetch_match_missing() call.
+
+    Returns:
+        dict: match_id -> event types whose files failed verification
+    """
+    manifest = get_manifest(data_dir)
+    manifest.refresh()
+    if match_ids is None:
+        dir_names = [d for d in manifest.entries if d.startswith("match_")]
+    else:
+        dir_names = [match_key(match_id) for match_id in match_ids]
+
+    checks = [
+        (dir_name, file_name, meta)
+        for dir_name in dir_names
+        for file_name, meta in list(manifest.entries.get(dir_name, {}).items())
+    ]
+    print(f"Verifying {len(checks)} raw files across {len(dir_names)} matches...")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(
+            lambda check: _verify_file(Path(data_dir) / check[0] / check[1], check[2]),
+            checks
+        )
+
+    corrupt = {}
+    for (dir_name, file_name, _), ok in zip(checks, results):
+        if ok:
+            continue
+        manifest.invalidate(dir_name, file_name)
+        match_id = dir_name.removeprefix("match_")
+        corrupt.setdefault(match_id, []).append(Path(file_name).stem)
+
+    if corrupt:
+        print(f"⚠️  Found {sum(len(v) for v in corrupt.values())} corrupt files in {len(corrupt)} matches")
+    else:
+        print("✅ All raw files verified")
+    return corrupt
+
+
+def refetch_corrupt(
+    match_ids: list[str] | None = None,
+    data_dir: str = "data/raw",
+    max_workers: int = 8
+) -> dict[str, list[str]]:
+    """
+    Verifies raw data with verify_raw_data() and refetches only the files that
+    failed, instead of the whole match or event window.
+    """
+    corrupt = verify_raw_data(match_ids, data_dir, max_workers)
+    for match_id, event_types in corrupt.items():
+        # Logs outside EVENT_TYPES are all saved by the general events endpoint
+        fetch_match_missing(
+            match_id,
+            data_dir,
+            {t: EVENT_TYPES.get(t, osr.fetch_match_events) for t in event_types}
+        )
+    return corrupt
+
+
 def fetch_match_all(
     match_id: str, 
     out_dir: str = "data/raw", 
@@ -5,6 +5,9 @@ import requests
 from pathlib import Path
 from dotenv import load_dotenv
 
+from etl.api.manifest import get_manifest, write_atomic
+from etl.instrumentation import count, span
+
 
 load_dotenv()
 
@@ -17,6 +20,18 @@ if not API_KEY:
 HEADERS = {"Authorization": f"Bearer {API_KEY}"}
 
 
+def _endpoint(url: str) -> str:
+    """
+    Returns the API endpoint of `url` without the base URL, query and match
+    id (e.g. "matches/{id}/events/movement"), to group request metrics by.
+    """
+    path = url.split("?")[0][len(BASE_URL):].strip("/")
+    parts = path.split("/")
+    if len(parts) > 1 and parts[0] == "matches" and parts[1] != "session-id-to-match-id":
+        parts[1] = "{id}"
+    return "/".join(parts)
+
+
 def _make_request(url: str, params: dict | None = None, max_retries: int = 3, retry_delay: float = 1.0) -> dict:
     """
     Make a request to the Osirion API with retry logic for transient errors.
@@ -37,13 +52,19 @@ def _make_request(url: str, params: dict | None = None, max_retries: int = 3, re
     # Transient error status codes that should be retried
     retryable_status_codes = {502, 503, 504}  # Bad Gateway, Service Unavailable, Gateway Timeout
     
+    endpoint = _endpoint(url)
+
     for attempt in range(max_retries):
         try:
-            res = requests.get(url, headers=HEADERS, params=params or {}, timeout=30)
+            count(f"requests:{endpoint}")
+            with span(f"fetch:{endpoint}"):
+                res = requests.get(url, headers=HEADERS, params=params or {}, timeout=30)
             
             # Success
             if res.status_code == 200:
-                return res.json()
+                count("response_bytes", len(res.content))
+                with span("json_decode"):
+                    return res.json()
             
             # Check if it's a retryable error
             if res.status_code in retryable_status_codes and attempt < max_retries - 1:
@@ -51,6 +72,7 @@ def _make_request(url: str, params: dict | None = None, max_retries: int = 3, re
                 error_msg = res.text[:200] if res.text else "No error message"
                 print(f"⚠️  Transient error {res.status_code} (attempt {attempt + 1}/{max_retries}): {error_msg}")
                 print(f"   Retrying in {wait_time:.1f} seconds...")
+                count(f"retries:{endpoint}")
                 time.sleep(wait_time)
                 continue
             
@@ -90,9 +112,15 @@ def _make_request(url: str, params: dict | None = None, max_retries: int = 3, re
 
 
 def _save_json(data: dict, path: str):
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    """
+    Atomically saves `data` to `path`, then records the file in the raw data
+    manifest of the data directory two levels up
+    (e.g. data/raw/match_<id>/info.json), which marks it as complete.
+    """
+    path = Path(path)
+    payload = json.dumps(data, indent=2).encode()
+    write_atomic(path, payload)
+    get_manifest(path.parent.parent).record(path, payload)
     print(f"✅ Saved to {path}")
 
 
@@ -136,7 +164,7 @@ def get_team_players(epic_id: str, match_id: str):
         return None
 
 
-def fetch_match_players(match_id: str, out_dir="date/raw") -> str:
+def fetch_match_players(match_id: str, out_dir="data/raw") -> str:
     """
     Fetch all match players, including spectators and bots, for a single match.
     """
@@ -147,9 +175,16 @@ def fetch_match_players(match_id: str, out_dir="date/raw") -> str:
     return out_path
 
 
-def fetch_match_info(match_id: str, out_dir="data/raw") -> str:
+def get_match_info(match_id: str) -> dict:
+    """
+    Returns the info of a single match without saving it.
+    """
     url = f"{BASE_URL}/matches/{match_id}"
-    data = _make_request(url)
+    return _make_request(url)
+
+
+def fetch_match_info(match_id: str, out_dir="data/raw") -> str:
+    data = get_match_info(match_id)
     out_path =f"{out_dir}/match_{match_id}/info.json"
     _save_json(data, out_path)
     return out_path
@@ -186,30 +221,45 @@ def fetch_match_events(match_id: str, out_dir="data/raw") -> str:
     return out_path
 
 
+def get_match_movement_events(match_id: str, start_time=0, end_time=1650) -> list[dict]:
+    """
+    Returns the movement events between `start_time` and `end_time` (seconds
+    relative to the start of the match) without saving them.
+    """
+    url = f"{BASE_URL}/matches/{match_id}/events/movement"
+    params = { "startTimeRelative": start_time, "endTimeRelative": end_time }
+    return _make_request(url, params)["events"]
+
+
 def fetch_match_movement_events(
     match_id: str, 
     out_dir="data/raw", 
     start_time=0,
     end_time=1650
 ) -> str:
-    url = f"{BASE_URL}/matches/{match_id}/events/movement"
-    params = { "startTimeRelative": {start_time}, "endTimeRelative": {end_time} }
-    data = _make_request(url, params)["events"]
+    data = get_match_movement_events(match_id, start_time, end_time)
     out_path = f"{out_dir}/match_{match_id}/movement_events.json"
     _save_json(data, out_path)
     return out_path
 
 
+def get_match_shot_events(match_id: str, start_time=0, end_time=1650) -> list[dict]:
+    """
+    Returns the hitscan shot events between `start_time` and `end_time`
+    (seconds relative to the start of the match) without saving them.
+    """
+    url = f"{BASE_URL}/matches/{match_id}/events/shots"
+    params = {"startTimeRelative": start_time, "endTimeRelative": end_time}
+    return _make_request(url, params)["hitscanEvents"]
+
+
 def fetch_match_shot_events(
     match_id: str,
     out_dir="data/raw",
     start_time=0,
     end_time=1650
 ) -> str:
-
-    url = f"{BASE_URL}/matches/{match_id}/events/shots"
-    params = {"startTimeRelative": start_time, "endTimeRelative": end_time}
-    data = _make_request(url, params)["hitscanEvents"]
+    data = get_match_shot_events(match_id, start_time, end_time)
     out_path = f"{out_dir}/match_{match_id}/shot_events.json"
     _save_json(data, out_path)
     return out_path
@@ -0,0 +1,102 @@
+import pytest
+
+from etl.api import live_tail
+from etl.api.live_tail import MatchTail
+
+
+class FakeLog:
+    """Serves the events of one log whose `available_at` (seconds) has passed."""
+
+    def __init__(self):
+        self.events: list[tuple[float, dict]] = []
+        self.now = 0.0
+        self.requests: list[tuple[float, float]] = []
+
+    def add(self, timestamp_s: float, available_at: float | None = None, **fields):
+        event = {"timestamp": int(timestamp_s * 1_000_000), **fields}
+        self.events.append((timestamp_s if available_at is None else available_at, event))
+
+    def __call__(self, match_id: str, start: float, end: float) -> list[dict]:
+        self.requests.append((start, end))
+        return [
+            event for available_at, event in self.events
+            if available_at <= self.now and start <= event["timestamp"] / 1e6 <= end
+        ]
+
+
+@pytest.fixture
+def log(monkeypatch):
+    fake = FakeLog()
+    monkeypatch.setattr(live_tail, "TAIL_LOGS", {"shot_events": fake})
+    return fake
+
+
+def _poll(tail: MatchTail, log: FakeLog, until: float) -> list[dict]:
+    log.now = until
+    return tail.poll(until)["shot_events"]
+
+
+def test_boundary_and_late_events_are_not_lost(workdir, log):
+    tail = MatchTail("m1")
+    log.add(10, seq=1)
+    log.add(20, seq=2)
+    assert [e["seq"] for e in _poll(tail, log, 20)] == [1, 2]
+
+    # same timestamp as the last event seen, and an event delivered late
+    log.add(20, available_at=25, seq=3)
+    log.add(15, available_at=25, seq=4)
+    log.add(30, seq=5)
+    assert [e["seq"] for e in _poll(tail, log, 40)] == [4, 3, 5]
+    assert [e["seq"] for e in tail.read_log("shot_events")] == [1, 2, 4, 3, 5]
+
+
+def test_events_older_than_the_overlap_are_dropped(workdir, log):
+    tail = MatchTail("m1")
+    log.add(100, seq=1)
+    _poll(tail, log, 100)
+
+    log.add(100 - tail.overlap_seconds - 1, available_at=101, seq=2)
+    assert _poll(tail, log, 110) == []
+
+
+def test_overlap_follows_the_expected_lag(workdir, log):
+    _poll(MatchTail("m1", lag_seconds=5), log, 100)
+    _poll(MatchTail("m1", lag_seconds=5), log, 115)
+    _poll(MatchTail("m1", lag_seconds=5, overlap_seconds=2), log, 130)
+    assert log.requests == [(0, 100), (95, 115), (113, 130)]
+
+
+def test_events_are_redelivered_when_the_callback_fails(workdir, log):
+    delivered = []
+
+    def on_events(log_name, events):
+        if not delivered:
+            delivered.append(None)
+            raise RuntimeError("loader down")
+        delivered.append([e["seq"] for e in events])
+
+    tail = MatchTail("m1", on_events=on_events)
+    log.add(10, seq=1)
+    with pytest.raises(RuntimeError):
+        _poll(tail, log, 20)
+    assert tail.read_log("shot_events") == []
+
+    log.add(25, seq=2)
+    _poll(tail, log, 30)
+    assert delivered[1:] == [[1, 2]]
+    assert [e["seq"] for e in MatchTail("m1").read_log("shot_events")] == [1, 2]
+
+
+def test_no_duplicates_across_restarts(workdir, log):
+    log.add(10, seq=1)
+    log.add(20, seq=2)
+    _poll(MatchTail("m1"), log, 20)
+
+    log.add(30, seq=3)
+    assert [e["seq"] for e in _poll(MatchTail("m1"), log, 40)] == [3]
+    assert [e["seq"] for e in MatchTail("m1").read_log("shot_events")] == [1, 2, 3]
+
+
+def test_event_key_ignores_field_order():
+    assert live_tail.event_key({"a": 1, "b": 2}) == live_tail.event_key({"b": 2, "a": 1})
+    assert live_tail.event_key({"a": 1}) != live_tail.event_key({"a": 2})
@@ -0,0 +1,74 @@
+import json
+
+from etl.api.manifest import MANIFEST_FILE, RawManifest, rebuild_manifest
+
+
+def _record(manifest: RawManifest, dir_name: str, file_name: str, payload: bytes = b"[]"):
+    path = manifest.data_dir / dir_name / file_name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(payload)
+    manifest.record(path, payload)
+
+
+def test_entries_survive_a_reload(tmp_path):
+    manifest = RawManifest(tmp_path)
+    _record(manifest, "match_a", "info.json", b"{}")
+
+    entry = RawManifest(tmp_path).files("match_a")["info.json"]
+    assert entry["size"] == 2
+
+
+def test_instances_see_each_others_appends(tmp_path):
+    first, second = RawManifest(tmp_path), RawManifest(tmp_path)
+    _record(first, "match_a", "info.json")
+    _record(second, "match_b", "info.json")
+    _record(first, "match_c", "info.json")
+
+    for manifest in (first, second, RawManifest(tmp_path)):
+        assert all(manifest.has(d, "info.json") for d in ("match_a", "match_b", "match_c"))
+
+
+def test_invalidate_removes_the_entry(tmp_path):
+    manifest = RawManifest(tmp_path)
+    _record(manifest, "match_a", "info.json")
+    manifest.invalidate("match_a", "info.json")
+
+    assert not manifest.has("match_a", "info.json")
+    assert not RawManifest(tmp_path).has("match_a", "info.json")
+
+
+def test_compact_keeps_one_line_per_file_and_later_appends(tmp_path):
+    first, second = RawManifest(tmp_path), RawManifest(tmp_path)
+    for _ in range(3):
+        _record(first, "match_a", "info.json")
+    second.compact()
+    assert len((tmp_path / MANIFEST_FILE).read_text().splitlines()) == 1
+
+    # the first instance read the file before it was replaced
+    _record(first, "match_b", "info.json")
+    for manifest in (first, second, RawManifest(tmp_path)):
+        manifest.refresh()
+        assert set(manifest.entries) == {"match_a", "match_b"}
+
+
+def test_truncated_line_is_skipped(tmp_path):
+    manifest = RawManifest(tmp_path)
+    _record(manifest, "match_a", "info.json")
+    with open(tmp_path / MANIFEST_FILE, "a") as f:
+        f.write('{"dir": "match_b", "fi')
+
+    reloaded = RawManifest(tmp_path)
+    _record(reloaded, "match_c", "info.json")
+    assert set(RawManifest(tmp_path).entries) == {"match_a", "match_c"}
+    last_line = (tmp_path / MANIFEST_FILE).read_text().splitlines()[-1]
+    assert json.loads(last_line)["dir"] == "match_c"
+
+
+def test_rebuild_skips_corrupt_files(tmp_path):
+    (tmp_path / "match_a").mkdir()
+    (tmp_path / "match_a" / "info.json").write_text('{"ok": true}')
+    (tmp_path / "match_a" / "players.json").write_text('[{"epicId"')
+
+    manifest = rebuild_manifest(tmp_path)
+    assert set(manifest.files("match_a")) == {"info.json"}
+    assert RawManifest(tmp_path).has("match_a", "info.json")
@@ -0,0 +1,16 @@
+from etl.api.manifest import RawManifest, get_manifest
+from etl.api.match_data_fetcher import EVENT_TYPES, find_missing
+
+
+def test_find_missing_reads_the_manifest_once(synthetic_match, monkeypatch):
+    get_manifest("data/raw")
+    refreshes = []
+    refresh = RawManifest.refresh
+    monkeypatch.setattr(RawManifest, "refresh", lambda self: refreshes.append(1) or refresh(self))
+
+    match_ids = [synthetic_match] + [f"unfetched_{i}" for i in range(100)]
+    missing = find_missing(match_ids)
+
+    assert len(refreshes) == 1
+    # the synthetic match has every log
+    assert missing == {match_id: list(EVENT_TYPES) for match_id in match_ids[1:]}
@@ -0,0 +1,38 @@
+"""
+Embedded analytics over the Parquet export (etl.export.parquet) with DuckDB.
+
+Each exported dataset is exposed as a view of the same name, with
+event_window_id and match_id as partition columns, so queries only read the
+partitions and columns they need:
+
+    conn = duckdb_connection()
+    conn.sql("SELECT actor_id, sum(damage) FROM damage_dealt WHERE zone >= 8 GROUP BY 1").df()
+
+Requires the optional `duckdb` dependency.
+"""
+from pathlib import Path
+
+from etl.export.parquet import DATASETS, PARQUET_DIR
+
+
+def duckdb_connection(root: str = PARQUET_DIR, database: str = ":memory:"):
+    """
+    Returns a DuckDB connection with a view per exported dataset under
+    `root`. Datasets that were not exported yet are left out.
+    """
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("The analytics backend requires duckdb (pip install duckdb)") from e
+
+    conn = duckdb.connect(database)
+    for name in DATASETS:
+        path = Path(root) / name
+        if not path.exists():
+            continue
+        files = (path / "**" / "*.parquet").as_posix().replace("'", "''")
+        conn.execute(
+            f"CREATE OR REPLACE VIEW {name} AS "
+            f"SELECT * FROM read_parquet('{files}', hive_partitioning = true)"
+        )
+    return conn
@@ -2,39 +2,215 @@ import json
 from datetime import datetime
 
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
+from sqlalchemy import select, delete, insert
 from sqlalchemy.orm import Session
 
-from etl.db.models import get_session, Match, MatchPlayer, DamageDealtEvent, EliminationEvent, init_db
-from etl.parsing.match_parser import parse_damage_dealt, parse_elims
+from etl.instrumentation import span
+from etl.db.partitioning import group_by_partition
+from etl.db.models import (
+    get_session, EventWindow, Match, MatchPlayer, DamageDealtEvent, EliminationEvent, Weapon, init_db,
+    MatchStats, PlayerMatchStats, PlayerWeaponStats, MatchZoneStats,
+)
 
 
-def load_match_metadata(match_metadata: dict, session: Session) -> Match:
-    existing_match = session.query(Match).filter_by(match_id=match_id).first()
+# The match loaders below do not commit: process_match() commits every row of
+# a match in one transaction, together with its `processed` flag.
+
+# Natural keys used as ON CONFLICT targets in upsert mode. Each one is backed
+# by a unique index in `etl.db.models`.
+MATCH_KEY = ["match_id"]
+MATCH_PLAYER_KEY = ["epic_id", "match_id"]
+DAMAGE_EVENT_KEY = ["match_id", "timestamp", "actor_id", "recipient_id", "weapon_id"]
+ELIM_EVENT_KEY = ["match_id", "timestamp", "actor_id", "recipient_id"]
+WEAPON_KEY = ["weapon_id", "event_window_id"]
+
+# Summary tables written by load_match_rollups(): model and natural key
+ROLLUP_TABLES = {
+    "match_stats": (MatchStats, ["match_id"]),
+    "player_match_stats": (PlayerMatchStats, ["match_id", "epic_id"]),
+    "player_weapon_stats": (PlayerWeaponStats, ["match_id", "epic_id", "weapon_type"]),
+    "match_zone_stats": (MatchZoneStats, ["match_id", "zone"]),
+}
+
+
+def _dialect_insert(session: Session, model):
+    """
+    Returns an INSERT construct for `model` from the dialect bound to
+    `session`, which exposes `on_conflict_do_nothing`/`on_conflict_do_update`.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Upsert mode is not supported for dialect '{dialect}'")
+    return insert(model)
+
+
+def _table_name(target) -> str:
+    """Name of the table of a mapped model or of a table construct."""
+    return getattr(target, "__tablename__", None) or target.name
+
+
+def bulk_upsert(
+    session: Session,
+    model,
+    records: list[dict],
+    conflict_cols: list[str],
+    update_cols: list[str] | None = None,
+) -> int:
+    """
+    Inserts `records` into `model`'s table in a single bulk statement, using
+    `INSERT ... ON CONFLICT` on `conflict_cols` instead of reading existing
+    rows first. Does not commit, so several loads can share a transaction.
+
+    Args:
+        session: SQLAlchemy session
+        model: Mapped model class (or table, e.g. a partition) to insert into
+        records: Column -> value mappings, one per row
+        conflict_cols: Columns of the unique index identifying a row
+        update_cols: Columns to overwrite on conflict. If None, conflicting
+            rows are left untouched (DO NOTHING).
+
+    Returns:
+        int: Number of rows inserted or updated, as reported by the driver
+    """
+    if not records:
+        return 0
+
+    stmt = _dialect_insert(session, model)
+    if update_cols:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_cols,
+            set_={col: stmt.excluded[col] for col in update_cols},
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_cols)
+
+    # Core-level executemany, batched into multi-row VALUES by SQLAlchemy
+    with span(f"insert:{_table_name(model)}", rows_in=len(records)):
+        result = session.connection().execute(stmt, records)
+
+    # executemany() rowcounts are not reported by every driver
+    return result.rowcount if result.rowcount >= 0 else len(records)
+
+
+def _load_events(session: Session, model, records: list[dict], conflict_cols: list[str], upsert: bool) -> int:
+    """
+    Inserts event records into `model`'s table, or directly into its monthly
+    partitions when partitioning is enabled (etl.db.partitioning).
+    """
+    loaded = 0
+    for target, target_records in group_by_partition(session, model, records):
+        if upsert:
+            loaded += bulk_upsert(session, target, target_records, conflict_cols)
+            continue
+
+        with span(f"insert:{_table_name(target)}", rows_in=len(target_records)):
+            if target is model:
+                session.bulk_insert_mappings(model, target_records) # type: ignore
+            else:
+                session.connection().execute(insert(target), target_records)
+        loaded += len(target_records)
+    return loaded
+
+
+def load_event_window_metadata(event_window_metadata: dict, session: Session) -> EventWindow:
+    """
+    Create the EventWindow record for an event window, or refresh its
+    schedule and match count if it already exists.
+
+    Args:
+        event_window_metadata: Dictionary from parse_event_window_metadata()
+        session: SQLAlchemy session
+
+    Returns:
+        EventWindow: The event window record
+    """
+    event_window_id = event_window_metadata["event_window_id"]
+    event_window = session.get(EventWindow, event_window_id)
+    if event_window is None:
+        event_window = EventWindow(event_window_id=event_window_id)
+        session.add(event_window)
+
+    event_window.start_time = event_window_metadata["start_time"]
+    event_window.end_time = event_window_metadata["end_time"]
+    event_window.total_matches = event_window_metadata["total_matches"]
+    with span("commit"):
+        session.commit()
+
+    print(f"✅ Loaded event window record: {event_window_id}")
+    return event_window
+
+
+def load_weapons(weapons: list[dict], event_window_id: str, session: Session) -> int:
+    """
+    Upserts the weapons seen in an event window.
+
+    Args:
+        weapons: Weapon dictionaries from parse_match_weapons() with keys
+            weapon_id, weapon_type, weapon_name and rarity
+        event_window_id: The event window the weapons were seen in
+        session: SQLAlchemy session
+
+    Returns:
+        int: Number of weapon records inserted or updated
+    """
+    records = [
+        {
+            "weapon_id": w["weapon_id"],
+            "weapon_type": w["weapon_type"],
+            "weapon_name": w.get("weapon_name"),
+            "rarity": w.get("rarity"),
+            "event_window_id": event_window_id,
+        }
+        for w in weapons
+    ]
+    return bulk_upsert(session, Weapon, records, WEAPON_KEY, update_cols=["weapon_type", "weapon_name", "rarity"])
+
+
+def load_match_metadata(match_metadata: dict, session: Session, upsert: bool = False) -> Match:
+    """
+    Create (or, in upsert mode, create or refresh) the Match record for a
+    match.
+
+    Args:
+        match_metadata: Match dictionary from parse_match_metadata()
+        session: SQLAlchemy session
+        upsert: If True, write with ON CONFLICT DO UPDATE instead of
+            querying for an existing record first
+
+    Returns:
+        Match: The match record
+    """
+    match_id = match_metadata["match_id"]
+    record = {
+        "match_id": match_id,
+        "event_window_id": match_metadata["event_window_id"],
+        "event_id": match_metadata["event_id"],
+        "start_time": match_metadata["start_time"],
+        "end_time": match_metadata["end_time"],
+        "gamemode": match_metadata["gamemode"],
+        "duration": match_metadata["duration"],
+        "player_count": match_metadata["player_count"],
+    }
+
+    if upsert:
+        update_cols = [col for col in record if col not in MATCH_KEY]
+        bulk_upsert(session, Match, [record], MATCH_KEY, update_cols)
+        print(f"✅ Upserted match record: {match_id}")
+        return session.get(Match, match_id)
+
+    existing_match = session.get(Match, match_id)
     if existing_match:
         print(f"Match {match_id} already exists in database")
         return existing_match
 
-    match_info_path = f"data/raw/match_{match_id}/match_info.json"
-    try:
-        with open(match_info_path, "r") as f:
-            match_info = json.load(f)
-    except FileNotFoundError:
-        raise ValueError(f"Match info not found at {match_info_path}")
-    
-    match = Match(
-        match_id=match_metadata["match_id"],
-        event_window_id=match_metadata["event_window_id"],
-        event_id=match_metadata["event_id"],
-        start_time=match_metadata["start_time"],
-        end_time=match_metadata["end_time"],
-        gamemode=match_metadata["gamemode"],
-        duration=match_metadata["duration"],
-        player_count=match_metadata["player_count"],
-    )
+    match = Match(**record)
 
     session.add(match)
-    session.commit()
+    session.flush()
 
     print(f"✅ Created match record: {match_id}")
     return match
@@ -43,7 +219,8 @@ def load_match_metadata(match_metadata: dict, session: Session) -> Match:
 def load_match_players(
     players_data: list[dict], 
     match_id: str, 
-    session: Session
+    session: Session,
+    upsert: bool = False
 ) -> int:
     """
     Create MatchPlayer records for all players in a match.
@@ -54,6 +231,8 @@ def load_match_players(
             - epic_username (str): Player's Epic username
         match_id: The match these players belong to
         session: SQLAlchemy session
+        upsert: If True, insert with ON CONFLICT DO NOTHING instead of
+            reading the existing epic_ids first
         
     Returns:
         int: Number of new player records created
@@ -63,6 +242,19 @@ def load_match_players(
         return 0
     
     print(f"Loading {len(players_data)} players for match {match_id}...")
+
+    if upsert:
+        player_records = [
+            {
+                "epic_id": player["epic_id"],
+                "epic_username": player["epic_username"],
+                "match_id": match_id,
+            }
+            for player in players_data
+        ]
+        players_created = bulk_upsert(session, MatchPlayer, player_records, MATCH_PLAYER_KEY)
+        print(f"✅ Upserted {len(player_records)} player records")
+        return players_created
     
     existing_player_ids = {
         p.epic_id 
@@ -87,7 +279,7 @@ def load_match_players(
         session.add(new_player)
         players_created += 1
     
-    session.commit()
+    session.flush()
     
     if players_created > 0:
         print(f"✅ Created {players_created} new player records")
@@ -97,16 +289,22 @@ def load_match_players(
     return players_created
     
 
-def load_damage_events(damage_events: list[dict], match_id: str, session: Session) -> int:
+def load_damage_dealt_events(
+    damage_events: list[dict],
+    match_id: str,
+    session: Session,
+    upsert: bool = False
+) -> int:
     """
     Bulk insert damage dealt events into the database.
     
     Args:
         damage_events: List of damage event dictionaries from parse_damage_dealt() with keys:
-            - timestamp (int): Unix timestamp in milliseconds
+            - timestamp (int): Unix timestamp in microseconds
             - actor_id (str): Shooter's Epic ID
             - recipient_id (str): Victim's Epic ID
             - weapon_id (str): Weapon identifier
+            - weapon_type (str, optional): Filled by WeaponCatalog.annotate()
             - damage (float): Damage amount dealt
             - ax, ay, az (float): Actor's 3D coordinates
             - rx, ry, rz (float): Recipient's 3D coordinates
@@ -114,6 +312,8 @@ def load_damage_events(damage_events: list[dict], match_id: str, session: Sessio
             - zone (int): Storm zone number
         match_id: The match these events belong to
         session: SQLAlchemy session
+        upsert: If True, skip events already loaded for this match using
+            ON CONFLICT DO NOTHING on DAMAGE_EVENT_KEY
         
     Returns:
         int: Number of events loaded
@@ -127,8 +327,8 @@ def load_damage_events(damage_events: list[dict], match_id: str, session: Sessio
     # Prepare records for bulk insert
     damage_records = []
     for event in damage_events:
-        # Convert timestamp from milliseconds to datetime
-        timestamp_dt = datetime.fromtimestamp(event["timestamp"] / 1000)
+        # Convert timestamp from microseconds to datetime
+        timestamp_dt = datetime.fromtimestamp(event["timestamp"] / 1e6)
         
         damage_records.append({
             "match_id": match_id,
@@ -137,7 +337,7 @@ def load_damage_events(damage_events: list[dict], match_id: str, session: Sessio
             "actor_id": event["actor_id"],
             "recipient_id": event["recipient_id"],
             "weapon_id": event["weapon_id"],
-            "weapon_type": None,  # TODO: Add weapon type mapping if available
+            "weapon_type": event.get("weapon_type"),
             "damage_amount": event["damage"],  # Note: parse_damage_dealt returns "damage", not "damage_amount"
             "actor_x": event["ax"],
             "actor_y": event["ay"],
@@ -149,30 +349,39 @@ def load_damage_events(damage_events: list[dict], match_id: str, session: Sessio
             "zone": event["zone"]
         })
     
-    # Bulk insert using SQLAlchemy
-    session.bulk_insert_mappings(DamageDealtEvent, damage_records) # type: ignore
-    session.commit()
+    loaded = _load_events(session, DamageDealtEvent, damage_records, DAMAGE_EVENT_KEY, upsert)
+    if upsert:
+        print(f"✅ Upserted {len(damage_records)} damage events ({loaded} new)")
+        return loaded
     
     print(f"✅ Loaded {len(damage_records)} damage events")
     return len(damage_records)
 
 
-def load_elimination_events(elim_events: list[dict], match_id: str, session: Session) -> int:
+def load_elimination_events(
+    elim_events: list[dict],
+    match_id: str,
+    session: Session,
+    upsert: bool = False
+) -> int:
     """
     Bulk insert elimination events into the database.
     
     Args:
         elim_events: List of elimination event dictionaries from parse_elims() with keys:
-            - timestamp (int): Unix timestamp in milliseconds
+            - timestamp (int): Unix timestamp in microseconds
             - actor_id (str): Eliminator's Epic ID
             - recipient_id (str): Victim's Epic ID
-            - weapon_id (str): Weapon identifier
+            - weapon_id (str | None): Weapon of the eliminator's last hit
+            - weapon_type (str, optional): Filled by WeaponCatalog.annotate()
             - ax, ay, az (float): Actor's 3D coordinates
             - rx, ry, rz (float): Recipient's 3D coordinates
             - distance (float): Distance between actors
             - zone (int): Storm zone number
         match_id: The match these events belong to
         session: SQLAlchemy session
+        upsert: If True, skip events already loaded for this match using
+            ON CONFLICT DO NOTHING on ELIM_EVENT_KEY
         
     Returns:
         int: Number of events loaded
@@ -186,8 +395,8 @@ def load_elimination_events(elim_events: list[dict], match_id: str, session: Ses
     # Prepare records for bulk insert
     elim_records = []
     for event in elim_events:
-        # Convert timestamp from milliseconds to datetime
-        timestamp_dt = datetime.fromtimestamp(event["timestamp"] / 1000)
+        # Convert timestamp from microseconds to datetime
+        timestamp_dt = datetime.fromtimestamp(event["timestamp"] / 1e6)
         
         elim_records.append({
             "match_id": match_id,
@@ -196,7 +405,7 @@ def load_elimination_events(elim_events: list[dict], match_id: str, session: Ses
             "actor_id": event["actor_id"],
             "recipient_id": event["recipient_id"],
             "weapon_id": event["weapon_id"],
-            "weapon_type": None,  # TODO: Add weapon type mapping if available
+            "weapon_type": event.get("weapon_type"),
             "actor_x": event["ax"],
             "actor_y": event["ay"],
             "actor_z": event["az"],
@@ -207,14 +416,44 @@ def load_elimination_events(elim_events: list[dict], match_id: str, session: Ses
             "zone": event["zone"]
         })
     
-    # Bulk insert using SQLAlchemy
-    session.bulk_insert_mappings(inspect(EliminationEvent), elim_records) # type: ignore
-    session.commit()
+    loaded = _load_events(session, EliminationEvent, elim_records, ELIM_EVENT_KEY, upsert)
+    if upsert:
+        print(f"✅ Upserted {len(elim_records)} elimination events ({loaded} new)")
+        return loaded
     
     print(f"✅ Loaded {len(elim_records)} elimination events")
     return len(elim_records)
 
 
+def load_match_rollups(rollups: dict[str, list[dict]], match_id: str, session: Session) -> int:
+    """
+    Replaces the summary rows of a match.
+
+    The match's existing rows are deleted and the new ones upserted, table
+    by table, so reprocessing a match refreshes only its own rows and drops
+    groups that no longer exist (e.g. a weapon type that disappeared after
+    reparsing). Nothing is committed: the caller commits every table at
+    once, so a failure never leaves a mix of old and new rows.
+
+    Args:
+        rollups: Rows per summary table from compute_match_rollups()
+        match_id: The match the rollups belong to
+        session: SQLAlchemy session
+
+    Returns:
+        int: Number of summary rows written
+    """
+    loaded = 0
+    for table, (model, key) in ROLLUP_TABLES.items():
+        rows = rollups.get(table, [])
+        session.execute(delete(model).where(model.match_id == match_id))
+        update_cols = [col for col in rows[0] if col not in key] if rows else None
+        loaded += bulk_upsert(session, model, rows, key, update_cols)
+
+    print(f"✅ Loaded {loaded} summary rows for match {match_id}")
+    return loaded
+
+
 if __name__ == "__main__":
     # Initialize database tables (run once)
     # init_db()
@@ -1,7 +1,9 @@
 import os
+from pathlib import Path
 
-from sqlalchemy import create_engine, String, Float, DateTime, Boolean, ForeignKey, Index, Integer
+from sqlalchemy import create_engine, event, make_url, Engine, String, Float, DateTime, Boolean, ForeignKey, Index, Integer
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 from datetime import datetime, timezone
 from typing import Optional, List
 
@@ -9,6 +11,16 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Optional monthly range partitioning of the event tables on `timestamp`
+# (PostgreSQL only, see etl.db.partitioning). PostgreSQL requires the
+# partition key in the primary key, hence the (id, timestamp) primary key.
+EVENT_PARTITIONING = (
+    os.getenv("EVENT_PARTITIONING", "").lower() == "month"
+    and os.getenv("DATABASE_URL", "").startswith("postgresql")
+)
+_event_table_options = {"postgresql_partition_by": "RANGE (timestamp)"} if EVENT_PARTITIONING else {}
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -19,6 +31,8 @@ class Weapon(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     weapon_id: Mapped[str] = mapped_column(String(100))
     weapon_type: Mapped[str] = mapped_column(String(50))
+    weapon_name: Mapped[Optional[str]] = mapped_column(String(100), default=None)
+    rarity: Mapped[Optional[str]] = mapped_column(String(20), default=None)
     event_window_id: Mapped[str] = mapped_column(String(100), ForeignKey("event_windows.event_window_id"))
     
     # Relationships
@@ -88,6 +102,13 @@ class Match(Base):
     processing: Mapped[bool] = mapped_column(Boolean, default=False)
     processed: Mapped[bool] = mapped_column(Boolean, default=False)
     failed: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    # Stage checkpoints, so a resumed job only redoes unfinished stages
+    fetched: Mapped[bool] = mapped_column(Boolean, default=False)
+    parsed: Mapped[bool] = mapped_column(Boolean, default=False)
+    last_processing_start: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None)
+    last_processed: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None)
+    last_failed: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None)
     
     # Match metadata
     event_id: Mapped[Optional[str]] = mapped_column(String(100), default=None)
@@ -142,7 +163,7 @@ class DamageDealtEvent(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     match_id: Mapped[str] = mapped_column(String(50), ForeignKey("matches.match_id"))
-    timestamp: Mapped[datetime] = mapped_column(DateTime)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, primary_key=EVENT_PARTITIONING)
     game_time_seconds: Mapped[Optional[int]] = mapped_column(Integer, default=None)
     
     # Foreign keys to players
@@ -184,6 +205,8 @@ class DamageDealtEvent(Base):
         Index('idx_damage_zone', 'zone'),
         Index('idx_damage_distance', 'distance'),
         Index('idx_damage_time', 'game_time_seconds'),
+        Index('idx_damage_unique', 'match_id', 'timestamp', 'actor_id', 'recipient_id', 'weapon_id', unique=True),
+        _event_table_options,
     )
 
     def __repr__(self):
@@ -195,15 +218,15 @@ class EliminationEvent(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     match_id: Mapped[str] = mapped_column(String(50), ForeignKey("matches.match_id"))
-    timestamp: Mapped[datetime] = mapped_column(DateTime)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, primary_key=EVENT_PARTITIONING)
     game_time_seconds: Mapped[Optional[int]] = mapped_column(Integer, default=None)
     
     # Foreign keys to players
     actor_id: Mapped[int] = mapped_column(Integer, ForeignKey("match_players.id"))
     recipient_id: Mapped[int] = mapped_column(Integer, ForeignKey("match_players.id"))
     
-    # Weapon info
-    weapon_id: Mapped[str] = mapped_column(String(100))
+    # Weapon info (the weapon of the eliminator's last hit; None for storm eliminations)
+    weapon_id: Mapped[Optional[str]] = mapped_column(String(100), default=None)
     weapon_type: Mapped[Optional[str]] = mapped_column(String(50), default=None)
     
     # Positions
@@ -225,36 +248,184 @@ class EliminationEvent(Base):
         Index('idx_elim_actor', 'actor_id'),
         Index('idx_elim_recipient', 'recipient_id'),
         Index('idx_elim_zone', 'zone'),
+        Index('idx_elim_unique', 'match_id', 'timestamp', 'actor_id', 'recipient_id', unique=True),
+        _event_table_options,
     )
 
     def __repr__(self):
         return f"<EliminationEvent(actor_id={self.actor_id}, recipient_id={self.recipient_id}, match_id={self.match_id})>"
 
 
-# Database connection functions
-def get_engine():
-    database_url = os.getenv("DATABASE_URL")
-    if not database_url:
-        raise ValueError("DATABASE_URL not set in .env")
-    return create_engine(database_url, echo=False)
+# Summary tables, recomputed per match from its parsed events (etl.parsing.rollups)
+
+class MatchStats(Base):
+    __tablename__ = "match_stats"
+
+    match_id: Mapped[str] = mapped_column(String(50), ForeignKey("matches.match_id"), primary_key=True)
+    players: Mapped[int] = mapped_column(Integer)
+    damage_dealt: Mapped[float] = mapped_column(Float)
+    hits: Mapped[int] = mapped_column(Integer)
+    eliminations: Mapped[int] = mapped_column(Integer)
+    avg_hit_distance: Mapped[Optional[float]] = mapped_column(Float, default=None)
+    avg_elim_distance: Mapped[Optional[float]] = mapped_column(Float, default=None)
+
+    def __repr__(self):
+        return f"<MatchStats(match_id={self.match_id}, damage_dealt={self.damage_dealt}, eliminations={self.eliminations})>"
+
+
+class PlayerMatchStats(Base):
+    __tablename__ = "player_match_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    match_id: Mapped[str] = mapped_column(String(50), ForeignKey("matches.match_id"))
+    epic_id: Mapped[str] = mapped_column(String(100))
+
+    damage_dealt: Mapped[float] = mapped_column(Float)
+    damage_taken: Mapped[float] = mapped_column(Float)
+    hits: Mapped[int] = mapped_column(Integer)
+    eliminations: Mapped[int] = mapped_column(Integer)
+    deaths: Mapped[int] = mapped_column(Integer)
+    avg_hit_distance: Mapped[Optional[float]] = mapped_column(Float, default=None)
+    avg_elim_distance: Mapped[Optional[float]] = mapped_column(Float, default=None)
+
+    __table_args__ = (
+        Index('idx_player_stats_player', 'epic_id'),
+        Index('idx_player_stats_unique', 'match_id', 'epic_id', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<PlayerMatchStats(epic_id={self.epic_id}, match_id={self.match_id}, damage_dealt={self.damage_dealt})>"
 
 
-def get_session() -> Session:
-    engine = get_engine()
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
+class PlayerWeaponStats(Base):
+    __tablename__ = "player_weapon_stats"
 
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    match_id: Mapped[str] = mapped_column(String(50), ForeignKey("matches.match_id"))
+    epic_id: Mapped[str] = mapped_column(String(100))
+    weapon_type: Mapped[str] = mapped_column(String(50))
+
+    damage_dealt: Mapped[float] = mapped_column(Float)
+    hits: Mapped[int] = mapped_column(Integer)
+    eliminations: Mapped[int] = mapped_column(Integer)
+    avg_hit_distance: Mapped[Optional[float]] = mapped_column(Float, default=None)
+
+    __table_args__ = (
+        Index('idx_weapon_stats_player', 'epic_id'),
+        Index('idx_weapon_stats_weapon', 'weapon_type'),
+        Index('idx_weapon_stats_unique', 'match_id', 'epic_id', 'weapon_type', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<PlayerWeaponStats(epic_id={self.epic_id}, weapon_type={self.weapon_type}, match_id={self.match_id})>"
+
+
+class MatchZoneStats(Base):
+    __tablename__ = "match_zone_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    match_id: Mapped[str] = mapped_column(String(50), ForeignKey("matches.match_id"))
+    zone: Mapped[int] = mapped_column(Integer)
+
+    damage_dealt: Mapped[float] = mapped_column(Float)
+    hits: Mapped[int] = mapped_column(Integer)
+    eliminations: Mapped[int] = mapped_column(Integer)
+    avg_hit_distance: Mapped[Optional[float]] = mapped_column(Float, default=None)
+    avg_elim_distance: Mapped[Optional[float]] = mapped_column(Float, default=None)
+
+    __table_args__ = (
+        Index('idx_zone_stats_zone', 'zone'),
+        Index('idx_zone_stats_unique', 'match_id', 'zone', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<MatchZoneStats(match_id={self.match_id}, zone={self.zone}, eliminations={self.eliminations})>"
+
+
+# Database connection functions
 
-def init_db():
+# Embedded database used when DATABASE_URL is not set
+SQLITE_PATH = "data/etl.db"
+
+# SQLite settings for bulk ingestion: WAL lets readers query while the ETL
+# writes, and NORMAL sync is durable across crashes of the process in WAL mode
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -64_000,  # KiB
+    "busy_timeout": 30_000,  # ms
+}
+
+# One engine (and connection pool) per database URL, for the whole process
+_engines: dict[str, Engine] = {}
+_sessionmakers: dict[str, sessionmaker] = {}
+
+
+def database_url() -> str:
+    """
+    Returns DATABASE_URL, or the embedded SQLite database (SQLITE_PATH,
+    overridable with the env variable of the same name) if it is not set.
+    """
+    return os.getenv("DATABASE_URL") or f"sqlite:///{os.getenv('SQLITE_PATH', SQLITE_PATH)}"
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def _create_engine(url: str) -> Engine:
+    if not url.startswith("sqlite"):
+        return create_engine(url, echo=False)
+
+    path = make_url(url).database
+    if not path or path == ":memory:":
+        # A single shared connection, so every session sees the same
+        # in-memory database (e.g. for benchmarks and CI)
+        return create_engine(
+            url,
+            echo=False,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(url, echo=False, connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def get_engine(url: str | None = None) -> Engine:
+    """
+    Returns the engine of `url` (DATABASE_URL or the embedded SQLite
+    database by default), creating it on first use.
+    """
+    url = url or database_url()
+    if url not in _engines:
+        _engines[url] = _create_engine(url)
+    return _engines[url]
+
+
+def get_session(url: str | None = None) -> Session:
+    url = url or database_url()
+    if url not in _sessionmakers:
+        _sessionmakers[url] = sessionmaker(bind=get_engine(url))
+    return _sessionmakers[url]()
+
+
+def init_db(url: str | None = None):
     """Create all tables"""
-    engine = get_engine()
+    engine = get_engine(url)
     Base.metadata.create_all(engine)
     print("✅ Database tables created")
 
 
-def reinit_db():
+def reinit_db(url: str | None = None):
     """Drop and recreate all tables (WARNING: deletes all data)"""
-    engine = get_engine()
+    engine = get_engine(url)
     Base.metadata.drop_all(engine)
     Base.metadata.create_all(engine)
     print("✅ Database reinitialized")
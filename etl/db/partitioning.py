@@ -0,0 +1,125 @@
+"""
+Monthly range partitions of the event tables (PostgreSQL).
+
+With EVENT_PARTITIONING=month, `damage_dealt_events` and
+`elimination_events` are created as tables partitioned by range of
+`timestamp`, with one partition per calendar month, e.g.
+`damage_dealt_events_2024_01`. Indexes declared on the models are created on
+every partition, so each insert only maintains the (small) indexes of its
+month, and queries filtering on `timestamp` only scan the matching months.
+
+Partitions are created on demand by the loaders. Old months can be detached
+into the `archive` schema, where they stay queryable (or can be dumped and
+dropped) without slowing down the live tables.
+"""
+from datetime import datetime
+
+from sqlalchemy import column, table, text
+from sqlalchemy.orm import Session
+
+from etl.db.models import EVENT_PARTITIONING, DamageDealtEvent, EliminationEvent
+
+
+PARTITIONED_MODELS = (DamageDealtEvent, EliminationEvent)
+
+ARCHIVE_SCHEMA = "archive"
+
+# Partitions known to exist, so each one is only checked once per process
+_created: set[str] = set()
+
+
+def partitioning_enabled(session: Session) -> bool:
+    return EVENT_PARTITIONING and session.get_bind().dialect.name == "postgresql"
+
+
+def month_start(ts: datetime) -> datetime:
+    return datetime(ts.year, ts.month, 1)
+
+
+def next_month(month: datetime) -> datetime:
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: datetime) -> str:
+    return f"{table_name}_{month.year:04d}_{month.month:02d}"
+
+
+def ensure_partition(session: Session, model, month: datetime) -> str:
+    """Creates the partition of `model`'s table for `month` if needed and returns its name."""
+    parent = model.__tablename__
+    name = partition_name(parent, month)
+    if name not in _created:
+        session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month(month):%Y-%m-%d}')"
+        ))
+        session.commit()
+        _created.add(name)
+    return name
+
+
+def group_by_partition(session: Session, model, records: list[dict]) -> list[tuple[object, list[dict]]]:
+    """
+    Splits event records by month and returns (insert target, records)
+    pairs. The target is the month's partition when partitioning is enabled,
+    so rows are written to it directly instead of being routed through the
+    parent table, and the model itself otherwise.
+    """
+    if not partitioning_enabled(session):
+        return [(model, records)]
+
+    by_month: dict[datetime, list[dict]] = {}
+    for record in records:
+        by_month.setdefault(month_start(record["timestamp"]), []).append(record)
+
+    # A column construct belongs to a single table, so each partition gets its own
+    names = [c.name for c in model.__table__.columns if c.name != "id"]
+    return [
+        (table(ensure_partition(session, model, month), *(column(name) for name in names)), month_records)
+        for month, month_records in sorted(by_month.items())
+    ]
+
+
+def list_partitions(session: Session, model) -> list[str]:
+    """Returns the names of the partitions attached to `model`'s table."""
+    rows = session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent ORDER BY c.relname"
+        ),
+        {"parent": model.__tablename__},
+    )
+    return [name for (name,) in rows]
+
+
+def detach_partitions_before(session: Session, cutoff: datetime, archive: bool = True) -> list[str]:
+    """
+    Detaches every event partition of a month entirely before `cutoff`
+    (e.g. the start of the current season). With `archive`, the detached
+    tables are moved to the ARCHIVE_SCHEMA schema, otherwise they are left
+    as standalone tables in place.
+
+    Returns:
+        list[str]: Names of the detached partitions
+    """
+    if archive:
+        session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+
+    detached = []
+    for model in PARTITIONED_MODELS:
+        prefix = f"{model.__tablename__}_"
+        for name in list_partitions(session, model):
+            year, month = name[len(prefix):].split("_")
+            if next_month(datetime(int(year), int(month), 1)) > cutoff:
+                continue
+            session.execute(text(f"ALTER TABLE {model.__tablename__} DETACH PARTITION {name}"))
+            if archive:
+                session.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            _created.discard(name)
+            detached.append(name)
+    session.commit()
+
+    print(f"✅ Detached {len(detached)} partition(s) older than {cutoff:%Y-%m-%d}")
+    return detached
@@ -0,0 +1,74 @@
+from sqlalchemy import func, select
+
+from etl.db import loader
+from etl.db.models import DamageDealtEvent, EliminationEvent, Match, MatchStats, PlayerWeaponStats
+from etl.parsing.match_parsing import parse_damage_dealt, parse_elims, parse_match_metadata
+from etl.parsing.rollups import compute_match_rollups
+
+
+def _count(session, model) -> int:
+    return session.scalar(select(func.count()).select_from(model))
+
+
+def _load_match(session, match_id: str):
+    metadata = parse_match_metadata(match_id)
+    metadata["event_window_id"] = "EW1"
+    loader.load_match_metadata(metadata, session, upsert=True)
+
+
+def test_event_upserts_are_idempotent(synthetic_match, session):
+    _load_match(session, synthetic_match)
+    damage = parse_damage_dealt(synthetic_match)
+    elims = parse_elims(synthetic_match)
+
+    assert loader.load_damage_dealt_events(damage, synthetic_match, session, upsert=True) == len(damage)
+    assert loader.load_elimination_events(elims, synthetic_match, session, upsert=True) == len(elims)
+
+    assert loader.load_damage_dealt_events(damage, synthetic_match, session, upsert=True) == 0
+    assert loader.load_elimination_events(elims, synthetic_match, session, upsert=True) == 0
+    assert _count(session, DamageDealtEvent) == len(damage)
+    assert _count(session, EliminationEvent) == len(elims)
+
+
+def test_match_metadata_upsert_updates_in_place(synthetic_match, session):
+    _load_match(session, synthetic_match)
+    _load_match(session, synthetic_match)
+    assert _count(session, Match) == 1
+
+
+def test_bulk_upsert_overwrites_update_cols(session):
+    row = {"match_id": "m1", "players": 10, "damage_dealt": 1.0, "hits": 1, "eliminations": 0}
+    loader.bulk_upsert(session, MatchStats, [row], ["match_id"])
+    loader.bulk_upsert(session, MatchStats, [{**row, "players": 99}], ["match_id"])
+    assert session.scalar(select(MatchStats.players)) == 10
+
+    loader.bulk_upsert(session, MatchStats, [{**row, "players": 99}], ["match_id"], ["players"])
+    assert session.scalar(select(MatchStats.players)) == 99
+
+
+def test_load_match_rollups_replaces_stale_rows(session):
+    players = [{"epic_id": "a"}, {"epic_id": "b"}]
+    damage = [
+        {"actor_id": "a", "recipient_id": "b", "weapon_type": "rifle", "damage": 30.0, "distance": 10.0, "zone": 1},
+    ]
+    loader.load_match_rollups(compute_match_rollups("m1", players, damage, []), "m1", session)
+    assert session.scalars(select(PlayerWeaponStats.weapon_type)).all() == ["rifle"]
+
+    damage[0]["weapon_type"] = "shotgun"
+    loader.load_match_rollups(compute_match_rollups("m1", players, damage, []), "m1", session)
+    assert session.scalars(select(PlayerWeaponStats.weapon_type)).all() == ["shotgun"]
+    assert _count(session, MatchStats) == 1
+
+
+def test_loaders_leave_the_commit_to_the_caller(session):
+    players = [{"epic_id": "a"}, {"epic_id": "b"}]
+    damage = [
+        {"actor_id": "a", "recipient_id": "b", "weapon_type": "rifle", "damage": 30.0, "distance": 10.0, "zone": 1},
+    ]
+    loader.load_match_rollups(compute_match_rollups("m1", players, damage, []), "m1", session)
+    session.commit()
+
+    damage[0]["weapon_type"] = "shotgun"
+    loader.load_match_rollups(compute_match_rollups("m1", players, damage, []), "m1", session)
+    session.rollback()
+    assert session.scalars(select(PlayerWeaponStats.weapon_type)).all() == ["rifle"]
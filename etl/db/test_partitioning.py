@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from etl.db import partitioning
+from etl.db.models import DamageDealtEvent
+from etl.db.partitioning import group_by_partition, month_start, next_month, partition_name
+
+
+def test_month_arithmetic():
+    assert month_start(datetime(2024, 3, 17, 12, 30)) == datetime(2024, 3, 1)
+    assert next_month(datetime(2024, 3, 1)) == datetime(2024, 4, 1)
+    assert next_month(datetime(2024, 12, 1)) == datetime(2025, 1, 1)
+    assert partition_name("damage_dealt_events", datetime(2024, 3, 1)) == "damage_dealt_events_2024_03"
+
+
+def test_unpartitioned_records_go_to_the_model(session):
+    records = [{"timestamp": datetime(2024, 1, 5)}, {"timestamp": datetime(2024, 2, 5)}]
+    assert group_by_partition(session, DamageDealtEvent, records) == [(DamageDealtEvent, records)]
+
+
+def test_records_are_routed_to_their_month(session, monkeypatch):
+    monkeypatch.setattr(partitioning, "partitioning_enabled", lambda session: True)
+    monkeypatch.setattr(
+        partitioning, "ensure_partition",
+        lambda session, model, month: partition_name(model.__tablename__, month),
+    )
+    records = [
+        {"timestamp": datetime(2024, 2, 29, 23, 59)},
+        {"timestamp": datetime(2024, 1, 1)},
+        {"timestamp": datetime(2024, 2, 1)},
+    ]
+
+    groups = group_by_partition(session, DamageDealtEvent, records)
+    assert [(target.name, rows) for target, rows in groups] == [
+        ("damage_dealt_events_2024_01", [records[1]]),
+        ("damage_dealt_events_2024_02", [records[0], records[2]]),
+    ]
+    # the id is generated by the parent table's sequence
+    assert "id" not in groups[0][0].c
+    assert "timestamp" in groups[0][0].c
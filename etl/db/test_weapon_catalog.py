@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from sqlalchemy import select
+
+from etl.db import weapon_catalog
+from etl.db.models import Weapon
+from etl.db.weapon_catalog import WeaponCatalog
+from etl.parsing.rollups import UNKNOWN_WEAPON_TYPE
+
+
+def _write_weapons(match_id: str, weapons: list[dict]):
+    path = Path(f"data/raw/match_{match_id}/weapons.json")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"weapons": weapons}))
+
+
+RIFLE = {"weaponId": "WID_Rifle", "weaponType": "Assault Rifle", "weaponName": "Rifle"}
+UNTYPED = {"weaponId": "WID_Mystery", "weaponName": "Mystery"}
+
+
+def test_known_weapons_are_not_written_again(session, monkeypatch):
+    _write_weapons("a", [RIFLE])
+    _write_weapons("b", [RIFLE])
+    _write_weapons("c", [RIFLE])
+    writes = []
+    load_weapons = weapon_catalog.load_weapons
+    monkeypatch.setattr(
+        weapon_catalog, "load_weapons",
+        lambda weapons, *args: writes.append([w["weapon_id"] for w in weapons]) or load_weapons(weapons, *args),
+    )
+
+    catalog = WeaponCatalog().load(session)
+    assert catalog.add_match("a", "EW1", session) == 1
+    assert catalog.add_match("a", "EW1", session) == 0
+    assert catalog.add_match("b", "EW1", session) == 0
+    assert catalog.add_match("c", "EW2", session) == 0
+    session.commit()
+    assert writes == [["WID_Rifle"], ["WID_Rifle"]]
+
+    # a new process knows the recorded pairs from the database
+    writes.clear()
+    assert WeaponCatalog().load(session).add_match("c", "EW2", session) == 0
+    assert writes == []
+
+
+def test_weapons_without_a_type_are_loaded(session):
+    _write_weapons("a", [RIFLE, UNTYPED])
+    catalog = WeaponCatalog().load(session)
+    assert catalog.add_match("a", "EW1", session) == 2
+    session.commit()
+
+    assert catalog.weapon_type("WID_Mystery") == UNKNOWN_WEAPON_TYPE
+    types = dict(session.execute(select(Weapon.weapon_id, Weapon.weapon_type)).all())
+    assert types == {"WID_Rifle": "Assault Rifle", "WID_Mystery": UNKNOWN_WEAPON_TYPE}
@@ -0,0 +1,107 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from etl.db.loader import load_weapons
+from etl.db.models import Weapon
+from etl.parsing.event_parser import parse_match_weapons, weapon_rarity
+from etl.parsing.rollups import UNKNOWN_WEAPON_TYPE
+
+
+class WeaponCatalog:
+    """
+    Cross-match weapon catalog: weapon id -> type, name and rarity.
+
+    Backed by the `weapons` table and cached in memory, so it is read from
+    the database once per process and grows as matches are fetched
+    (add_match), instead of rescanning every match's weapons.json.
+    """
+
+    def __init__(self):
+        self.weapons: dict[str, dict] = {}
+        # (weapon_id, event_window_id) pairs already in the weapons table
+        self.recorded: set[tuple[str, str]] = set()
+        # matches whose weapons were added since the catalog was loaded
+        self.matches: set[str] = set()
+
+    def load(self, session: Session) -> "WeaponCatalog":
+        """Fills the cache with every weapon in the database."""
+        stmt = select(
+            Weapon.weapon_id, Weapon.weapon_type, Weapon.weapon_name, Weapon.rarity, Weapon.event_window_id
+        )
+        for weapon_id, weapon_type, weapon_name, rarity, event_window_id in session.execute(stmt):
+            self.weapons[weapon_id] = {
+                "weapon_id": weapon_id,
+                "weapon_type": weapon_type,
+                "weapon_name": weapon_name,
+                "rarity": rarity,
+            }
+            self.recorded.add((weapon_id, event_window_id))
+        return self
+
+    def __contains__(self, weapon_id: str) -> bool:
+        return weapon_id in self.weapons
+
+    def __len__(self) -> int:
+        return len(self.weapons)
+
+    def add_match(self, match_id: str, event_window_id: str, session: Session) -> int:
+        """
+        Adds the weapons of a fetched match to the catalog and records the
+        ones not yet recorded for its event window (the caller commits).
+        A match already added is skipped without rereading its weapons.
+
+        Returns:
+            int: Number of weapons new to the catalog
+        """
+        if match_id in self.matches:
+            return 0
+        weapons = parse_match_weapons(match_id)
+        for w in weapons:
+            # the weapons table requires a type
+            w["weapon_type"] = w["weapon_type"] or UNKNOWN_WEAPON_TYPE
+
+        new = [w for w in weapons if w["weapon_id"] not in self.weapons]
+        unrecorded = [w for w in weapons if (w["weapon_id"], event_window_id) not in self.recorded]
+        if unrecorded:
+            load_weapons(unrecorded, event_window_id, session)
+            self.recorded.update((w["weapon_id"], event_window_id) for w in unrecorded)
+        for w in weapons:
+            # a match without the type does not hide the one already known
+            if w["weapon_type"] != UNKNOWN_WEAPON_TYPE or w["weapon_id"] not in self.weapons:
+                self.weapons[w["weapon_id"]] = w
+        self.matches.add(match_id)
+        return len(new)
+
+    def get(self, weapon_id: str | None) -> dict | None:
+        return self.weapons.get(weapon_id) if weapon_id else None
+
+    def weapon_type(self, weapon_id: str | None) -> str | None:
+        weapon = self.get(weapon_id)
+        return weapon["weapon_type"] if weapon else None
+
+    def rarity(self, weapon_id: str | None) -> str | None:
+        weapon = self.get(weapon_id)
+        if weapon and weapon["rarity"]:
+            return weapon["rarity"]
+        return weapon_rarity(weapon_id) if weapon_id else None
+
+    def annotate(self, rows: list[dict]) -> list[dict]:
+        """Sets `weapon_type` on parsed event rows from their `weapon_id`, in place."""
+        types = {
+            weapon_id: self.weapon_type(weapon_id)
+            for weapon_id in {row["weapon_id"] for row in rows}
+        }
+        for row in rows:
+            row["weapon_type"] = types[row["weapon_id"]]
+        return rows
+
+
+_catalog: WeaponCatalog | None = None
+
+
+def get_weapon_catalog(session: Session) -> WeaponCatalog:
+    """Returns the process-wide catalog, loading it from the database on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = WeaponCatalog().load(session)
+    return _catalog
@@ -0,0 +1,241 @@
+"""
+Columnar export of parsed match data to Parquet, for analytics.
+
+Writes the enriched damage and elimination events, the raw movement samples
+and the replay frames of every match of an event window to
+
+    data/parquet/<dataset>/event_window_id=<id>/match_id=<id>/part-0.parquet
+
+(hive partitioning), straight from the columnar parser outputs. Rows are
+sorted by time (`timestamp`, or `frame` for the replay frames) and split
+into row groups with min/max statistics per column, so readers can skip
+files and row groups with predicate pushdown:
+
+    python -m etl.export.parquet S33_FNCSMajor1_Final_Day1_EU
+
+Requires the optional `pyarrow` dependency.
+"""
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+
+from etl.instrumentation import span
+from etl.log import configure_logging
+from etl.parsing.event_parser import parse_event_matches
+from etl.parsing.match_parsing import (
+    excluded_player_ids,
+    parse_damage_dealt_columns,
+    parse_elims_columns,
+)
+from etl.parsing.position_index import PositionIndex
+
+
+PARQUET_DIR = "data/parquet"
+
+DATASETS = ("damage_dealt", "elims", "movement", "frames")
+
+# Replay frame state columns, in the order of get_match_object()'s state array
+FRAME_COLUMNS = ("x", "y", "z", "yaw", "health", "shield", "alive", "knocked")
+
+ROW_GROUP_SIZE = 128_000
+
+# Columns rows are sorted by before writing, the first one present
+TIME_COLUMNS = ("timestamp", "frame")
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+    return pa, pq
+
+
+def columns_to_table(columns: dict[str, np.ndarray]):
+    """Converts a columnar parser result into a pyarrow Table."""
+    pa, _ = _pyarrow()
+    arrays = {}
+    for name, values in columns.items():
+        # object columns hold ids (str or None)
+        if values.dtype == object:
+            arrays[name] = pa.array(values.tolist(), type=pa.string())
+        else:
+            arrays[name] = pa.array(values)
+    return pa.table(arrays)
+
+
+def partition_path(dataset: str, event_window_id: str, match_id: str, root: str = PARQUET_DIR) -> Path:
+    return Path(root) / dataset / f"event_window_id={event_window_id}" / f"match_id={match_id}"
+
+
+def write_partition(
+    dataset: str,
+    columns: dict[str, np.ndarray],
+    event_window_id: str,
+    match_id: str,
+    root: str = PARQUET_DIR
+) -> int:
+    """
+    Writes one match's columns of a dataset, sorted by time, replacing any
+    previous export of that match. Returns the number of rows written.
+    """
+    _, pq = _pyarrow()
+    time_column = next((name for name in TIME_COLUMNS if name in columns), None)
+    if time_column is not None:
+        order = np.argsort(columns[time_column], kind="stable")
+        columns = {name: values[order] for name, values in columns.items()}
+    table = columns_to_table(columns)
+
+    path = partition_path(dataset, event_window_id, match_id, root)
+    path.mkdir(parents=True, exist_ok=True)
+    tmp_path = path / "part-0.parquet.tmp"
+    with span(f"export:{dataset}", rows_in=table.num_rows) as s:
+        pq.write_table(
+            table,
+            tmp_path,
+            row_group_size=ROW_GROUP_SIZE,
+            compression="zstd",
+            write_statistics=True,
+        )
+        os.replace(tmp_path, path / "part-0.parquet")
+        s.rows_out = table.num_rows
+    return table.num_rows
+
+
+def movement_columns(positions: PositionIndex) -> dict[str, np.ndarray]:
+    """Returns every player's movement samples as columns, ordered by player then time."""
+    player_ids = positions.player_ids()
+    lengths = [len(ts) for ts in positions.timestamps]
+    coords = np.concatenate(positions.coords) if player_ids else np.empty((0, 3))
+    return {
+        "player_id": np.repeat(np.array(player_ids, dtype=object), lengths),
+        "timestamp": np.concatenate(positions.timestamps or [np.empty(0, np.int64)]),
+        "x": coords[:, 0],
+        "y": coords[:, 1],
+        "z": coords[:, 2],
+        "yaw": np.concatenate(positions.yaws or [np.empty(0)]),
+    }
+
+
+def frame_columns(player_index: dict[str, int], frames: np.ndarray, hz: int) -> dict[str, np.ndarray]:
+    """
+    Flattens the replay frames of get_match_object() into one row per frame
+    and player.
+    """
+    n_frames, n_players = len(frames), len(player_index)
+    state = np.asarray(frames, dtype=np.float32).reshape(n_frames, n_players, len(FRAME_COLUMNS))
+    player_ids = np.empty(n_players, dtype=object)
+    for pid, idx in player_index.items():
+        player_ids[idx] = pid
+
+    frame = np.repeat(np.arange(n_frames, dtype=np.int32), n_players)
+    columns = {
+        "frame": frame,
+        "game_time_seconds": (frame / hz).astype(np.float32),
+        "player_id": np.tile(player_ids, n_frames),
+    }
+    flat = state.reshape(n_frames * n_players, -1)
+    for i, name in enumerate(FRAME_COLUMNS):
+        columns[name] = flat[:, i]
+    return columns
+
+
+def export_match(
+    match_id: str,
+    event_window_id: str,
+    root: str = PARQUET_DIR,
+    frames_hz: int | None = 20,
+    catalog=None
+) -> dict[str, int]:
+    """
+    Exports the parsed data of a match to Parquet.
+
+    Args:
+        match_id: The match to export (raw logs must be fetched)
+        event_window_id: The event window of the match, used for partitioning
+        root: Root directory of the datasets
+        frames_hz: Frame rate of the exported replay frames; None skips them
+        catalog: Optional WeaponCatalog, to add weapon_type to the events
+
+    Returns:
+        dict: Number of rows written per dataset
+    """
+    print(f"Exporting match {match_id} to Parquet...")
+    columns = {
+        "damage_dealt": parse_damage_dealt_columns(match_id),
+        "elims": parse_elims_columns(match_id),
+    }
+    if catalog is not None:
+        for name in ("damage_dealt", "elims"):
+            columns[name]["weapon_type"] = np.array(
+                [catalog.weapon_type(w) for w in columns[name]["weapon_id"]], dtype=object
+            )
+
+    positions = PositionIndex.from_log(
+        f"data/raw/match_{match_id}/movement_events.json", excluded_player_ids(match_id)
+    )
+    columns["movement"] = movement_columns(positions)
+
+    if frames_hz:
+        # boto3 and the replay dependencies are only needed for frames
+        from etl.parsing.replay_parsing import get_match_object
+        player_index, frames = get_match_object(match_id, hz=frames_hz)
+        columns["frames"] = frame_columns(player_index, frames, frames_hz)
+
+    rows = {
+        name: write_partition(name, cols, event_window_id, match_id, root)
+        for name, cols in columns.items()
+    }
+    print(f"✅ Exported match {match_id}: " + ", ".join(f"{n} {name}" for name, n in rows.items()))
+    return rows
+
+
+def export_event_window(
+    event_window_id: str,
+    root: str = PARQUET_DIR,
+    frames_hz: int | None = 20,
+    catalog=None
+) -> dict[str, int]:
+    """
+    Exports every fetched match of an event window to Parquet. Matches whose
+    raw logs are missing are skipped. Returns the total rows per dataset.
+    """
+    totals = {}
+    for match in parse_event_matches(event_window_id):
+        match_id = match["info"]["matchId"]
+        if not Path(f"data/raw/match_{match_id}/info.json").exists():
+            print(f"⏭️  Match {match_id} is not fetched, skipping...")
+            continue
+        for name, n in export_match(match_id, event_window_id, root, frames_hz, catalog).items():
+            totals[name] = totals.get(name, 0) + n
+    return totals
+
+
+def dataset(name: str, root: str = PARQUET_DIR):
+    """
+    Opens an exported dataset as a pyarrow Dataset, with event_window_id and
+    match_id as partition columns, e.g.
+
+        dataset("damage_dealt").to_table(
+            columns=["actor_id", "damage"],
+            filter=(pc.field("event_window_id") == window) & (pc.field("zone") >= 8),
+        )
+    """
+    _pyarrow()
+    import pyarrow.dataset as ds
+    return ds.dataset(Path(root) / name, format="parquet", partitioning="hive")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export an event window's parsed matches to Parquet.")
+    parser.add_argument("event_window_id")
+    parser.add_argument("--root", default=PARQUET_DIR)
+    parser.add_argument("--frames-hz", type=int, default=20, help="0 skips the replay frames")
+    args = parser.parse_args()
+    configure_logging()
+
+    totals = export_event_window(args.event_window_id, args.root, args.frames_hz or None)
+    print(f"✅ Exported {args.event_window_id}: " + ", ".join(f"{n} {name}" for name, n in totals.items()))
@@ -0,0 +1,182 @@
+"""
+Lightweight per-stage instrumentation of the ETL.
+
+A `record()` scope (e.g. one match or one event window) aggregates every
+`span()` and `count()` made while it is active on the current thread: wall
+time, CPU time, peak RSS growth and rows in/out per stage, plus named
+counters, and the peak RSS of the process. Scopes nest, so an event
+window's totals include its matches. When a scope ends its summary is
+appended as one JSON line to METRICS_PATH.
+
+    with record("match", match_id=match_id):
+        with span("parse:damage_dealt") as s:
+            rows = parse_damage_dealt(match_id)
+            s.rows_out = len(rows)
+
+A span costs a few clock reads and two getrusage() calls, so they are
+meant for stages (a request, a parser, a loader), not for single events.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Where scope summaries are appended, as JSON lines (empty to disable)
+METRICS_PATH = os.getenv("ETL_METRICS_PATH", "data/metrics/stages.jsonl")
+
+_local = threading.local()
+
+
+def peak_rss_mb() -> float | None:
+    """Returns the peak resident set size of the process so far (MB)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _active() -> list["Recorder"]:
+    if not hasattr(_local, "recorders"):
+        _local.recorders = []
+    return _local.recorders
+
+
+class Span:
+    """Measurements of a single run of a stage."""
+
+    __slots__ = ("name", "rows_in", "rows_out", "wall", "cpu", "peak_rss_growth_mb")
+
+    def __init__(self, name: str, rows_in: int | None = None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out: int | None = None
+        self.wall = 0.0
+        self.cpu = 0.0
+        # how much the stage raised the process' peak RSS: 0 unless it used
+        # more memory than any earlier stage
+        self.peak_rss_growth_mb: float | None = None
+
+
+class Recorder:
+    """Aggregates the spans and counters of one scope, per stage name."""
+
+    def __init__(self, scope: str, **labels):
+        self.scope = scope
+        self.labels = labels
+        self.stages: dict[str, dict] = {}
+        self.counters: defaultdict[str, int] = defaultdict(int)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def add(self, span: Span):
+        stage = self.stages.setdefault(span.name, {
+            "calls": 0, "wall": 0.0, "cpu": 0.0, "rows_in": 0, "rows_out": 0, "peak_rss_growth_mb": None,
+        })
+        stage["calls"] += 1
+        stage["wall"] += span.wall
+        stage["cpu"] += span.cpu
+        stage["rows_in"] += span.rows_in or 0
+        stage["rows_out"] += span.rows_out or 0
+        if span.peak_rss_growth_mb is not None:
+            stage["peak_rss_growth_mb"] = (stage["peak_rss_growth_mb"] or 0.0) + span.peak_rss_growth_mb
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def summary(self) -> dict:
+        return {
+            "scope": self.scope,
+            "time": datetime.now(timezone.utc).isoformat(),
+            **self.labels,
+            "wall": time.perf_counter() - self._wall_start,
+            "cpu": time.process_time() - self._cpu_start,
+            "process_peak_rss_mb": peak_rss_mb(),
+            "stages": self.stages,
+            "counters": dict(self.counters),
+        }
+
+    def emit(self, path: str | None = METRICS_PATH):
+        """Appends the summary of the scope to `path` as one JSON line."""
+        if not path:
+            return
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(self.summary(), default=str) + "\n")
+
+    def print_summary(self):
+        """Prints the per-stage totals of the scope as a table."""
+        summary = self.summary()
+        labels = ", ".join(f"{k}={v}" for k, v in self.labels.items())
+        peak = summary["process_peak_rss_mb"]
+        print(
+            f"\n⏱️  {self.scope} ({labels}): {summary['wall']:.2f}s wall, {summary['cpu']:.2f}s CPU"
+            + (f", process peak RSS {peak:.0f} MB" if peak is not None else "")
+        )
+        print(f"   {'stage':<36} {'calls':>6} {'wall s':>9} {'cpu s':>9} {'rows in':>9} {'rows out':>9} {'peak +MB':>8}")
+        for name, s in sorted(self.stages.items(), key=lambda item: -item[1]["wall"]):
+            rss = f"{s['peak_rss_growth_mb']:.0f}" if s["peak_rss_growth_mb"] is not None else "-"
+            print(
+                f"   {name:<36} {s['calls']:>6} {s['wall']:>9.3f} {s['cpu']:>9.3f} "
+                f"{s['rows_in']:>9} {s['rows_out']:>9} {rss:>8}"
+            )
+        for name, value in sorted(self.counters.items()):
+            print(f"   {name}: {value}")
+
+
+@contextmanager
+def record(scope: str, **labels):
+    """
+    Collects the spans and counters of the enclosed code into a new Recorder
+    (yielded), and emits its summary when the scope ends, even on errors.
+    """
+    recorder = Recorder(scope, **labels)
+    active = _active()
+    active.append(recorder)
+    try:
+        yield recorder
+    finally:
+        active.remove(recorder)
+        try:
+            recorder.emit()
+        except OSError as e:
+            print(f"⚠️  Could not write metrics: {e}")
+
+
+@contextmanager
+def span(name: str, rows_in: int | None = None):
+    """
+    Times the enclosed stage and adds it to every active scope. Set
+    `rows_out` on the yielded Span to record the rows the stage produced.
+    """
+    s = Span(name, rows_in)
+    peak_start = peak_rss_mb()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield s
+    finally:
+        s.wall = time.perf_counter() - wall_start
+        s.cpu = time.process_time() - cpu_start
+        if peak_start is not None:
+            s.peak_rss_growth_mb = peak_rss_mb() - peak_start
+        for recorder in _active():
+            recorder.add(s)
+
+
+def count(name: str, n: int = 1):
+    """Increments the counter `name` of every active scope."""
+    for recorder in _active():
+        recorder.count(name, n)
@@ -0,0 +1,205 @@
+# python -m etl.jobs.backfill S33_FNCSMajor1_Final_Day1_EU S33_FNCSMajor1_Final_Day2_EU
+# python -m etl.jobs.backfill --queue --workers 4
+import argparse
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from sqlalchemy import Engine, Index, inspect, text
+
+from etl.db.models import DamageDealtEvent, EliminationEvent, get_engine
+from etl.jobs.work_queue import WorkQueue
+from etl.log import configure_logging
+
+
+# Append-only event tables, whose indexes dominate the cost of a backfill
+DEFERRED_MODELS = (DamageDealtEvent, EliminationEvent)
+
+
+def deferrable_indexes() -> list[Index]:
+    """
+    Returns the non-unique secondary indexes of the event tables
+    (DEFERRED_MODELS). Unique indexes are kept during a backfill, since the
+    loaders' ON CONFLICT upserts rely on them, and so are the indexes of the
+    other tables, which the loaders query per match (e.g. `idx_player_match`).
+    """
+    return [
+        index
+        for model in DEFERRED_MODELS
+        for index in sorted(model.__table__.indexes, key=lambda i: i.name)
+        if not index.unique
+    ]
+
+
+def _format_eta(done: int, total: int, elapsed: float) -> str:
+    if not done:
+        return "ETA unknown"
+    remaining = elapsed / done * (total - done)
+    return f"ETA {timedelta(seconds=round(remaining))}"
+
+
+def _existing_index_names(engine: Engine, indexes: list[Index]) -> set[str]:
+    inspector = inspect(engine)
+    return {
+        index["name"]
+        for table in {index.table.name for index in indexes}
+        if inspector.has_table(table)
+        for index in inspector.get_indexes(table)
+    }
+
+
+def drop_indexes(engine: Engine, indexes: list[Index]) -> list[Index]:
+    """Drops the indexes that exist and returns them."""
+    existing = _existing_index_names(engine, indexes)
+    dropped = [index for index in indexes if index.name in existing]
+    for index in dropped:
+        index.drop(engine)
+    print(f"🗑️  Dropped {len(dropped)} secondary index(es) for the backfill")
+    return dropped
+
+
+def build_indexes(engine: Engine, indexes: list[Index], workers: int = 4) -> int:
+    """
+    (Re)creates missing indexes after a bulk load and refreshes the planner
+    statistics of their tables. PostgreSQL builds several indexes at once
+    (CREATE INDEX only takes a SHARE lock); SQLite has a single writer, so
+    its indexes are built one by one.
+
+    Returns:
+        int: Number of indexes built
+    """
+    if engine.dialect.name != "postgresql":
+        workers = 1
+
+    existing = _existing_index_names(engine, indexes)
+    missing = [index for index in indexes if index.name not in existing]
+    if not missing:
+        return 0
+
+    print(f"🔨 Building {len(missing)} index(es) with {workers} worker(s)...")
+
+    def build(index: Index) -> float:
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            index.create(conn)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(build, index): index for index in missing}
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            seconds = future.result()
+            elapsed = time.perf_counter() - start
+            print(
+                f"  [{done}/{len(missing)}] {index.name} on {index.table.name} in {seconds:.1f}s, "
+                f"{_format_eta(done, len(missing), elapsed)}"
+            )
+
+    with engine.begin() as conn:
+        for table in sorted({index.table.name for index in missing}):
+            conn.execute(text(f"ANALYZE {table}"))
+
+    print(f"✅ Built {len(missing)} index(es) in {time.perf_counter() - start:.1f}s")
+    return len(missing)
+
+
+def _claim_all(queue: WorkQueue):
+    """Yields event window ids from the work queue until it is empty."""
+    while (item := queue.claim()) is not None:
+        yield item["event_window_id"]
+
+
+def run_backfill(
+    event_window_ids: list[str] | None = None,
+    from_queue: bool = False,
+    workers: int = 4,
+    engine: Engine | None = None
+) -> dict[str, int]:
+    """
+    Processes many event windows with the secondary indexes dropped, then
+    rebuilds them once at the end. Maintaining every index row by row across
+    millions of inserts costs far more than building it once over the loaded
+    rows.
+
+    The indexes are rebuilt even if the backfill fails or is interrupted;
+    if the process dies before that, running with no event windows
+    (`python -m etl.jobs.backfill`) rebuilds whatever is missing.
+
+    Args:
+        event_window_ids: Event windows to process, in order
+        from_queue: Also drain the pending items of the work queue
+        workers: Indexes built concurrently (PostgreSQL only)
+        engine: Database engine, the default one if None
+
+    Returns:
+        dict: Number of event windows processed and failed
+    """
+    # Imported here so the index commands do not need the API client
+    from etl.jobs.process_tournaments import process_event_window
+
+    engine = engine or get_engine()
+    event_window_ids = list(event_window_ids or [])
+    queue = WorkQueue() if from_queue else None
+    indexes = deferrable_indexes()
+    results = {"processed": 0, "failed": 0}
+
+    drop_indexes(engine, indexes)
+    start = time.perf_counter()
+    try:
+        pending = event_window_ids
+        if queue is not None:
+            pending = itertools.chain(event_window_ids, _claim_all(queue))
+
+        for done, event_window_id in enumerate(pending, 1):
+            window_results = process_event_window(event_window_id)
+            failed = (
+                window_results.get("status") == "error"
+                or window_results["failed"] > window_results["total"] / 2
+            )
+            results["failed" if failed else "processed"] += 1
+
+            if queue is not None:
+                if failed:
+                    queue.fail(event_window_id, window_results.get("error", "too many failed matches"))
+                else:
+                    queue.complete(event_window_id)
+
+            elapsed = time.perf_counter() - start
+            total = max(len(event_window_ids), done)
+            if queue is not None:
+                total += queue.counts().get("pending", 0)
+            print(
+                f"📈 Backfill: {done}/{total} event window(s) in {timedelta(seconds=round(elapsed))}, "
+                f"{_format_eta(done, total, elapsed)}"
+            )
+    finally:
+        if queue is not None:
+            queue.close()
+        build_indexes(engine, indexes, workers)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backfill event windows with secondary indexes dropped, rebuilding them at the end."
+    )
+    parser.add_argument("event_window_ids", nargs="*")
+    parser.add_argument("--queue", action="store_true", help="Also drain the pending work queue items")
+    parser.add_argument("--workers", type=int, default=4, help="Indexes built concurrently (PostgreSQL)")
+    args = parser.parse_args()
+    configure_logging()
+
+    if not args.event_window_ids and not args.queue:
+        # Only restore indexes left dropped by an interrupted backfill
+        build_indexes(get_engine(), deferrable_indexes(), args.workers)
+        return
+
+    results = run_backfill(args.event_window_ids, args.queue, args.workers)
+    print(f"✅ Backfill done: {results['processed']} processed, {results['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,36 @@
-import os
-import json
-import requests
-from pathlib import Path
-from dotenv import load_dotenv
-
-load_dotenv()
-
-BASE_URL = "https://api.osirion.gg/fortnite/v1"
-API_KEY = os.getenv("API_KEY") 
-INTERVAL_SECONDS = 2592000  # last 30 days
-SEEN_FILE = "data/events/seen_tournaments.json"
-
-
-def fetch_unparsed_tournaments():
-    pass
-
-
-def load_seen():
-    if not os.path.exists(SEEN_FILE):
-        return set()
-    try:
-        with open(SEEN_FILE, "r") as f:
-            return set(json.load(f))
-    except Exception:
-        return set()
-
-
-def fetch_tournaments():
-    url = f"{BASE_URL}/tournaments?intervalS={INTERVAL_SECONDS}"
-    headers = {"Authorization": f"Bearer {API_KEY}"}
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    data = response.json()
-    return data
-
-def check_for_new_tournaments():
-    seen = load_seen()
-    tournaments = fetch_tournaments().get("tournaments")
-    print(json.dumps(tournaments, indent=2))
+import time
+
+from etl.api.check_tournaments import fetch_tournaments, MAX_INTERVAL_SECONDS
+from etl.jobs.discovery_store import DiscoveryStore
+from etl.log import configure_logging
+
+# Re-request a little before the watermark so windows published around the
+# previous poll are not missed
+WATERMARK_OVERLAP_SECONDS = 300
+
+
+def discovery_interval(store: DiscoveryStore, now: float) -> int:
+    """
+    Returns the interval (in seconds) to request tournaments for: everything
+    since the last successful run, or the last 30 days on the first run.
+    """
+    last_run = store.get_watermark()
+    if last_run is None:
+        return MAX_INTERVAL_SECONDS
+    interval = max(0.0, now - last_run) + WATERMARK_OVERLAP_SECONDS
+    return int(min(interval, MAX_INTERVAL_SECONDS))
+
+
+def poll_tournaments(store: DiscoveryStore) -> tuple[list[dict], list[dict]]:
+    """
+    Fetches the tournaments published since the previous poll and returns
+    `(new, changed)`: tournaments whose event window was never seen before,
+    and already seen ones whose listing changed. Both are recorded in `store`
+    and the watermark is advanced.
+    """
+    now = time.time()
+    interval = discovery_interval(store, now)
+    tournaments = fetch_tournaments(interval).get("tournaments") or []
 
     # Deduplicate by eventWindowId
     unique = {}
@@ -47,23 +40,46 @@ def check_for_new_tournaments():
             if event_window and event_window not in unique:
                 unique[event_window] = t
 
-    new_tournaments = [t for eid, t in unique.items() if eid not in seen]
+    new_ids = set(store.filter_unseen(list(unique)))
+    new_tournaments = [t for eid, t in unique.items() if eid in new_ids]
+    changed = store.changed([t for eid, t in unique.items() if eid not in new_ids])
+    store.add(new_tournaments)
+
+    # Only advance the watermark once the new windows are recorded
+    store.set_watermark(now)
+    return new_tournaments, changed
+
+
+def fetch_unparsed_tournaments(store: DiscoveryStore | None = None) -> list[dict]:
+    """
+    Returns the tournaments whose event windows need (re)processing: newly
+    discovered ones and ones whose listing changed since the last poll.
+    """
+    new_tournaments, changed = poll_tournaments(store or DiscoveryStore())
+    return new_tournaments + changed
+
+
+def check_for_new_tournaments(store: DiscoveryStore | None = None) -> list[dict]:
+    """
+    Fetches the tournaments published since the previous run and returns the
+    ones whose event window has not been seen before, recording them as seen.
+    """
+    new_tournaments, _ = poll_tournaments(store or DiscoveryStore())
 
     if not new_tournaments:
-        print("No new tournaments found in the past month.")
-        return
+        print("No new tournaments found since the last run.")
+        return new_tournaments
 
-    print(f"Found {len(new_tournaments)} new tournament(s) in the past month:")
+    print(f"Found {len(new_tournaments)} new tournament(s) since the last run:")
     for t in new_tournaments:
         title = t.get("displayData", {}).get("title") or t.get("eventId")
         event_window = t.get("eventWindowId")
         print(f"• {title} ({event_window})")
-        seen.add(event_window)
-
-    save_seen(seen)
+    return new_tournaments
 
 
 if __name__ == "__main__":
+    configure_logging()
     try:
         check_for_new_tournaments()
     except Exception as e:
@@ -0,0 +1,153 @@
+import os
+import json
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+
+DISCOVERY_DB = "data/events/discovery.db"
+LEGACY_SEEN_FILE = "data/events/seen_tournaments.json"
+
+# Ids bound per IN (...) query, below SQLite's host parameter limit
+QUERY_CHUNK_SIZE = 500
+
+
+def _fingerprint(tournament: dict) -> str:
+    payload = json.dumps(tournament, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class DiscoveryStore:
+    """
+    SQLite-backed state for tournament discovery: the set of event windows
+    already seen (primary-key indexed, append-only) with a fingerprint of
+    their last seen listing, and named watermarks recording how far discovery
+    has progressed.
+    """
+
+    def __init__(self, path: str = DISCOVERY_DB):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS seen_event_windows (
+                event_window_id TEXT PRIMARY KEY,
+                event_id TEXT,
+                title TEXT,
+                first_seen REAL NOT NULL,
+                fingerprint TEXT
+            );
+            CREATE TABLE IF NOT EXISTS watermarks (
+                name TEXT PRIMARY KEY,
+                value REAL NOT NULL
+            );
+        """)
+        self._migrate_legacy_seen_file()
+
+    def _migrate_legacy_seen_file(self):
+        """Imports seen_tournaments.json the first time the store is opened."""
+        if not os.path.exists(LEGACY_SEEN_FILE):
+            return
+        if self.conn.execute("SELECT 1 FROM seen_event_windows LIMIT 1").fetchone():
+            return
+        try:
+            with open(LEGACY_SEEN_FILE, "r") as f:
+                legacy_ids = json.load(f)
+        except Exception:
+            return
+        # Legacy entries have no listing to fingerprint
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_event_windows (event_window_id, first_seen) VALUES (?, ?)",
+                [(event_window_id, time.time()) for event_window_id in legacy_ids]
+            )
+        print(f"Imported {len(legacy_ids)} event windows from {LEGACY_SEEN_FILE}")
+
+    def is_seen(self, event_window_id: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM seen_event_windows WHERE event_window_id = ?",
+            (event_window_id,)
+        ).fetchone()
+        return row is not None
+
+    def _fingerprints(self, event_window_ids: list[str]) -> dict[str, str | None]:
+        """
+        Returns the fingerprint of every seen event window in
+        `event_window_ids`, with one IN (...) query per chunk of ids.
+        """
+        ids = list(dict.fromkeys(event_window_ids))
+        fingerprints = {}
+        for i in range(0, len(ids), QUERY_CHUNK_SIZE):
+            chunk = ids[i:i + QUERY_CHUNK_SIZE]
+            rows = self.conn.execute(
+                "SELECT event_window_id, fingerprint FROM seen_event_windows "
+                f"WHERE event_window_id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            )
+            fingerprints.update(rows)
+        return fingerprints
+
+    def filter_unseen(self, event_window_ids: list[str]) -> list[str]:
+        """Returns the ids in `event_window_ids` that have not been seen yet."""
+        seen = self._fingerprints(event_window_ids)
+        return [eid for eid in event_window_ids if eid not in seen]
+
+    def changed(self, tournaments: list[dict]) -> list[dict]:
+        """
+        Returns the already seen tournaments whose listing changed since they
+        were last recorded (e.g. a new end time), and records the new
+        listing.
+        """
+        seen = self._fingerprints([t["eventWindowId"] for t in tournaments])
+        fingerprints = [_fingerprint(t) for t in tournaments]
+        changed = [
+            t for t, fingerprint in zip(tournaments, fingerprints)
+            if seen.get(t["eventWindowId"]) not in (None, fingerprint)
+        ]
+
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE seen_event_windows SET fingerprint = ? WHERE event_window_id = ?",
+                [(fingerprint, t["eventWindowId"]) for t, fingerprint in zip(tournaments, fingerprints)]
+            )
+        return changed
+
+    def add(self, tournaments: list[dict]):
+        """Marks the event windows of `tournaments` as seen."""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT OR IGNORE INTO seen_event_windows
+                    (event_window_id, event_id, title, first_seen, fingerprint)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        t["eventWindowId"],
+                        t.get("eventId"),
+                        (t.get("displayData") or {}).get("title"),
+                        now,
+                        _fingerprint(t),
+                    )
+                    for t in tournaments
+                ]
+            )
+
+    def get_watermark(self, name: str = "tournaments") -> float | None:
+        row = self.conn.execute(
+            "SELECT value FROM watermarks WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, value: float, name: str = "tournaments"):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO watermarks (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, value)
+            )
+
+    def close(self):
+        self.conn.close()
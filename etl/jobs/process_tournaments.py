@@ -1,12 +1,17 @@
+import os
 import json
 from datetime import datetime, timezone
-from sqlalchemy import select
+from pathlib import Path
+from sqlalchemy import select, update, func
 
 import etl.api.osirion_client as osr
+from etl import jsonio
 import etl.db.loader as loader
 
-from etl.api.check_fetched import event_window_fetched, fetch_match_missing
-from etl.parsing.cleaning import get_id_to_name_map
+from etl.api.match_data_fetcher import event_window_fetched, fetch_match_missing
+from etl.db.weapon_catalog import get_weapon_catalog
+from etl.instrumentation import record, span
+from etl.log import configure_logging
 
 from etl.db.models import (
     EventWindow,
@@ -24,50 +29,212 @@ from etl.db.loader import (
     load_elimination_events
 )
 from etl.parsing.event_parser import parse_event_window_metadata, parse_event_matches
-from etl.parsing.match_parser import (
+from etl.parsing.match_parsing import (
     parse_match_metadata, 
     parse_match_players,
     parse_elims, 
     parse_damage_dealt, 
 )
+from etl.parsing.rollups import compute_match_rollups
 
 
-def process_match(match_id: str, event_window_id: str, skip_if_exists: bool = False):
+PROCESSED_DIR = "data/processed"
+
+# Parsed outputs persisted between the parse and load stages
+CHECKPOINT_FILES = ("players", "damage_dealt", "elims")
+
+
+def get_match_statuses(event_window_id: str, session) -> dict[str, dict]:
+    """
+    Returns the stage checkpoints (fetched, parsed, processed) of every match
+    already recorded for an event window, keyed by match_id, using a single
+    query.
+    """
+    stmt = (
+        select(Match.match_id, Match.fetched, Match.parsed, Match.processed)
+        .where(Match.event_window_id == event_window_id)
+    )
+    return {
+        row.match_id: {
+            "fetched": row.fetched,
+            "parsed": row.parsed,
+            "processed": row.processed,
+        }
+        for row in session.execute(stmt)
+    }
+
+
+def _mark_match(session, match_id: str, **values):
+    """Updates the status columns of a match and commits immediately."""
+    session.execute(update(Match).where(Match.match_id == match_id).values(**values))
+    session.commit()
+
+
+def _update_processed_matches(session, event_window_id: str):
+    """Recounts processed matches for an event window in a single statement."""
+    processed_count = (
+        select(func.count())
+        .select_from(Match)
+        .where(Match.event_window_id == event_window_id, Match.processed.is_(True))
+        .scalar_subquery()
+    )
+    session.execute(
+        update(EventWindow)
+        .where(EventWindow.event_window_id == event_window_id)
+        .values(processed_matches=processed_count)
+    )
+    session.commit()
+
+
+def _save_checkpoint(match_id: str, parsed: dict[str, list[dict]]):
+    """Persists the parsed outputs of a match so loading can resume without reparsing."""
+    match_dir = Path(PROCESSED_DIR) / f"match_{match_id}"
+    match_dir.mkdir(parents=True, exist_ok=True)
+    for name in CHECKPOINT_FILES:
+        path = match_dir / f"{name}.json"
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(parsed[name], f)
+        os.replace(tmp_path, path)
+
+
+def _load_checkpoint(match_id: str) -> dict[str, list[dict]] | None:
+    """Returns the persisted parsed outputs of a match, or None if any are missing."""
+    match_dir = Path(PROCESSED_DIR) / f"match_{match_id}"
+    parsed = {}
+    for name in CHECKPOINT_FILES:
+        path = match_dir / f"{name}.json"
+        if not path.exists():
+            return None
+        parsed[name] = jsonio.load(path)
+    return parsed
+
+
+def process_match(
+    match_id: str,
+    event_window_id: str,
+    upsert: bool = True,
+    stages: dict | None = None
+):
+    """
+    Fetches any missing raw data for a match, parses it and loads it into the
+    database.
+
+    Each stage is checkpointed on the Match record as soon as it completes
+    (fetched, parsed, and processed once loaded), and `stages` (as returned by
+    get_match_statuses()) lets a resumed job skip the stages a previous run
+    already finished.
+
+    With `upsert`, every loader writes with INSERT ... ON CONFLICT on its
+    natural key, so reprocessing an already loaded match is idempotent.
+    The match's summary tables are then recomputed from its parsed events.
+    """
+    with record("match", match_id=match_id, event_window_id=event_window_id) as metrics:
+        success = _process_match(match_id, event_window_id, upsert, stages)
+        metrics.labels["success"] = success
+    return success
+
+
+def _process_match(
+    match_id: str,
+    event_window_id: str,
+    upsert: bool,
+    stages: dict | None
+) -> bool:
     session = get_session()
+    stages = stages or {}
 
     # First process the match itself
     try:
-        if skip_if_exists:
-            stmt = select(Match).where(Match.match_id == match_id)
-            existing = session.scalars(stmt).first()
-            if existing:
-                print(f"⏭️  Match {match_id} already processed, skipping...")
-                return True
-
         print(f"\n{'='*60}")
         print(f"Processing match: {match_id}")
         print(f"{'='*60}\n")
-        
-        print(f"Check that all event logs are fetched for match {match_id}...")
-        status = fetch_match_missing(match_id)
-        
-        # Raw data is guaranteed to be fetched by this point
-        match_data = parse_match_metadata(match_id)
-
-        # Needs to be added to the database entry
-        if event_window_id:
-            match_data["event_window_id"] = event_window_id
-
-        players = parse_match_players(match_id)
-        elims = parse_elims(match_id)
-        damage_dealt = parse_damage_dealt(match_id)
 
-        # Load into database (all in one transaction)
+        if not stages.get("fetched"):
+            print(f"Check that all event logs are fetched for match {match_id}...")
+            with span("fetch_match"):
+                status = fetch_match_missing(match_id)
+
+            # Raw data is guaranteed to be fetched by this point
+            match_data = parse_match_metadata(match_id)
+
+            # Needs to be added to the database entry
+            if event_window_id:
+                match_data["event_window_id"] = event_window_id
+
+            # The Match record carries the checkpoints of the later stages
+            loader.load_match_metadata(match_data, session, upsert=upsert)
+
+            _mark_match(
+                session, match_id,
+                fetched=True,
+                processing=True,
+                last_processing_start=datetime.now(timezone.utc),
+            )
+        else:
+            print(f"⏭️  Raw data already fetched for match {match_id}")
+
+        # Grow the cross-match weapon catalog with this match's weapons, also
+        # for matches fetched before the catalog existed
+        new_weapons = get_weapon_catalog(session).add_match(
+            match_id, event_window_id or parse_match_metadata(match_id)["event_window_id"], session
+        )
+        session.commit()
+        if new_weapons:
+            print(f"🔫 Added {new_weapons} new weapon(s) to the catalog")
+
+        parsed = None
+        if stages.get("parsed"):
+            with span("read_checkpoint"):
+                parsed = _load_checkpoint(match_id)
+        if parsed is None:
+            parsed = {}
+            for name, parse in (
+                ("players", parse_match_players),
+                ("elims", parse_elims),
+                ("damage_dealt", parse_damage_dealt),
+            ):
+                with span(f"parse:{name}") as s:
+                    parsed[name] = parse(match_id)
+                    s.rows_out = len(parsed[name])
+            with span("write_checkpoint"):
+                _save_checkpoint(match_id, parsed)
+            _mark_match(session, match_id, parsed=True)
+        else:
+            print(f"⏭️  Resuming match {match_id} from parsed checkpoint")
+
+        # Load into database
         print("\n💾 Loading into database...")
-        loader.load_match_metadata(match_data, session)
-        loader.load_match_players(players, match_id, session)
-        loader.load_damage_dealt_events(damage_dealt, match_id, session)
-        loader.load_elimination_events(elims, match_id, session)
+        catalog = get_weapon_catalog(session)
+        catalog.annotate(parsed["damage_dealt"])
+        catalog.annotate(parsed["elims"])
+
+        for name, load in (
+            ("players", loader.load_match_players),
+            ("damage_dealt", loader.load_damage_dealt_events),
+            ("elims", loader.load_elimination_events),
+        ):
+            with span(f"load:{name}", rows_in=len(parsed[name])) as s:
+                s.rows_out = load(parsed[name], match_id, session, upsert=upsert)
+
+        # Refresh the per-match and per-player summary tables
+        with span("rollup") as s:
+            rollups = compute_match_rollups(
+                match_id, parsed["players"], parsed["damage_dealt"], parsed["elims"]
+            )
+            s.rows_out = loader.load_match_rollups(rollups, match_id, session)
+
+        # Commits the loaded rows and the checkpoint in one transaction
+        with span("commit"):
+            _mark_match(
+                session, match_id,
+                processed=True,
+                processing=False,
+                failed=False,
+                last_processed=datetime.now(timezone.utc),
+            )
+        if event_window_id:
+            _update_processed_matches(session, event_window_id)
         
         print(f"\n✅ Successfully processed match {match_id}\n")
         return True
@@ -77,16 +244,39 @@ def process_match(match_id: str, event_window_id: str, skip_if_exists: bool = Fa
         import traceback
         traceback.print_exc()
         session.rollback()
+        try:
+            _mark_match(
+                session, match_id,
+                processing=False,
+                failed=True,
+                last_failed=datetime.now(timezone.utc),
+            )
+        except Exception:
+            session.rollback()
         return False
 
     finally:
         session.close()
 
 
-def process_event_window(event_window_id: str):
+def process_event_window(event_window_id: str, refresh_matches: bool = False):
     """
     Process an entire event window
+
+    With `refresh_matches`, the window's match list is refetched even if it
+    was fetched before, so matches that finished since then are picked up
+    (used for live event windows).
     """
+    with record("event_window", event_window_id=event_window_id) as metrics:
+        results = _process_event_window(event_window_id, refresh_matches)
+        metrics.labels["status"] = results.get("status", "done")
+        metrics.count("matches_successful", results.get("successful", 0))
+        metrics.count("matches_failed", results.get("failed", 0))
+    metrics.print_summary()
+    return results
+
+
+def _process_event_window(event_window_id: str, refresh_matches: bool) -> dict:
     session = get_session()
 
     try:
@@ -134,20 +324,41 @@ def process_event_window(event_window_id: str):
     try:
         # First, check if the matches for the current EventWindow have been fetched
         # from Osirion's API
-        if not event_window_fetched(event_window_id).get("matches"):
+        if refresh_matches or not event_window_fetched(event_window_id).get("matches"):
             # If not, fetch them
             print(f"Need to fetch matches for event_window {event_window_id}")
             matches_path = osr.fetch_by_event_window(event_window_id)
 
         matches = parse_event_matches(event_window_id)
 
-        results = {"total": len(matches), "successful": 0, "failed": 0}
+        # Drop matches that are already processed before scheduling any work,
+        # using one query for the whole window instead of one per match
+        session = get_session()
+        try:
+            statuses = get_match_statuses(event_window_id, session)
+        finally:
+            session.close()
 
-        # For each match parse
-        for i, match in enumerate(matches):
+        pending = [
+            match for match in matches
+            if not statuses.get(match["info"]["matchId"], {}).get("processed")
+        ]
+        skipped = len(matches) - len(pending)
+        if skipped:
+            print(f"⏭️  Skipping {skipped} already processed match(es)")
+
+        results = {
+            "total": len(matches),
+            "successful": skipped,
+            "failed": 0,
+            "skipped": skipped
+        }
+
+        # For each match parse, resuming from its last completed stage
+        for i, match in enumerate(pending):
             match_id = match["info"]["matchId"]
 
-            success = process_match(match_id, event_window_id, skip_if_exists=True)
+            success = process_match(match_id, event_window_id, stages=statuses.get(match_id))
             if success:
                 results["successful"] += 1
             else:
@@ -220,6 +431,7 @@ def process_event_window(event_window_id: str):
 
 
 if __name__ == "__main__":
+    configure_logging()
     reinit_db() # Warning: will reinitialize entire DB
     event_window_id = "S33_FNCSMajor1_Final_Day1_EU"
     process_event_window(event_window_id)
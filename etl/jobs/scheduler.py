@@ -0,0 +1,147 @@
+# python -m etl.jobs.scheduler scheduler --interval 300
+# python -m etl.jobs.scheduler worker
+import argparse
+import time
+from datetime import datetime
+
+from etl.jobs.discover_tournaments import fetch_unparsed_tournaments
+from etl.jobs.discovery_store import DiscoveryStore
+from etl.jobs.work_queue import WorkQueue, PRIORITY_LIVE, PRIORITY_BACKFILL
+from etl.log import configure_logging
+
+# Keep re-processing an event window for a while after it ends, since the
+# last matches finish (and are published) after the window closes
+LIVE_GRACE_SECONDS = 3600
+
+# A running item older than this is assumed to belong to a dead worker
+STALE_RUNNING_SECONDS = 6 * 3600
+
+
+def window_end_time(tournament: dict) -> float | None:
+    """
+    Returns the end of a tournament's event window as unix seconds, or None
+    if the listing does not say. Accepts ISO 8601 strings and numeric
+    timestamps in seconds, milliseconds or microseconds.
+    """
+    for key in ("endTime", "endTimestamp", "end"):
+        value = tournament.get(key)
+        if value is None:
+            continue
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                continue
+        value = float(value)
+        if value > 1e14:
+            return value / 1e6
+        if value > 1e11:
+            return value / 1e3
+        return value
+    return None
+
+
+def schedule_once(store: DiscoveryStore, queue: WorkQueue) -> int:
+    """
+    Runs a single discovery poll, enqueues new or updated event windows and
+    requeues live ones. Returns the number of event windows enqueued.
+    """
+    now = time.time()
+    tournaments = fetch_unparsed_tournaments(store)
+
+    for t in tournaments:
+        ends_at = window_end_time(t)
+        live = ends_at is not None and ends_at + LIVE_GRACE_SECONDS > now
+        queue.enqueue(
+            t["eventWindowId"],
+            priority=PRIORITY_LIVE if live else PRIORITY_BACKFILL,
+            ends_at=ends_at
+        )
+
+    requeued = queue.requeue_live(now, grace_seconds=LIVE_GRACE_SECONDS)
+    stale = queue.requeue_stale(STALE_RUNNING_SECONDS)
+
+    print(
+        f"[{datetime.now():%H:%M:%S}] Enqueued {len(tournaments)} event window(s), "
+        f"requeued {requeued} live and {stale} stale. Queue: {queue.counts()}"
+    )
+    return len(tournaments)
+
+
+def run_scheduler(poll_interval: float = 300, once: bool = False):
+    """
+    Polls for new or updated event windows every `poll_interval` seconds and
+    pushes them into the work queue.
+    """
+    store = DiscoveryStore()
+    queue = WorkQueue()
+    try:
+        while True:
+            try:
+                schedule_once(store, queue)
+            except Exception as e:
+                print(f"❌ Discovery poll failed: {e}")
+            if once:
+                return
+            time.sleep(poll_interval)
+    finally:
+        store.close()
+        queue.close()
+
+
+def run_worker(poll_interval: float = 30, once: bool = False):
+    """
+    Consumes the work queue, processing one event window at a time in
+    priority order (live event windows before backfill).
+    """
+    # Imported here so the scheduler does not need database access
+    from etl.jobs.process_tournaments import process_event_window
+
+    queue = WorkQueue()
+    try:
+        while True:
+            item = queue.claim()
+            if item is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            event_window_id = item["event_window_id"]
+            live = item["priority"] == PRIORITY_LIVE
+            print(f"▶️  Claimed {event_window_id} ({'live' if live else 'backfill'}, attempt {item['attempts'] + 1})")
+
+            try:
+                results = process_event_window(event_window_id, refresh_matches=live)
+            except Exception as e:
+                results = {"status": "error", "error": str(e)}
+
+            if results.get("status") == "error":
+                queue.fail(event_window_id, results.get("error", "unknown error"))
+            elif results["failed"] > results["total"] / 2:
+                queue.fail(event_window_id, f"{results['failed']}/{results['total']} matches failed")
+            else:
+                queue.complete(event_window_id)
+    finally:
+        queue.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Discover event windows and process them from a durable work queue."
+    )
+    parser.add_argument("role", choices=["scheduler", "worker"])
+    parser.add_argument("--interval", type=float, default=None,
+                        help="Seconds between polls (default: 300 for scheduler, 30 for worker)")
+    parser.add_argument("--once", action="store_true")
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.role == "scheduler":
+        run_scheduler(poll_interval=args.interval or 300, once=args.once)
+    else:
+        run_worker(poll_interval=args.interval or 30, once=args.once)
+
+
+if __name__ == "__main__":
+    main()
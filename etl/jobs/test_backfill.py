@@ -0,0 +1,63 @@
+import pytest
+
+from etl.db.models import DamageDealtEvent, EliminationEvent, get_engine
+from etl.jobs import process_tournaments
+from etl.jobs.backfill import _existing_index_names, build_indexes, deferrable_indexes, drop_indexes, run_backfill
+
+
+@pytest.fixture
+def engine(db_url):
+    return get_engine(db_url)
+
+
+def test_only_non_unique_event_indexes_are_deferred():
+    indexes = deferrable_indexes()
+    assert indexes
+    assert {index.table.name for index in indexes} == {
+        DamageDealtEvent.__tablename__, EliminationEvent.__tablename__,
+    }
+    assert not any(index.unique for index in indexes)
+
+
+def test_drop_and_rebuild(engine):
+    indexes = deferrable_indexes()
+    names = {index.name for index in indexes}
+    assert names <= _existing_index_names(engine, indexes)
+
+    assert len(drop_indexes(engine, indexes)) == len(indexes)
+    assert not names & _existing_index_names(engine, indexes)
+    # dropping again is a no-op
+    assert drop_indexes(engine, indexes) == []
+
+    assert build_indexes(engine, indexes) == len(indexes)
+    assert names <= _existing_index_names(engine, indexes)
+    assert build_indexes(engine, indexes) == 0
+
+
+def test_backfill_runs_without_the_indexes(engine, monkeypatch):
+    indexes = deferrable_indexes()
+    names = {index.name for index in indexes}
+    seen = []
+
+    def process_event_window(event_window_id):
+        seen.append(names & _existing_index_names(engine, indexes))
+        return {"total": 2, "failed": 2 if event_window_id == "bad" else 0}
+
+    monkeypatch.setattr(process_tournaments, "process_event_window", process_event_window)
+    results = run_backfill(["good", "bad"], engine=engine)
+
+    assert results == {"processed": 1, "failed": 1}
+    assert seen == [set(), set()]
+    assert names <= _existing_index_names(engine, indexes)
+
+
+def test_indexes_are_rebuilt_when_the_backfill_fails(engine, monkeypatch):
+    def process_event_window(event_window_id):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(process_tournaments, "process_event_window", process_event_window)
+    with pytest.raises(RuntimeError):
+        run_backfill(["a"], engine=engine)
+
+    indexes = deferrable_indexes()
+    assert {index.name for index in indexes} <= _existing_index_names(engine, indexes)
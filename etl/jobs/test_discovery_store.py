@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from etl.jobs.discovery_store import LEGACY_SEEN_FILE, QUERY_CHUNK_SIZE, DiscoveryStore
+
+
+@pytest.fixture
+def store(workdir):
+    store = DiscoveryStore("data/events/discovery.db")
+    yield store
+    store.close()
+
+
+def _tournament(event_window_id: str, **fields) -> dict:
+    return {"eventWindowId": event_window_id, "eventId": "E", "displayData": {"title": "Cup"}, **fields}
+
+
+def test_add_and_filter_unseen(store):
+    store.add([_tournament("a"), _tournament("b")])
+    assert store.is_seen("a")
+    assert store.filter_unseen(["a", "b", "c"]) == ["c"]
+
+
+def test_filter_unseen_queries_in_chunks(store):
+    ids = [f"w{i}" for i in range(2 * QUERY_CHUNK_SIZE + 1)]
+    store.add([_tournament(eid) for eid in ids[::2]])
+    queries = []
+    store.conn.set_trace_callback(queries.append)
+
+    # in input order, with one query per chunk
+    assert store.filter_unseen(ids[::-1]) == ids[1::2][::-1]
+    assert len(queries) == 3
+
+
+def test_changed_reports_new_listings_once(store):
+    store.add([_tournament("a", endTime=1)])
+    assert store.changed([_tournament("a", endTime=1)]) == []
+
+    updated = _tournament("a", endTime=2)
+    assert store.changed([updated]) == [updated]
+    assert store.changed([updated]) == []
+
+
+def test_watermarks(store):
+    assert store.get_watermark() is None
+    store.set_watermark(10.0)
+    store.set_watermark(20.0)
+    store.set_watermark(5.0, name="other")
+    assert store.get_watermark() == 20.0
+    assert store.get_watermark("other") == 5.0
+
+
+def test_state_persists_across_connections(workdir):
+    store = DiscoveryStore("data/events/discovery.db")
+    store.add([_tournament("a")])
+    store.close()
+
+    reopened = DiscoveryStore("data/events/discovery.db")
+    assert reopened.is_seen("a")
+    reopened.close()
+
+
+def test_imports_the_legacy_seen_file(workdir):
+    Path(LEGACY_SEEN_FILE).parent.mkdir(parents=True)
+    Path(LEGACY_SEEN_FILE).write_text(json.dumps(["a", "b"]))
+
+    store = DiscoveryStore("data/events/discovery.db")
+    assert store.filter_unseen(["a", "b", "c"]) == ["c"]
+    # legacy entries have no fingerprint, so they never count as changed
+    assert store.changed([_tournament("a")]) == []
+    store.close()
@@ -0,0 +1,59 @@
+from sqlalchemy import func, select
+
+from conftest import SYNTHETIC_EVENT_WINDOW_ID
+from etl.db.models import DamageDealtEvent, EliminationEvent, Match, MatchStats, PlayerMatchStats, Weapon
+from etl.jobs import process_tournaments
+from etl.jobs.process_tournaments import get_match_statuses, process_match
+
+
+def _count(session, model) -> int:
+    return session.scalar(select(func.count()).select_from(model))
+
+
+def test_process_match_end_to_end(synthetic_match, session):
+    assert process_match(synthetic_match, SYNTHETIC_EVENT_WINDOW_ID)
+
+    statuses = get_match_statuses(SYNTHETIC_EVENT_WINDOW_ID, session)
+    assert statuses[synthetic_match] == {"fetched": True, "parsed": True, "processed": True}
+    assert _count(session, Match) == 1
+    assert _count(session, MatchStats) == 1
+    assert _count(session, PlayerMatchStats) > 0
+    assert _count(session, DamageDealtEvent) > 0
+    assert _count(session, EliminationEvent) > 0
+    assert _count(session, Weapon) > 0
+    assert session.scalar(
+        select(func.count()).select_from(DamageDealtEvent).where(DamageDealtEvent.weapon_type.is_(None))
+    ) == 0
+
+
+def test_reprocessing_a_match_is_idempotent(synthetic_match, session):
+    assert process_match(synthetic_match, SYNTHETIC_EVENT_WINDOW_ID)
+    counts = {model: _count(session, model) for model in (DamageDealtEvent, EliminationEvent, PlayerMatchStats)}
+
+    assert process_match(synthetic_match, SYNTHETIC_EVENT_WINDOW_ID)
+    session.expire_all()
+    assert {model: _count(session, model) for model in counts} == counts
+
+
+def test_resumes_from_the_parsed_checkpoint(synthetic_match, session, monkeypatch):
+    assert process_match(synthetic_match, SYNTHETIC_EVENT_WINDOW_ID)
+    stages = get_match_statuses(SYNTHETIC_EVENT_WINDOW_ID, session)[synthetic_match]
+
+    def fail(match_id):
+        raise AssertionError("a checkpointed match must not be reparsed")
+
+    monkeypatch.setattr(process_tournaments, "parse_damage_dealt", fail)
+    assert process_match(synthetic_match, SYNTHETIC_EVENT_WINDOW_ID, stages=stages)
+
+
+def test_a_failed_load_leaves_no_partial_rows(synthetic_match, session, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(process_tournaments.loader, "load_match_rollups", fail)
+    assert not process_match(synthetic_match, SYNTHETIC_EVENT_WINDOW_ID)
+
+    assert _count(session, DamageDealtEvent) == 0
+    assert _count(session, EliminationEvent) == 0
+    assert get_match_statuses(SYNTHETIC_EVENT_WINDOW_ID, session)[synthetic_match]["processed"] is False
+    assert session.scalar(select(Match.failed))
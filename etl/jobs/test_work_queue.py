@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+from etl.jobs.work_queue import PRIORITY_BACKFILL, PRIORITY_LIVE, WorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WorkQueue(str(tmp_path / "work_queue.db"))
+    yield queue
+    queue.close()
+
+
+def test_claims_by_priority_then_age(queue):
+    queue.enqueue("old_backfill", PRIORITY_BACKFILL)
+    queue.enqueue("new_backfill", PRIORITY_BACKFILL)
+    queue.enqueue("live", PRIORITY_LIVE)
+
+    claimed = [queue.claim()["event_window_id"] for _ in range(3)]
+    assert claimed == ["live", "old_backfill", "new_backfill"]
+    assert queue.claim() is None
+    assert queue.counts() == {"running": 3}
+
+
+def test_enqueue_only_raises_the_priority_of_pending_items(queue):
+    queue.enqueue("a", PRIORITY_LIVE)
+    queue.enqueue("a", PRIORITY_BACKFILL)
+    assert queue.claim()["priority"] == PRIORITY_LIVE
+
+
+def test_enqueue_leaves_running_items_running(queue):
+    queue.enqueue("a")
+    queue.claim()
+    queue.enqueue("a")
+    assert queue.counts() == {"running": 1}
+    assert queue.claim() is None
+
+
+def test_finished_items_can_be_enqueued_again(queue):
+    queue.enqueue("a")
+    queue.claim()
+    queue.complete("a")
+    queue.enqueue("a")
+
+    item = queue.claim()
+    assert item["event_window_id"] == "a"
+    assert item["attempts"] == 1
+
+
+def test_requeue_stale(queue):
+    queue.enqueue("a")
+    queue.claim()
+    assert queue.requeue_stale(max_running_seconds=3600) == 0
+    assert queue.requeue_stale(max_running_seconds=-1) == 1
+    assert queue.claim()["event_window_id"] == "a"
+
+
+def test_requeue_live(queue):
+    queue.enqueue("ended", ends_at=100.0)
+    queue.enqueue("live", ends_at=10_000.0)
+    queue.enqueue("no_end")
+    while (item := queue.claim()) is not None:
+        queue.complete(item["event_window_id"])
+    queue.conn.execute("UPDATE work_items SET finished_at = 1000.0")
+
+    assert queue.requeue_live(now=1000.0) == 1
+    item = queue.claim()
+    assert (item["event_window_id"], item["priority"]) == ("live", PRIORITY_LIVE)
+
+
+def test_failed_items_keep_their_error(queue, tmp_path):
+    queue.enqueue("a")
+    queue.claim()
+    queue.fail("a", "boom")
+    assert queue.counts() == {"failed": 1}
+
+    conn = sqlite3.connect(tmp_path / "work_queue.db")
+    assert conn.execute("SELECT last_error FROM work_items").fetchone() == ("boom",)
+    conn.close()
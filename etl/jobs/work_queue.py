@@ -0,0 +1,150 @@
+import sqlite3
+import time
+from pathlib import Path
+
+
+WORK_QUEUE_DB = "data/events/work_queue.db"
+
+# Lower values are claimed first
+PRIORITY_LIVE = 0
+PRIORITY_BACKFILL = 10
+
+
+class WorkQueue:
+    """
+    Durable, multi-process queue of event windows to process, stored in
+    SQLite. Each event window has at most one work item; re-enqueuing a
+    finished window makes it pending again, and re-enqueuing a pending one
+    can only raise its priority.
+
+    Item status moves pending -> running -> done/failed. Items left running
+    by a crashed worker are returned to pending by requeue_stale().
+    """
+
+    def __init__(self, path: str = WORK_QUEUE_DB):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode, so claim() can take the write lock explicitly
+        self.conn = sqlite3.connect(path, isolation_level=None, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS work_items (
+                event_window_id TEXT PRIMARY KEY,
+                priority INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                ends_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                enqueued_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_work_items_claim
+                ON work_items (status, priority, enqueued_at);
+        """)
+
+    def enqueue(self, event_window_id: str, priority: int = PRIORITY_BACKFILL, ends_at: float | None = None):
+        """
+        Adds an event window to the queue, or makes a finished one pending
+        again. `ends_at` is the end of the event window (unix seconds), used
+        to keep re-processing it while it is live.
+        """
+        self.conn.execute(
+            """
+            INSERT INTO work_items (event_window_id, priority, ends_at, enqueued_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(event_window_id) DO UPDATE SET
+                priority = CASE WHEN status = 'pending'
+                    THEN min(priority, excluded.priority) ELSE excluded.priority END,
+                ends_at = coalesce(excluded.ends_at, ends_at),
+                enqueued_at = CASE WHEN status = 'pending'
+                    THEN enqueued_at ELSE excluded.enqueued_at END,
+                status = CASE WHEN status = 'running' THEN status ELSE 'pending' END
+            """,
+            (event_window_id, priority, ends_at, time.time())
+        )
+
+    def claim(self) -> dict | None:
+        """
+        Atomically takes the highest-priority pending item and marks it
+        running. Returns None if the queue is empty.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                """
+                SELECT event_window_id, priority, ends_at, attempts FROM work_items
+                WHERE status = 'pending'
+                ORDER BY priority, enqueued_at
+                LIMIT 1
+                """
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                """
+                UPDATE work_items
+                SET status = 'running', started_at = ?, attempts = attempts + 1
+                WHERE event_window_id = ?
+                """,
+                (time.time(), row["event_window_id"])
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return dict(row)
+
+    def complete(self, event_window_id: str):
+        self.conn.execute(
+            "UPDATE work_items SET status = 'done', finished_at = ?, last_error = NULL "
+            "WHERE event_window_id = ?",
+            (time.time(), event_window_id)
+        )
+
+    def fail(self, event_window_id: str, error: str):
+        self.conn.execute(
+            "UPDATE work_items SET status = 'failed', finished_at = ?, last_error = ? "
+            "WHERE event_window_id = ?",
+            (time.time(), error, event_window_id)
+        )
+
+    def requeue_live(self, now: float, grace_seconds: float = 0) -> int:
+        """
+        Makes finished items pending again if their last run finished before
+        the event window ended (plus `grace_seconds`), so matches that finish
+        later in a live window are picked up. Returns the number of items
+        requeued.
+        """
+        cursor = self.conn.execute(
+            """
+            UPDATE work_items
+            SET status = 'pending', priority = ?, enqueued_at = ?
+            WHERE status IN ('done', 'failed')
+              AND ends_at IS NOT NULL AND ends_at + ? > coalesce(finished_at, 0)
+            """,
+            (PRIORITY_LIVE, now, grace_seconds)
+        )
+        return cursor.rowcount
+
+    def requeue_stale(self, max_running_seconds: float) -> int:
+        """
+        Returns items that have been running for longer than
+        `max_running_seconds` (e.g. because their worker died) to pending.
+        """
+        cursor = self.conn.execute(
+            "UPDATE work_items SET status = 'pending' "
+            "WHERE status = 'running' AND started_at < ?",
+            (time.time() - max_running_seconds,)
+        )
+        return cursor.rowcount
+
+    def counts(self) -> dict[str, int]:
+        rows = self.conn.execute(
+            "SELECT status, count(*) FROM work_items GROUP BY status"
+        ).fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,133 @@
+"""
+JSON decoding of the raw logs, with a pluggable backend.
+
+The fastest installed backend is used: orjson, then pysimdjson, then the
+standard library. Set ETL_JSON_BACKEND=orjson|simdjson|json to force one.
+
+load() returns the usual dicts and lists. For the large logs (movement,
+shots, health, shield), load_columns() returns only the needed fields as
+typed NumPy arrays, which the parsers work on directly. With orjson or the
+standard library the log is still decoded into dicts first, and the fields
+are copied out event by event; only pysimdjson reads events lazily from the
+parsed document, without building a dict per event.
+
+Both readers can drop the events of excluded players (bots, spectators)
+as they are loaded, so downstream loops never see them.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+BACKENDS = ("orjson", "simdjson", "json")
+
+
+def _available(name: str) -> bool:
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def _select_backend() -> str:
+    requested = os.getenv("ETL_JSON_BACKEND")
+    if requested:
+        if requested not in BACKENDS:
+            raise ValueError(f"Unknown ETL_JSON_BACKEND '{requested}', expected one of {BACKENDS}")
+        if not _available(requested):
+            raise ImportError(f"ETL_JSON_BACKEND={requested} is not installed")
+        return requested
+    return next(name for name in BACKENDS if _available(name))
+
+
+BACKEND = _select_backend()
+
+
+def loads(data: bytes | str) -> Any:
+    """Decodes a JSON document into dicts and lists."""
+    if BACKEND == "orjson":
+        import orjson
+        return orjson.loads(data)
+    if BACKEND == "simdjson":
+        import simdjson
+        return simdjson.Parser().parse(data if isinstance(data, bytes) else data.encode(), recursive=True)
+    return json.loads(data)
+
+
+def load(path: str | Path) -> Any:
+    """Reads and decodes a JSON file."""
+    return loads(Path(path).read_bytes())
+
+
+def filter_events(events: list[dict], exclude_players: set[str] | None, key: str = "epicId") -> list[dict]:
+    """Drops the events whose `key` player is in `exclude_players`."""
+    if not exclude_players:
+        return events
+    return [e for e in events if e.get(key) not in exclude_players]
+
+
+def _events(doc):
+    """The event list of a log, unwrapping the legacy {"events": [...]} shape."""
+    try:
+        return doc["events"]
+    except (KeyError, TypeError, IndexError):
+        return doc
+
+
+def load_columns(
+    path: str | Path,
+    fields: dict[str, tuple[tuple[str, ...], Any, Any]],
+    exclude_players: set[str] | None = None,
+    player_field: str = "epicId"
+) -> dict[str, np.ndarray]:
+    """
+    Reads an event log into typed columns.
+
+    The log is decoded with the selected backend and the fields are then
+    copied out of each event, so with orjson or json the event dicts are
+    built as with load(). The gain is in the callers, which work on arrays
+    instead of looping over dicts.
+
+    Args:
+        path: Path of a JSON array of events (or of {"events": [...]})
+        fields: Column name -> (key path in the event, dtype, default for
+            events missing the key), e.g.
+            {"x": (("movementData", "location", "x"), np.float64, np.nan)}
+        exclude_players: Players whose events are dropped, e.g. bots
+        player_field: Column holding the player id of each event
+
+    Returns:
+        dict: Column name -> array, one element per event
+    """
+    data = Path(path).read_bytes()
+    if BACKEND == "simdjson":
+        import simdjson
+        # the parser must outlive the lazy proxies read from it
+        parser = simdjson.Parser()
+        events = _events(parser.parse(data))
+    else:
+        events = _events(loads(data))
+
+    values = {name: [] for name in fields}
+    for e in events:
+        for name, (keys, _, default) in fields.items():
+            value = e
+            try:
+                for key in keys:
+                    value = value[key]
+            except (KeyError, TypeError):
+                value = default
+            values[name].append(default if value is None else value)
+
+    columns = {
+        name: np.array(values[name], dtype=dtype)
+        for name, (_, dtype, _) in fields.items()
+    }
+    if exclude_players:
+        keep = ~np.isin(columns[player_field], list(exclude_players))
+        columns = {name: column[keep] for name, column in columns.items()}
+    return columns
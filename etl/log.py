@@ -0,0 +1,54 @@
+"""
+Logging setup for the ETL entry points.
+
+Modules log through `logging.getLogger(__name__)`. Per-item diagnostics in
+hot loops (one line per shot, candidate or player) are logged at DEBUG and
+guarded with `logger.isEnabledFor(logging.DEBUG)`, so they cost nothing
+unless enabled for that module; the loops log one summary at INFO instead.
+
+Levels come from the environment unless passed explicitly:
+
+    ETL_LOG_LEVEL=INFO
+    ETL_LOG_LEVELS=etl.parsing.shot_attempts_vectorized=DEBUG,etl.db=WARNING
+"""
+import logging
+import os
+
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def _parse_levels(spec: str) -> dict[str, str]:
+    """Parses "module=LEVEL,module=LEVEL" into a dict."""
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip()
+    return levels
+
+
+def configure_logging(
+    level: str | int | None = None,
+    module_levels: dict[str, str | int] | None = None
+):
+    """
+    Configures the root logger and any per-module levels. Meant to be called
+    once, from an entry point.
+
+    Args:
+        level: Root level; defaults to $ETL_LOG_LEVEL, then INFO
+        module_levels: Logger name -> level, applied after $ETL_LOG_LEVELS
+    """
+    level = level or os.getenv("ETL_LOG_LEVEL", "INFO")
+    logging.basicConfig(
+        level=level.upper() if isinstance(level, str) else level,
+        format=LOG_FORMAT,
+    )
+
+    levels = _parse_levels(os.getenv("ETL_LOG_LEVELS", ""))
+    levels.update(module_levels or {})
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(
+            module_level.upper() if isinstance(module_level, str) else module_level
+        )
@@ -0,0 +1,138 @@
+from collections import defaultdict, deque
+
+
+# Health/shield drops are attributed to a hit on the same player at most this
+# far apart in time (microseconds)
+ATTRIBUTION_WINDOW_US = 500_000
+
+# Damage dealt this long before an elimination earns an assist (seconds)
+ASSIST_WINDOW_S = 10.0
+
+MAX_HEALTH = 100.0
+
+
+class _PlayerState:
+    __slots__ = ("hp", "shield", "hits", "unattributed", "damage_taken")
+
+    def __init__(self):
+        self.hp = MAX_HEALTH
+        self.shield = 0.0
+        # recent hits on the player: (timestamp, actor_id)
+        self.hits: deque[tuple[int, str]] = deque()
+        # drops no hit was found for yet: (timestamp, amount)
+        self.unattributed: deque[tuple[int, float]] = deque()
+        # attributed damage: (timestamp, actor_id, amount)
+        self.damage_taken: deque[tuple[int, str, float]] = deque()
+
+
+class AttributionEngine:
+    """
+    Streaming damage and assist attribution over the merged, time-ordered
+    shot, health, shield and elimination events of a match.
+
+    Tracks every player's HP and shield, attributes each health or shield
+    drop to the most recent hit on that player within `attribution_window_us`
+    (hits logged slightly after the drop are matched too), and on each
+    elimination credits an assist to every other player who dealt damage to
+    the eliminated player in the preceding `assist_window_s`. Drops with no
+    matching hit (storm, fall damage) are counted as environmental damage;
+    call finish() after the last event to count those still pending.
+
+    Each event is processed once, in O(1) amortized time, so a whole event
+    window can be streamed through a single engine per match.
+    """
+
+    def __init__(
+        self,
+        attribution_window_us: int = ATTRIBUTION_WINDOW_US,
+        assist_window_s: float = ASSIST_WINDOW_S
+    ):
+        self.attribution_window_us = attribution_window_us
+        self.assist_window_us = int(assist_window_s * 1e6)
+        self.players: defaultdict[str, _PlayerState] = defaultdict(_PlayerState)
+        self.damage_dealt: defaultdict[str, float] = defaultdict(float)
+        self.environmental_damage = 0.0
+        self.assists: list[dict] = []
+
+    def _expire(self, state: _PlayerState, ts: int):
+        while state.hits and state.hits[0][0] < ts - self.attribution_window_us:
+            state.hits.popleft()
+        while state.unattributed and state.unattributed[0][0] < ts - self.attribution_window_us:
+            _, amount = state.unattributed.popleft()
+            self.environmental_damage += amount
+        while state.damage_taken and state.damage_taken[0][0] < ts - self.assist_window_us:
+            state.damage_taken.popleft()
+
+    def _credit(self, state: _PlayerState, ts: int, actor_id: str, amount: float):
+        state.damage_taken.append((ts, actor_id, amount))
+        self.damage_dealt[actor_id] += amount
+
+    def hit(self, ts: int, actor_id: str, recipient_id: str):
+        """A shot by `actor_id` hit `recipient_id`."""
+        state = self.players[recipient_id]
+        self._expire(state, ts)
+        state.hits.append((ts, actor_id))
+        # drops logged just before the shot that caused them
+        while state.unattributed:
+            drop_ts, amount = state.unattributed.popleft()
+            self._credit(state, drop_ts, actor_id, amount)
+
+    def _drop(self, player_id: str, ts: int, amount: float):
+        state = self.players[player_id]
+        self._expire(state, ts)
+        if state.hits:
+            self._credit(state, ts, state.hits[-1][1], amount)
+        else:
+            state.unattributed.append((ts, amount))
+
+    def health_update(self, ts: int, player_id: str, value: float):
+        state = self.players[player_id]
+        drop = state.hp - value
+        state.hp = value
+        if drop > 0:
+            self._drop(player_id, ts, drop)
+
+    def shield_update(self, ts: int, player_id: str, value: float):
+        state = self.players[player_id]
+        drop = state.shield - value
+        state.shield = value
+        if drop > 0:
+            self._drop(player_id, ts, drop)
+
+    def elimination(self, ts: int, eliminator_id: str, target_id: str):
+        """
+        Credits assists for the elimination of `target_id`, then resets the
+        target's state (it can only come back through a reboot).
+        """
+        state = self.players[target_id]
+        self._expire(state, ts)
+
+        damage_by = defaultdict(float)
+        last_damage = {}
+        for damage_ts, actor_id, amount in state.damage_taken:
+            damage_by[actor_id] += amount
+            last_damage[actor_id] = damage_ts
+
+        for actor_id, damage in damage_by.items():
+            if actor_id in (eliminator_id, target_id):
+                continue
+            self.assists.append({
+                "timestamp": ts,
+                "actor_id": actor_id,
+                "eliminator_id": eliminator_id,
+                "recipient_id": target_id,
+                "damage": damage,
+                "last_damage_timestamp": last_damage[actor_id],
+            })
+
+        self.environmental_damage += sum(amount for _, amount in state.unattributed)
+        self.players[target_id] = _PlayerState()
+
+    def finish(self):
+        """
+        Ends the match: drops still waiting for a hit (e.g. storm damage
+        taken by the survivors) are counted as environmental damage.
+        """
+        for state in self.players.values():
+            self.environmental_damage += sum(amount for _, amount in state.unattributed)
+            state.unattributed.clear()
@@ -1,15 +1,20 @@
 import json
+import logging
 from glob import glob
 import math
 import pandas as pd
 from collections import defaultdict
 from bisect import bisect_left, bisect_right
 
-from pipeline.api import osirion_client as osr
 from geometry.vec3 import Vec3, normalize, dot
 from geometry.ray import Ray
 from geometry.sphere import Sphere
 
+from etl import jsonio
+from etl.log import configure_logging
+
+logger = logging.getLogger(__name__)
+
 time_diffs = []
 
 def get_closest(player_id: str, target_ts: int, player_movements) -> dict:
@@ -19,7 +24,7 @@ def get_closest(player_id: str, target_ts: int, player_movements) -> dict:
     """
     data = player_movements[player_id]
     if not data or not data["events"]:
-        print(f"No movement events found for player {player_id}.")
+        logger.debug("No movement events found for player %s", player_id)
         return {}
     
     timestamps = data["timestamps"]
@@ -48,10 +53,8 @@ def get_hit_events():
     event of the actor and recipient occuring closest to the time of the shot
     """
 
-    with open("data/match_movement_events.json", "r") as f:
-        movement_events = json.load(f)["events"]
-    with open("data/match_shot_events.json", "r") as f:
-        shot_events = json.load(f)["hitscanEvents"]
+    movement_events = jsonio.load("data/match_movement_events.json")["events"]
+    shot_events = jsonio.load("data/match_shot_events.json")["hitscanEvents"]
 
     # preprocessing
     # maps player -> list of movements
@@ -108,16 +111,14 @@ def get_hit_attempt_events(shot_events_path: str, movement_events_path: str):
     Returns a list of all shots events which are attempts to hit exposed players
     """
 
-    with open(movement_events_path, "r") as f:
-        movement_events = json.load(f)["events"]
-    with open(shot_events_path, "r") as f:
-        shot_events = json.load(f)["hitscanEvents"]
+    movement_events = jsonio.load(movement_events_path)["events"]
+    shot_events = jsonio.load(shot_events_path)["hitscanEvents"]
 
     hit_attempts = []
     # match_players = get_id_to_name_map("832ceecc424df110d58e3e96d3dff834")
     with open("data/processed/test_teammate_map.json", "r") as f:
         team_player_ids = json.load(f)
-        print(len(team_player_ids))
+    logger.info("Found %d players in match", len(team_player_ids))
 
     with open("data/processed/test_teammate_map.json", "w") as f:
         json.dump(team_player_ids, f, indent=2)
@@ -132,10 +133,11 @@ def get_hit_attempt_events(shot_events_path: str, movement_events_path: str):
         data["events"].sort(key=lambda e: e["timestamp"])
         data["timestamps"] = [e["timestamp"] for e in data["events"]]
 
-    i = 1
-    for se in shot_events:
-        print(f"Evaluating shot {i}:")
-        i += 1
+    debug = logger.isEnabledFor(logging.DEBUG)
+    outcomes = {"hit": 0, "exposed": 0, "behind_build": 0, "build": 0, "stray": 0}
+    for i, se in enumerate(shot_events, start=1):
+        if debug:
+            logger.debug("Evaluating shot %d", i)
         ts = se["timestamp"]
         actor_id = se["epicId"]
         # get the closest known position of the actor
@@ -151,7 +153,9 @@ def get_hit_attempt_events(shot_events_path: str, movement_events_path: str):
         if se["hitPlayer"]:
             # get the closest known position of the recipient
             recipient_id = se["hitEpicId"]
-            print(f"✅💥 Shot added as hit attempt (hit player {recipient_id})")
+            outcomes["hit"] += 1
+            if debug:
+                logger.debug("Shot %d added as hit attempt (hit player %s)", i, recipient_id)
             hit_attempts.append({
                 **se,
                 "intendedRecipient": recipient_id,
@@ -186,7 +190,8 @@ def get_hit_attempt_events(shot_events_path: str, movement_events_path: str):
                     })
             # find the closest candidate
             if len(target_candidates) > 0:
-                print(f"Comparing {len(target_candidates)} candidates")
+                if debug:
+                    logger.debug("Comparing %d candidates", len(target_candidates))
                 min_dist = math.inf
                 closest = target_candidates[0]
                 for candidate_info in target_candidates:
@@ -198,26 +203,42 @@ def get_hit_attempt_events(shot_events_path: str, movement_events_path: str):
                 # check if closest candidate appeared before the build (in event where bullet hit build)
                 if (not se["hitPlayerBuild"] or
                         ((closest["position"] - p_actor).length()) < (p_hit - p_actor).length()):
-                    if not se["hitPlayerBuild"]:
-                        print("✅ Shot added as hit attempt (exposed BB)")
-                    elif (closest["position"] - p_actor).length() < (p_hit - p_actor).length():
-                        print("✅ Shot added as hit attempt (hit build behind exposed BB)")
-                    print(f"\tOpponent id: {closest['cand_id']}")
-                    print(f"\tOpponent distance: {min_dist}")
-                    print(f"\tPassing distance: {closest_to_ray(closest['position'], Ray(p_actor, normalize(p_hit-p_actor)))}")
+                    outcome = "exposed" if not se["hitPlayerBuild"] else "behind_build"
+                    outcomes[outcome] += 1
+                    if debug:
+                        logger.debug(
+                            "Shot %d added as hit attempt (%s): opponent %s at %.0f, passing distance %.0f",
+                            i,
+                            "exposed BB" if outcome == "exposed" else "hit build behind exposed BB",
+                            closest["cand_id"],
+                            min_dist,
+                            closest_to_ray(closest["position"], Ray(p_actor, normalize(p_hit - p_actor))),
+                        )
                     hit_attempts.append({
                         **se,
                         "intendedRecipient": closest["cand_id"],
                         "targetMovement": closest["move_event"],
                     })
                 else:
-                    print("❌ Potential candidates rejected (build in front of closest candidate)")
+                    outcomes["build"] += 1
+                    if debug:
+                        logger.debug("Shot %d: candidates rejected (build in front of closest candidate)", i)
             else:
-                print("❌ No potential candidates (stray shot)")
+                outcomes["stray"] += 1
+                if debug:
+                    logger.debug("Shot %d: no potential candidates (stray shot)", i)
+
+    logger.info(
+        "Evaluated %d shots: %d hit attempts (%d hits, %d exposed, %d behind a build), "
+        "%d blocked by builds, %d stray",
+        len(shot_events), len(hit_attempts), outcomes["hit"], outcomes["exposed"],
+        outcomes["behind_build"], outcomes["build"], outcomes["stray"]
+    )
     return hit_attempts
 
 
 if __name__ == '__main__':
+    configure_logging()
     movement_events_path = "data/raw/match_movement_events.json"
     shot_events_path = "data/raw/match_shot_events.json"
     attempts = get_hit_attempt_events(shot_events_path, movement_events_path)
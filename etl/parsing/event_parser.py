@@ -1,18 +1,14 @@
-import json
 from datetime import datetime
 
+from etl import jsonio
 from etl.api.osirion_client import fetch_by_event_window
 
 
 def parse_event_window_metadata(event_window_id):
     event_window_path = f"data/raw/event_window_{event_window_id}"
     try:
-        with (
-            open(f"{event_window_path}/info.json", "r") as f1,
-            open(f"{event_window_path}/matches.json") as f2
-        ):
-            event_window_info = json.load(f1)
-            event_window_matches = json.load(f2)["matches"]
+        event_window_info = jsonio.load(f"{event_window_path}/info.json")
+        event_window_matches = jsonio.load(f"{event_window_path}/matches.json")["matches"]
     except FileNotFoundError:
         raise ValueError(f"Event window files not found.")
 
@@ -42,55 +38,80 @@ def parse_event_window_metadata(event_window_id):
 
 def parse_event_matches(event_window_id) -> list[dict]:
     event_window_matches_path = f"data/raw/event_window_{event_window_id}/matches.json"
-    with open(event_window_matches_path, "r") as f:
-        matches = json.load(f)["matches"]
+    matches = jsonio.load(event_window_matches_path)["matches"]
 
-        print(f"Found {len(matches)} matches to process\n")
+    print(f"Found {len(matches)} matches to process\n")
 
     return matches
 
 
+# Non-weapon types to filter out
+EXCLUDED_WEAPON_TYPES = {
+    "PICKAXE", 
+    "BUILDING", 
+    "LOOT", 
+    "SHIELD_HEAL", 
+    "EDIT_TOOL",
+    "MOVEMENT", 
+    "HEALTH_HEAL", 
+    "BOTH_HEAL"
+}
+
+# Rarity suffix of weapon ids, e.g. WID_Assault_Infantry_Athena_R
+WEAPON_RARITIES = {
+    "C": "common",
+    "UC": "uncommon",
+    "R": "rare",
+    "VR": "epic",
+    "SR": "legendary",
+    "UR": "mythic",
+}
+
+
+def weapon_rarity(weapon_id: str) -> str | None:
+    """Returns the rarity encoded in the suffix of a weapon id, if any."""
+    return WEAPON_RARITIES.get(weapon_id.rsplit("_", 1)[-1])
+
+
+def parse_match_weapons(match_id: str) -> list[dict]:
+    """
+    Returns the weapons (excluding non-weapon items) seen in a match, with
+    their type, display name and rarity. Returns an empty list if the
+    match's weapons.json has not been fetched.
+    """
+    weapons_path = f"data/raw/match_{match_id}/weapons.json"
+    try:
+        match_weapons = jsonio.load(weapons_path)["weapons"]
+    except FileNotFoundError:
+        return []
+
+    weapons = {}
+    for weapon in match_weapons:
+        weapon_type = weapon.get("weaponType")
+        weapon_id = weapon.get("weaponId")
+        if not weapon_id or weapon_type in EXCLUDED_WEAPON_TYPES or weapon_id in weapons:
+            continue
+
+        weapons[weapon_id] = {
+            "weapon_id": weapon_id,
+            "weapon_type": weapon_type,
+            "weapon_name": weapon.get("weaponName") or weapon.get("displayName"),
+            "rarity": weapon.get("rarity") or weapon_rarity(weapon_id),
+        }
+    return list(weapons.values())
+
+
 def parse_event_weapons(event_window_id) -> list[dict]:
+    """
+    Returns the unique weapons seen across the matches of an event window.
+    For weapons already in the database, see etl.db.weapon_catalog instead.
+    """
     matches = parse_event_matches(event_window_id)
 
     # Track unique weapons across all matches
     seen_weapons = {}
-    
-    # Non-weapon types to filter out
-    excluded_types = {
-        "PICKAXE", 
-        "BUILDING", 
-        "LOOT", 
-        "SHIELD_HEAL", 
-        "EDIT_TOOL",
-        "MOVEMENT", 
-        "HEALTH_HEAL", 
-        "BOTH_HEAL"
-    }
-
     for match in matches:
-        match_info = match["info"]
-        match_id = match_info["matchId"]
-        weapons_path = f"data/raw/match_{match_id}/weapons.json"
-
-        try:
-            with open(weapons_path, "r") as f:
-                match_weapons = json.load(f)["weapons"]
-        except FileNotFoundError:
-            continue
-
-        for weapon in match_weapons:
-            weapon_type = weapon.get("weaponType")
-            weapon_id = weapon.get("weaponId")
-            
-            # Skip non-weapons and weapons we've already seen
-            if weapon_type in excluded_types or weapon_id in seen_weapons:
-                continue
-            
-            # Store the weapon info
-            seen_weapons[weapon_id] = {
-                "weapon_id": weapon_id,
-                "weapon_type": weapon_type
-            }
+        for weapon in parse_match_weapons(match["info"]["matchId"]):
+            seen_weapons.setdefault(weapon["weapon_id"], weapon)
 
     return list(seen_weapons.values())
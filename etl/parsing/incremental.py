@@ -0,0 +1,198 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+from etl import jsonio
+from etl.parsing.match_parsing import (
+    LAST_HIT_WINDOW_US,
+    LastHits,
+    build_elim_columns,
+    build_hit_columns,
+    rows_from_columns,
+)
+from etl.parsing.position_index import PositionIndex
+
+
+ZONE_LOG = "safeZoneUpdateEvents"
+
+# Storm phases of a complete match (see build_zone_timeline())
+ZONE_PHASES = 12
+
+# Eliminations can arrive this much later than the newest shots fed (e.g.
+# re-read by MatchTail's overlap) and still find the hits before them
+MAX_LATENESS_US = 60_000_000
+
+
+def _load_zone_events(match_id: str) -> list[dict]:
+    """Returns the zone updates saved so far for a match (none if not fetched yet)."""
+    zone_path = Path(f"data/raw/match_{match_id}/{ZONE_LOG}.json")
+    if not zone_path.exists():
+        return []
+    return jsonio.load(zone_path)
+
+
+def _load_match_context(match_id: str) -> tuple[int, list[int]]:
+    """
+    Returns the match start and the zone timeline known so far. Unlike
+    build_zone_timeline(), a partial timeline is accepted, since a live match
+    has not gone through every zone yet.
+    """
+    match_start = jsonio.load(f"data/raw/match_{match_id}/info.json")["aircraftStartTime"]
+    zone_events = sorted(_load_zone_events(match_id), key=lambda e: e["currentPhase"])
+    return match_start, [e["shrinkEndTime"] for e in zone_events]
+
+
+class _IncrementalParser(ABC):
+    """
+    Shared state of the incremental parsers: the position index, the zone
+    timeline and the timestamp of the latest processed event. Each event
+    must be fed once, as `etl.api.live_tail.MatchTail` does by dropping the
+    events it already delivered; late events and events sharing a
+    timestamp with earlier ones are parsed like any other.
+
+    The zone timeline of a live match grows as the storm shrinks. It is
+    extended with the zone updates fed to the parser, and reloaded with
+    `zone_loader` (if any) whenever an event is later than the last known
+    shrink, so events are never assigned a zone from a stale timeline.
+    """
+
+    def __init__(
+        self,
+        match_start: int,
+        zone_timeline: list[int],
+        zone_loader: Callable[[], list[dict]] | None = None
+    ):
+        self.match_start = match_start
+        self.zone_timeline = list(zone_timeline)
+        self.zone_loader = zone_loader
+        self.positions = PositionIndex()
+        self.last_timestamp = 0
+        self.skipped = 0
+
+    @classmethod
+    def for_match(cls, match_id: str):
+        return cls(*_load_match_context(match_id), zone_loader=lambda: _load_zone_events(match_id))
+
+    def extend_zones(self, zone_events: list[dict]):
+        """Adds zone updates to the timeline, ignoring the already known ones."""
+        shrink_ends = set(self.zone_timeline) | {e["shrinkEndTime"] for e in zone_events}
+        self.zone_timeline = sorted(shrink_ends)
+
+    def _refresh_zones(self, timestamp: int):
+        """Reloads the zone updates if `timestamp` is past the last known shrink."""
+        if self.zone_loader is None or len(self.zone_timeline) >= ZONE_PHASES:
+            return
+        if self.zone_timeline and timestamp <= self.zone_timeline[-1]:
+            return
+        self.extend_zones(self.zone_loader())
+
+    def _new_events(self, events: list[dict]) -> list[dict]:
+        new = sorted(events, key=lambda e: e["timestamp"])
+        if new:
+            self.last_timestamp = max(self.last_timestamp, new[-1]["timestamp"])
+            self._refresh_zones(self.last_timestamp)
+        return new
+
+    def _rows(self, columns: dict, n_events: int) -> list[dict]:
+        self.skipped += n_events - len(columns["timestamp"])
+        return rows_from_columns(columns)
+
+    def feed(self, log: str, events: list[dict]) -> list[dict]:
+        """
+        Routes a batch of tailed events by log name. Usable directly as the
+        `on_events` callback of MatchTail.
+        """
+        if log == "movement_events":
+            self.positions.extend(events)
+            return []
+        if log == ZONE_LOG:
+            self.extend_zones(events)
+            return []
+        return self.update(events)
+
+    @abstractmethod
+    def update(self, events: list[dict], movement_events: list[dict] | None = None) -> list[dict]:
+        """Returns the enriched rows of `events`."""
+
+
+class IncrementalDamageParser(_IncrementalParser):
+    """
+    Incremental parse_damage_dealt(): given only the shot events not fed
+    before, returns only the new enriched damage rows.
+    """
+
+    def update(self, events: list[dict], movement_events: list[dict] | None = None) -> list[dict]:
+        if movement_events:
+            self.positions.extend(movement_events)
+
+        hit_events = self._new_events([e for e in events if e.get("hitPlayer")])
+        if not hit_events:
+            return []
+        columns = build_hit_columns(hit_events, self.positions, self.match_start, self.zone_timeline)
+        return self._rows(columns, len(hit_events))
+
+
+class IncrementalElimParser(_IncrementalParser):
+    """
+    Incremental parse_elims(): given only the elimination events not fed
+    before, returns only the new enriched elimination rows.
+
+    Shot events fed to it are indexed (see LastHits) to attribute elimination
+    weapons. Only the hits an elimination can still be credited to are kept,
+    so each update costs the same however long the match has run.
+    """
+
+    def __init__(
+        self,
+        match_start: int,
+        zone_timeline: list[int],
+        zone_loader: Callable[[], list[dict]] | None = None
+    ):
+        super().__init__(match_start, zone_timeline, zone_loader)
+        self.hits = LastHits()
+        self.newest_hit = 0
+
+    def feed(self, log: str, events: list[dict]) -> list[dict]:
+        if log == "shot_events":
+            self.hits.extend(events)
+            if events:
+                self.newest_hit = max(self.newest_hit, max(e["timestamp"] for e in events))
+            self._prune_hits()
+            return []
+        return super().feed(log, events)
+
+    def _prune_hits(self):
+        newest = max(self.newest_hit, self.last_timestamp)
+        self.hits.prune(newest - MAX_LATENESS_US - LAST_HIT_WINDOW_US)
+
+    def update(self, events: list[dict], movement_events: list[dict] | None = None) -> list[dict]:
+        if movement_events:
+            self.positions.extend(movement_events)
+
+        elim_events = self._new_events([e for e in events if not e.get("selfElimination")])
+        if not elim_events:
+            return []
+        columns = build_elim_columns(
+            elim_events, self.positions, self.match_start, self.zone_timeline, self.hits
+        )
+        self._prune_hits()
+        return self._rows(columns, len(elim_events))
+
+
+def tail_loader(
+    parser: _IncrementalParser,
+    match_id: str,
+    session,
+    load_fn: Callable
+) -> Callable[[str, list[dict]], None]:
+    """
+    Returns a MatchTail `on_events` callback that parses each batch of tailed
+    events with `parser` and appends the new rows with `load_fn` (e.g.
+    loader.load_damage_dealt_events) in upsert mode, one commit per batch.
+    """
+    def on_events(log: str, events: list[dict]):
+        rows = parser.feed(log, events)
+        if rows:
+            load_fn(rows, match_id, session, upsert=True)
+            session.commit()
+    return on_events
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+
+# Code of values that are not interned (see Interner.encode)
+MISSING = -1
+
+
+class Interner:
+    """
+    Maps string ids (Epic ids, weapon ids) to dense int32 codes 0..n-1, in
+    order of first appearance.
+
+    Parsers encode ids once when the data is loaded and work on the codes:
+    grouping and sorting int32 arrays instead of object arrays of 32-char
+    strings, and per-player lookups, team and bot masks as plain NumPy
+    indexing (`mask[codes]`). Codes are decoded back to ids at output.
+
+    Use one interner per match for players, so codes stay dense. Weapon ids
+    are shared by every match, see `weapon_ids`.
+    """
+
+    def __init__(self, values=()):
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+        for value in values:
+            self.intern(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.codes
+
+    def intern(self, value: str) -> int:
+        """Returns the code of `value`, assigning the next one if it is new."""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, values, add: bool = True) -> np.ndarray:
+        """
+        Returns the int32 codes of `values`. New values are interned, or
+        encoded as MISSING if not `add`. None is always MISSING.
+
+        The values are factorized in one hashing pass (pd.factorize, in order
+        of first appearance), so only the distinct values go through the
+        code table, e.g. ~100 players for a million movement samples.
+        """
+        if not isinstance(values, np.ndarray):
+            values = np.array(list(values), dtype=object)
+        local_codes, uniques = pd.factorize(values)
+        lookup = self.intern if add else (lambda v: self.codes.get(v, MISSING))
+        # the trailing MISSING is picked by the -1 of missing values
+        table = np.array([lookup(v) for v in uniques] + [MISSING], dtype=np.int32)
+        return table[local_codes]
+
+    def decode(self, codes) -> np.ndarray:
+        """Returns the ids of `codes` as an object array, with None for MISSING."""
+        codes = np.asarray(codes, dtype=np.int64)
+        values = np.array(self.values + [None], dtype=object)
+        # MISSING (-1) indexes the trailing None
+        return values[codes]
+
+    def mask(self, values) -> np.ndarray:
+        """Returns a boolean array over the codes, True for the codes of `values`."""
+        mask = np.zeros(len(self), dtype=bool)
+        codes = self.encode(values, add=False)
+        mask[codes[codes != MISSING]] = True
+        return mask
+
+
+# Process-wide weapon id codes, shared across matches
+weapon_ids = Interner()
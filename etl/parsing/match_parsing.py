@@ -4,29 +4,69 @@ from platform import machine
 import pandas as pd
 import numpy as np
 
-from bisect import bisect_left
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 
-from etl.parsing.cleaning import get_id_to_name_map
+from etl import jsonio
+from etl.parsing.attribution import AttributionEngine, ASSIST_WINDOW_S, ATTRIBUTION_WINDOW_US
+from etl.parsing.interning import Interner, MISSING, weapon_ids
+from etl.parsing.position_index import PositionIndex
 
 
 coord3d = tuple[float, float, float]
 
+# An elimination is credited to the weapon of the eliminator's last hit on
+# the target only if that hit is at most this old (microseconds)
+LAST_HIT_WINDOW_US = 60_000_000
+
 def calculate_distances(
     coords_pairs: list[tuple[coord3d, coord3d]]
 ) -> np.ndarray:
     """Calculate 3D distances from coordinate pairs."""
-    a_arr = np.array([c[0] for c in coords_pairs], dtype=np.float32)
-    r_arr = np.array([c[1] for c in coords_pairs], dtype=np.float32)
-    diff = a_arr - r_arr
+    a_arr = np.array([c[0] for c in coords_pairs], dtype=np.float32).reshape(-1, 3)
+    r_arr = np.array([c[1] for c in coords_pairs], dtype=np.float32).reshape(-1, 3)
+    return distances_between(a_arr, r_arr)
+
+
+def distances_between(a_arr: np.ndarray, r_arr: np.ndarray) -> np.ndarray:
+    """Calculate 3D distances between two (N, 3) coordinate arrays."""
+    diff = a_arr.astype(np.float32) - r_arr.astype(np.float32)
     return np.sqrt(np.sum(diff**2, axis=1))
 
 
+def locations_array(events: list[dict], key: str) -> np.ndarray:
+    """Returns the `key` location ({"x", "y", "z"}) of every event as an (N, 3) array."""
+    return np.array(
+        [(e[key]["x"], e[key]["y"], e[key]["z"]) for e in events],
+        dtype=np.float64
+    ).reshape(-1, 3)
+
+
+def assign_zones(timestamps: np.ndarray, zone_timeline: list[int]) -> np.ndarray:
+    """Returns the storm zone (1-based) of every timestamp."""
+    return np.searchsorted(np.asarray(zone_timeline), timestamps, side="left") + 1
+
+
+def game_times(timestamps: np.ndarray, match_start: int) -> np.ndarray:
+    """Converts microsecond timestamps to seconds since `match_start`."""
+    return (timestamps - match_start) / 1e6
+
+
+def rows_from_columns(columns: dict[str, np.ndarray]) -> list[dict]:
+    """
+    Converts a columnar parser result (column name -> array) into a list of
+    row dicts with plain Python values, e.g. for the loaders.
+    """
+    names = list(columns.keys())
+    values = [columns[name].tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
 def indexed_events(
     reference_events: list[dict],
-    player_events: list[dict]
+    player_events: list[dict],
+    player_ids: set[str] | None = None
 ) -> defaultdict[str, dict[str, dict]]:
     """
     Returns for each player, the event belonging to them in `player_events` 
@@ -36,6 +76,10 @@ def indexed_events(
 
     This will allow, for a given reference event, instant lookup of all player
     events that occurred.
+
+    Every indexed player is matched against every reference event, so pass
+    `player_ids` to only index the players you need. To resolve a single
+    player per reference event (e.g. its actor), use `PositionIndex.lookup`.
     """
 
     target_ts = np.array([e["timestamp"] for e in reference_events])
@@ -43,7 +87,8 @@ def indexed_events(
 
     # Created sorted list of `player_events` for each player
     for e in player_events:
-        sorted_per_player[e["epicId"]].append(e)
+        if player_ids is None or e["epicId"] in player_ids:
+            sorted_per_player[e["epicId"]].append(e)
     for player_id in sorted_per_player:
         sorted_per_player[player_id].sort(key=lambda e: e["timestamp"])
 
@@ -89,8 +134,7 @@ def build_zone_timeline(zone_events: list[dict]):
 def parse_match_metadata(match_id: str):
     match_info_path = f"data/raw/match_{match_id}/info.json"
     try:
-        with open(match_info_path, "r") as f:
-            match_info = json.load(f)
+        match_info = jsonio.load(match_info_path)
     except FileNotFoundError:
         raise ValueError(f"Match info not found at {match_info_path}")
     
@@ -108,17 +152,36 @@ def parse_match_metadata(match_id: str):
     }
 
 
+def is_excluded_player(player: dict) -> bool:
+    """Bots and spectators are left out of every parsed output."""
+    return player["isSpectator"] or player["isBot"]
+
+
+def excluded_player_ids(match_id: str) -> set[str]:
+    """
+    Returns the Epic ids of the bots and spectators of a match, so readers
+    can drop their events at load time. Empty if players.json is missing.
+    """
+    match_players_path = Path(f"data/raw/match_{match_id}/players.json")
+    if not match_players_path.exists():
+        return set()
+    return {
+        p["epicId"]
+        for p in jsonio.load(match_players_path).get("players", [])
+        if is_excluded_player(p)
+    }
+
+
 def parse_match_players(match_id: str) -> list[dict]:
     match_players_path = f"data/raw/match_{match_id}/players.json"
     try:
-        with open(match_players_path, "r") as f:
-            match_players = json.load(f).get("players", [])
+        match_players = jsonio.load(match_players_path).get("players", [])
     except FileNotFoundError:
         raise ValueError(f"Match players not found at {match_players_path}")
     
     players = []
     for p in match_players:
-        if  p["isSpectator"] or p["isBot"]:
+        if is_excluded_player(p):
             continue
 
         players.append({
@@ -130,104 +193,239 @@ def parse_match_players(match_id: str) -> list[dict]:
     return players
 
 
-def parse_elims(match_id: str):
-    print(f"Parsing eliminations for match {match_id}...")
+class LastHits:
     """
-    Time
-    Distance
-    Weapon
+    Index of the shots that hit a player, to find the weapon of an actor's
+    last hit on a recipient before an elimination.
+
+    Ids are interned as hits are added, so an incremental parser only encodes
+    its new hits, and hits too old to matter can be pruned to keep each
+    lookup bounded.
     """
-    match_path = f"data/raw/match_{match_id}"
 
-    with (
-        open(f"{match_path}/info.json", "r") as f2,
-        open(f"{match_path}/human_elim_events.json", "r") as f3,
-        open(f"{match_path}/safeZoneUpdateEvents.json", "r") as f4,
-        open(f"{match_path}/movement_events.json") as f5,
-        open(f"{match_path}/shot_events.json") as f6,
-    ):
-        match_info = json.load(f2)
-        elim_events = json.load(f3)
-        zone_events = json.load(f4)
-        movement_events = json.load(f5)
-        shot_events = json.load(f6)
-
-    match_start = match_info["aircraftStartTime"]
-    zone_timeline = build_zone_timeline(zone_events)
+    def __init__(self, hit_events: list[dict] = ()):
+        self.players = Interner()
+        self.actors = np.empty(0, dtype=np.int64)
+        self.recipients = np.empty(0, dtype=np.int64)
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.weapons = np.empty(0, dtype=np.int32)
+        self.extend(hit_events)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def extend(self, hit_events: list[dict]):
+        """Adds the shots of `hit_events` that hit a player."""
+        hits = [e for e in hit_events if e.get("hitPlayer")]
+        if not hits:
+            return
+        self.actors = np.concatenate([
+            self.actors, self.players.encode([e["epicId"] for e in hits]).astype(np.int64)
+        ])
+        self.recipients = np.concatenate([
+            self.recipients, self.players.encode([e["hitEpicId"] for e in hits]).astype(np.int64)
+        ])
+        self.timestamps = np.concatenate([
+            self.timestamps, np.array([e["timestamp"] for e in hits], dtype=np.int64)
+        ])
+        self.weapons = np.concatenate([self.weapons, weapon_ids.encode([e["weaponId"] for e in hits])])
+
+    def prune(self, before: int):
+        """Drops the hits older than `before`."""
+        keep = self.timestamps >= before
+        self.actors, self.recipients = self.actors[keep], self.recipients[keep]
+        self.timestamps, self.weapons = self.timestamps[keep], self.weapons[keep]
+
+    def last_weapons(
+        self,
+        actor_ids: np.ndarray,
+        recipient_ids: np.ndarray,
+        timestamps: np.ndarray,
+        max_age: int = LAST_HIT_WINDOW_US
+    ) -> np.ndarray:
+        """
+        Returns, for each (actor, recipient, timestamp), the weapon of the
+        actor's last hit on the recipient at or before the timestamp, or None
+        if there is no such hit within `max_age` microseconds before it.
+        """
+        weapons = np.full(len(timestamps), None, dtype=object)
+        if not len(self) or len(timestamps) == 0:
+            return weapons
+
+        actors = self.players.encode(actor_ids, add=False).astype(np.int64)
+        recipients = self.players.encode(recipient_ids, add=False).astype(np.int64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+
+        # one sort key per (actor, recipient) pair and time, so the last hit of
+        # each query is a single binary search over all hits
+        n = len(self.players)
+        t_min = min(self.timestamps.min(), timestamps.min())
+        span = max(self.timestamps.max(), timestamps.max()) - t_min + 1
+        hit_pairs = self.actors * n + self.recipients
+        hit_keys = hit_pairs * span + (self.timestamps - t_min)
+        order = np.argsort(hit_keys, kind="stable")
+        hit_pairs, hit_keys = hit_pairs[order], hit_keys[order]
+        hit_ts, hit_weapons = self.timestamps[order], self.weapons[order]
+
+        pairs = actors * n + recipients
+        idx = np.searchsorted(hit_keys, pairs * span + (timestamps - t_min), side="right") - 1
+        found = (actors != MISSING) & (recipients != MISSING) & (idx >= 0)
+        found[found] = hit_pairs[idx[found]] == pairs[found]
+        found[found] = timestamps[found] - hit_ts[idx[found]] <= max_age
+        weapons[found] = weapon_ids.decode(hit_weapons[idx[found]])
+        return weapons
+
+
+def last_hit_weapons(
+    actor_ids: np.ndarray,
+    recipient_ids: np.ndarray,
+    timestamps: np.ndarray,
+    hit_events: list[dict],
+    max_age: int = LAST_HIT_WINDOW_US
+) -> np.ndarray:
+    """
+    Returns, for each (actor, recipient, timestamp), the weapon of the actor's
+    last hit on the recipient at or before the timestamp, or None if there is
+    no such hit within `max_age` microseconds before the timestamp.
+    """
+    return LastHits(hit_events).last_weapons(actor_ids, recipient_ids, timestamps, max_age)
 
-    elim_events.sort(key=lambda e: e["timestamp"])
-    
-    # Filter out self eliminations before building pos_cache
-    non_self_elims = [e for e in elim_events if not e.get("selfElimination")]
-    pos_cache = indexed_events(non_self_elims, movement_events)
-
-    enriched_elim_events = []
-    coord_pairs = []
-
-    for i, ee in enumerate(non_self_elims):
-        actor_id = ee["epicId"]
-        recipient_id = ee["targetId"]
-
-        ts = ee["timestamp"]
-        game_time_seconds = (ts - match_start) / 1e6
-
-        zone = bisect_left(zone_timeline, ts) + 1
-        # problem here
-        weapon_id = "WID_Assault_FirePetal_Fast_Athena_UC"
-        gun_type = ee["gunType"]
-
-        actor_loc = ee.get("playerLocation")
-        # key "playerLocation" is not guaranteed to exist for storm eliminations
-        if actor_loc is None:
-            if actor_id not in pos_cache:
-                continue
-            actor_move_event = pos_cache[actor_id]["closest_events"][i]
-            # print(json.dumps(actor_move_event, indent=2))
-            actor_loc = actor_move_event["movementData"]["location"]
-
-        # key "targetLocation" should always exist
-        recipient_loc = ee["targetLocation"]
-
-        coord_pairs.append((
-            (actor_loc["x"], actor_loc["y"], actor_loc["z"]),
-            (recipient_loc["x"], recipient_loc["y"], recipient_loc["z"])
-        ))
-
-        enriched_elim_events.append({
-            "timestamp": ts,
-            "game_time_seconds": game_time_seconds,
-            "zone": zone,
-            "weapon_id": weapon_id,
-            "actor_id": actor_id,
-            "recipient_id": recipient_id,
-            "ax": actor_loc["x"],
-            "ay": actor_loc["y"],
-            "az": actor_loc["z"],
-            "rx": recipient_loc["x"],
-            "ry": recipient_loc["y"],
-            "rz": recipient_loc["z"],
-        })
 
-    distances = calculate_distances(coord_pairs)
-    for i, event in enumerate(enriched_elim_events):
-        event["distance"] = float(distances[i])
+def build_elim_columns(
+    elim_events: list[dict],
+    positions: PositionIndex,
+    match_start: int,
+    zone_timeline: list[int],
+    hit_events: list[dict] | LastHits | None = None
+) -> dict[str, np.ndarray]:
+    """
+    Returns the enriched columns of time-sorted, non-self elimination events.
+    Events with neither an actor location nor actor movement samples are
+    dropped. The weapon of an elimination is the one of the eliminator's
+    last hit on the eliminated player in `hit_events` (shot events, or an
+    already built LastHits) within LAST_HIT_WINDOW_US (None if there is none,
+    e.g. storm eliminations).
+    """
+    if not isinstance(hit_events, LastHits):
+        hit_events = LastHits(hit_events or [])
+
+    timestamps = np.array([e["timestamp"] for e in elim_events], dtype=np.int64)
+    actor_ids = np.array([e["epicId"] for e in elim_events], dtype=object)
+
+    # key "playerLocation" is not guaranteed to exist for storm eliminations,
+    # fall back to the actor's interpolated movement
+    actor_xyz = np.full((len(elim_events), 3), np.nan)
+    has_loc = np.array([e.get("playerLocation") is not None for e in elim_events], dtype=bool)
+    if has_loc.any():
+        actor_xyz[has_loc] = locations_array(
+            [e for e in elim_events if e.get("playerLocation") is not None], "playerLocation"
+        )
+    if (~has_loc).any():
+        actor_xyz[~has_loc] = positions.lookup(actor_ids[~has_loc], timestamps[~has_loc], interpolate=True)
 
-    return enriched_elim_events
+    keep = ~np.isnan(actor_xyz).any(axis=1)
+    # key "targetLocation" should always exist
+    recipient_xyz = locations_array(elim_events, "targetLocation")[keep]
+    actor_xyz = actor_xyz[keep]
+    timestamps = timestamps[keep]
+    actor_ids = actor_ids[keep]
+    recipient_ids = np.array([e["targetId"] for e in elim_events], dtype=object)[keep]
 
+    return {
+        "timestamp": timestamps,
+        "game_time_seconds": game_times(timestamps, match_start),
+        "zone": assign_zones(timestamps, zone_timeline),
+        "weapon_id": hit_events.last_weapons(actor_ids, recipient_ids, timestamps),
+        "actor_id": actor_ids,
+        "recipient_id": recipient_ids,
+        "ax": actor_xyz[:, 0],
+        "ay": actor_xyz[:, 1],
+        "az": actor_xyz[:, 2],
+        "rx": recipient_xyz[:, 0],
+        "ry": recipient_xyz[:, 1],
+        "rz": recipient_xyz[:, 2],
+        "distance": distances_between(actor_xyz, recipient_xyz),
+    }
 
-def parse_hitscan_elims(match_id: str) -> list[dict]:
-    """
-    Returns a time-ordered list of elimination events
 
-    Parses shot_events instead of human_elim events
+def parse_elims_columns(match_id: str) -> dict[str, np.ndarray]:
+    """
+    Returns the enriched elimination events of a match as columns
+    (column name -> array), in time order.
     """
+    print(f"Parsing eliminations for match {match_id}...")
+    match_path = f"data/raw/match_{match_id}"
 
-    print(f"Parsing eliminations(2) for match {match_id}...")
+    match_info = jsonio.load(f"{match_path}/info.json")
+    elim_events = jsonio.load(f"{match_path}/human_elim_events.json")
+    zone_events = jsonio.load(f"{match_path}/safeZoneUpdateEvents.json")
+    shot_events = jsonio.load(f"{match_path}/human_shot_events.json")
+
+    elim_events.sort(key=lambda e: e["timestamp"])
+    non_self_elims = [e for e in elim_events if not e.get("selfElimination")]
+
+    return build_elim_columns(
+        non_self_elims,
+        PositionIndex.from_log(f"{match_path}/movement_events.json", excluded_player_ids(match_id)),
+        match_info["aircraftStartTime"],
+        build_zone_timeline(zone_events),
+        shot_events,
+    )
+
+
+def parse_elims(match_id: str) -> list[dict]:
     """
     Time
     Distance
     Weapon
     """
+    return rows_from_columns(parse_elims_columns(match_id))
+
+
+def build_hit_columns(
+    hit_events: list[dict],
+    positions: PositionIndex,
+    match_start: int,
+    zone_timeline: list[int]
+) -> dict[str, np.ndarray]:
+    """
+    Returns the enriched columns of time-sorted shot events that hit a
+    player: timing, zone, damage, weapon, ids, actor/recipient coordinates
+    and the distance between them. Actor positions are interpolated between
+    movement samples; shots by actors without movement samples are dropped.
+    """
+    timestamps = np.array([e["timestamp"] for e in hit_events], dtype=np.int64)
+    actor_ids = np.array([e["epicId"] for e in hit_events], dtype=object)
+
+    # one position query per event, grouped by actor
+    actor_xyz = positions.lookup(actor_ids, timestamps, interpolate=True)
+    keep = ~np.isnan(actor_xyz).any(axis=1)
+    if not keep.all():
+        hit_events = [e for e, k in zip(hit_events, keep) if k]
+        actor_xyz = actor_xyz[keep]
+        timestamps = timestamps[keep]
+        actor_ids = actor_ids[keep]
+    recipient_xyz = locations_array(hit_events, "location")
+
+    return {
+        "timestamp": timestamps,
+        "game_time_seconds": game_times(timestamps, match_start),
+        "zone": assign_zones(timestamps, zone_timeline),
+        "damage": np.array([e["damage"] for e in hit_events], dtype=np.float64),
+        "weapon_id": np.array([e["weaponId"] for e in hit_events], dtype=object),
+        "actor_id": actor_ids,
+        "recipient_id": np.array([e["hitEpicId"] for e in hit_events], dtype=object),
+        "ax": actor_xyz[:, 0],
+        "ay": actor_xyz[:, 1],
+        "az": actor_xyz[:, 2],
+        "rx": recipient_xyz[:, 0],
+        "ry": recipient_xyz[:, 1],
+        "rz": recipient_xyz[:, 2],
+        "distance": distances_between(actor_xyz, recipient_xyz),
+    }
+
+
+def _load_hit_inputs(match_id: str) -> tuple[list[dict], PositionIndex, int, list[int]]:
     match_path = f"data/raw/match_{match_id}"
 
     zone_events_path = f"{match_path}/safeZoneUpdateEvents.json"
@@ -235,20 +433,22 @@ def parse_hitscan_elims(match_id: str) -> list[dict]:
     movement_events_path = f"{match_path}/movement_events.json"
     match_info_path = f"{match_path}/info.json"
 
-    with (
-        open(zone_events_path, "r") as f1,
-        open(movement_events_path, "r") as f2,
-        open(shot_events_path, "r") as f3,
-        open(match_info_path, "r") as f4,
-    ):
-        zone_events = json.load(f1)
-        movement_events = json.load(f2)
-        shot_events = json.load(f3)
-        match_info = json.load(f4)
+    zone_events = jsonio.load(zone_events_path)
+    positions = PositionIndex.from_log(movement_events_path, excluded_player_ids(match_id))
+    shot_events = jsonio.load(shot_events_path)
+    match_info = jsonio.load(match_info_path)
+
+    return shot_events, positions, match_info["aircraftStartTime"], build_zone_timeline(zone_events)
+
 
-    match_start = match_info["aircraftStartTime"]
+def parse_hitscan_elims_columns(match_id: str) -> dict[str, np.ndarray]:
+    """
+    Returns the time-ordered elimination events of a match as columns,
+    parsed from shot_events instead of human_elim events.
+    """
+    print(f"Parsing eliminations(2) for match {match_id}...")
+    shot_events, positions, match_start, zone_timeline = _load_hit_inputs(match_id)
 
-    zone_timeline = build_zone_timeline(zone_events)
     # filter shots that hit players
     elim_events = [
         e for e in shot_events 
@@ -257,230 +457,104 @@ def parse_hitscan_elims(match_id: str) -> list[dict]:
             e.get("hitFatal")
         )
     ]
-
     elim_events.sort(key=lambda e: e["timestamp"])
-    pos_cache = indexed_events(elim_events, movement_events)
-
-    enriched_damage_events = []
-
-    coord_pairs = []
-    for i, he in enumerate(elim_events):
-        ts = he["timestamp"]
-        game_time_seconds = (ts - match_start) / 1e6
-
-        zone = bisect_left(zone_timeline, ts) + 1
-
-        damage = he["damage"]
-        weapon_id = he["weaponId"]
-
-        actor_id = he["epicId"]
-        actor_move_event = pos_cache[actor_id]["closest_events"][i]
-        actor_loc = actor_move_event["movementData"]["location"]
-
-        recipient_id = he["hitEpicId"]
-        recipient_loc = he["location"]
-
-        coord_pairs.append((
-            (actor_loc["x"], actor_loc["y"], actor_loc["z"]),
-            (recipient_loc["x"], recipient_loc["y"], recipient_loc["z"])
-        ))
-
-        enriched_damage_events.append({
-            "timestamp": ts,
-            "game_time_seconds": game_time_seconds,
-            "zone": zone,
-            "damage": damage,
-            "weapon_id": weapon_id,
-            "actor_id": actor_id,
-            "recipient_id": recipient_id,
-            "ax": actor_loc["x"],
-            "ay": actor_loc["y"],
-            "az": actor_loc["z"],
-            "rx": recipient_loc["x"],
-            "ry": recipient_loc["y"],
-            "rz": recipient_loc["z"],
-        })
 
-    distances = calculate_distances(coord_pairs)
-    for i, event in enumerate(enriched_damage_events):
-        event["distance"] = float(distances[i])
+    return build_hit_columns(elim_events, positions, match_start, zone_timeline)
 
-    return enriched_damage_events
 
-
-def parse_damage_dealt(match_id: str):
-    print(f"Parsing damage dealt for match {match_id}...")
-    """
-    Time
-    Distance
-    Weapon
+def parse_hitscan_elims(match_id: str) -> list[dict]:
     """
-    match_path = f"data/raw/match_{match_id}"
+    Returns a time-ordered list of elimination events
 
-    zone_events_path = f"{match_path}/safeZoneUpdateEvents.json"
-    shot_events_path = f"{match_path}/human_shot_events.json"
-    movement_events_path = f"{match_path}/movement_events.json"
-    match_info_path = f"{match_path}/info.json"
+    Parses shot_events instead of human_elim events
+    """
+    return rows_from_columns(parse_hitscan_elims_columns(match_id))
 
-    with (
-        open(zone_events_path, "r") as f1,
-        open(movement_events_path, "r") as f2,
-        open(shot_events_path, "r") as f3,
-        open(match_info_path, "r") as f4,
-    ):
-        zone_events = json.load(f1)
-        movement_events = json.load(f2)
-        shot_events = json.load(f3)
-        match_info = json.load(f4)
 
-    match_start = match_info["aircraftStartTime"]
+def parse_damage_dealt_columns(match_id: str) -> dict[str, np.ndarray]:
+    """
+    Returns the enriched damage events of a match as columns
+    (column name -> array), in time order.
+    """
+    print(f"Parsing damage dealt for match {match_id}...")
+    shot_events, positions, match_start, zone_timeline = _load_hit_inputs(match_id)
 
-    zone_timeline = build_zone_timeline(zone_events)
     # filter shots that hit players
     hit_events = [e for e in shot_events if e.get("hitPlayer")]
-
     hit_events.sort(key=lambda e: e["timestamp"])
-    pos_cache = indexed_events(hit_events, movement_events)
-
-    enriched_damage_events = []
-
-    coord_pairs = []
-    for i, he in enumerate(hit_events):
-        ts = he["timestamp"]
-        game_time_seconds = (ts - match_start) / 1e6
-
-        zone = bisect_left(zone_timeline, ts) + 1
-
-        damage = he["damage"]
-        weapon_id = he["weaponId"]
-
-        actor_id = he["epicId"]
-        actor_move_event = pos_cache[actor_id]["closest_events"][i]
-        actor_loc = actor_move_event["movementData"]["location"]
-
-        recipient_id = he["hitEpicId"]
-        recipient_loc = he["location"]
-
-        coord_pairs.append((
-            (actor_loc["x"], actor_loc["y"], actor_loc["z"]),
-            (recipient_loc["x"], recipient_loc["y"], recipient_loc["z"])
-        ))
-
-        enriched_damage_events.append({
-            "timestamp": ts,
-            "game_time_seconds": game_time_seconds,
-            "zone": zone,
-            "damage": damage,
-            "weapon_id": weapon_id,
-            "actor_id": actor_id,
-            "recipient_id": recipient_id,
-            "ax": actor_loc["x"],
-            "ay": actor_loc["y"],
-            "az": actor_loc["z"],
-            "rx": recipient_loc["x"],
-            "ry": recipient_loc["y"],
-            "rz": recipient_loc["z"],
-        })
 
-    distances = calculate_distances(coord_pairs)
-    for i, event in enumerate(enriched_damage_events):
-        event["distance"] = float(distances[i])
+    return build_hit_columns(hit_events, positions, match_start, zone_timeline)
 
-    return enriched_damage_events
 
+def parse_damage_dealt(match_id: str) -> list[dict]:
+    """
+    Time
+    Distance
+    Weapon
+    """
+    return rows_from_columns(parse_damage_dealt_columns(match_id))
 
-def parse_assists(match_id: str):
-    match_path = Path("data/raw/match_{match_id}")
 
-    # exclude metadata like players and info
-    match_logs = [
-        "shot_events",
-        "eliminationEvents",
-        "healthUpdateEvents",
-        "shieldUpdateEvents",
-    ]
-    with (
-        open(f"{match_path}/info.json", "r") as f1,
-    ):
-        info = json.load(f1)
-    data = {}
-    for filename in match_logs:
-        with open(match_path / f"{filename}.json", "r") as f:
-            data[filename] = json.load(f)
-
-    all_events = []
-
-    for event in data["shot_events"]:
-        if event.get("hitPlayer"):
-            all_events.append({
-                "type": "damage",
-                "timestamp": event["timestamp"],
-                "data": event
-            })
-    for event in data["eliminationEvents"]:
-        all_events.append({
-            "type": "elimination",
-            "timestamp": event["timestamp"],
-            "data": event
-        })
-    for event in data["healthUpdateEvents"]:
-        all_events.append({
-            "type": "health_update",
-            "timestamp": event["timestamp"],
-            "data": event
-        })
-    for event in data["shieldUpdateEvents"]:
-        all_events.append({
-            "type": "shield_update",
-            "timestamp": event["timestamp"],
-            "data": event
-        })
+def parse_assists(
+    match_id: str,
+    assist_window_s: float = ASSIST_WINDOW_S,
+    attribution_window_us: int = ATTRIBUTION_WINDOW_US
+) -> list[dict]:
+    """
+    Returns the assists of a match: for every elimination, each other player
+    who dealt damage to the eliminated player in the `assist_window_s`
+    seconds before it, with the damage they dealt.
 
-    all_events.sort(key=lambda x: x["timestamp"])
-
-    print(f"Merged {len(all_events)} total events:")
-    print(f"  - {sum(1 for e in all_events if e['type'] == 'damage')} damage events")
-    print(f"  - {sum(1 for e in all_events if e['type'] == 'elimination')} elimination events")
-    print(f"  - {sum(1 for e in all_events if e['type'] == 'health_update')} health updates")
-    print(f"  - {sum(1 for e in all_events if e['type'] == 'shield_update')} shield updates")
-
-    assist_events = []
-    player_map: dict = get_id_to_name_map(match_id)
-    state = {
-        id: {
-            "hp": 100,
-            "shield": 0,
-            "hp_hits": [],
-            "shield_hits": []
-        } for id in player_map.keys()
-    }
-    
-    for event in all_events:
-        if event["type"] == "damage":
-            pass
-
-        elif event["type"] == "health_update":
-            health_update = event["data"]
-            id = health_update["epicId"]
-            curr = state[id]
-            # check if corresponds with a shot event, or other type
-            health_diff = curr["hp"] - health_update["value"]
-            if health_diff > 0:
-                # heal event
-                pass
-            elif health_diff < 0:
-                # damage event
-                pass
-
-        elif event["type"] == "shield_update":
-            shield_update_event = event["data"]
-            id = shield_update_event["epicId"]
-
-        elif event["type"] == "elimination":
-            pass
-        
-
-    return assist_events
+    Health and shield drops are attributed to hits in a single time-ordered
+    pass over the match (see AttributionEngine).
+    """
+    print(f"Parsing assists for match {match_id}...")
+    match_path = Path(f"data/raw/match_{match_id}")
+
+    info = jsonio.load(match_path / "info.json")
+    data = {}
+    for filename in ("shot_events", "eliminationEvents", "healthUpdateEvents", "shieldUpdateEvents"):
+        path = match_path / f"{filename}.json"
+        # health/shield logs are not saved for matches without updates
+        if path.exists():
+            data[filename] = jsonio.load(path)
+        else:
+            data[filename] = []
+
+    # (timestamp, order, kind, event): at equal timestamps hits come before
+    # the health/shield updates they cause, and both before eliminations
+    all_events = [
+        (e["timestamp"], 0, "hit", e) for e in data["shot_events"] if e.get("hitPlayer")
+    ]
+    all_events += [(e["timestamp"], 1, "health", e) for e in data["healthUpdateEvents"]]
+    all_events += [(e["timestamp"], 1, "shield", e) for e in data["shieldUpdateEvents"]]
+    all_events += [
+        (e["timestamp"], 2, "elimination", e)
+        for e in data["eliminationEvents"] if not e.get("selfElimination")
+    ]
+    all_events.sort(key=lambda x: (x[0], x[1]))
+
+    engine = AttributionEngine(attribution_window_us, assist_window_s)
+    for ts, _, kind, event in all_events:
+        if kind == "hit":
+            engine.hit(ts, event["epicId"], event["hitEpicId"])
+        elif kind == "health":
+            engine.health_update(ts, event["epicId"], event["value"])
+        elif kind == "shield":
+            engine.shield_update(ts, event["epicId"], event["value"])
+        else:
+            engine.elimination(ts, event["epicId"], event["targetId"])
+    engine.finish()
+
+    match_start = info["aircraftStartTime"]
+    for assist in engine.assists:
+        assist["game_time_seconds"] = (assist["timestamp"] - match_start) / 1e6
+
+    print(
+        f"Found {len(engine.assists)} assists from {len(all_events)} events "
+        f"({engine.environmental_damage:.0f} environmental damage)"
+    )
+    return engine.assists
 
 
 if __name__ == "__main__":
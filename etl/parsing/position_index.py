@@ -0,0 +1,244 @@
+import numpy as np
+
+from etl.jsonio import load_columns
+from etl.parsing.interning import Interner, MISSING
+
+
+# Bracketing samples further apart than this (microseconds) are not
+# interpolated between; the closest one is used instead
+MAX_INTERPOLATION_GAP = 5_000_000
+
+# Columns of a movement log read by PositionIndex.from_log()
+MOVEMENT_FIELDS = {
+    "epicId": (("epicId",), object, None),
+    "timestamp": (("timestamp",), np.int64, 0),
+    "x": (("movementData", "location", "x"), np.float64, np.nan),
+    "y": (("movementData", "location", "y"), np.float64, np.nan),
+    "z": (("movementData", "location", "z"), np.float64, np.nan),
+    "yaw": (("movementData", "rotationYaw"), np.float64, 0.0),
+}
+
+
+class PositionIndex:
+    """
+    Time-sorted positions of every player, built from movement events.
+
+    Positions are kept per player as NumPy arrays (timestamps, xyz, yaw), so a
+    lookup is a binary search instead of a scan over the movement log. The
+    index can be extended with newer movement events, e.g. while tailing a
+    live match.
+
+    Positions can either snap to the closest sample in time or be linearly
+    interpolated between the two samples bracketing the query.
+
+    Player ids are interned (`ids`) and the arrays are stored by int32 code,
+    so batched lookups group queries by code and index the arrays directly.
+    Every method taking a player accepts its id or its code.
+    """
+
+    def __init__(self):
+        self.ids = Interner()
+        # by player code: sample times, (n, 3) coordinates and yaws
+        self.timestamps: list[np.ndarray] = []
+        self.coords: list[np.ndarray] = []
+        self.yaws: list[np.ndarray] = []
+
+    @classmethod
+    def from_events(cls, movement_events: list[dict]) -> "PositionIndex":
+        index = cls()
+        index.extend(movement_events)
+        return index
+
+    @classmethod
+    def from_log(cls, path, exclude_players: set[str] | None = None) -> "PositionIndex":
+        """
+        Builds the index from a movement log file read as columns (see
+        etl.jsonio.load_columns), leaving out the samples of
+        `exclude_players`.
+        """
+        index = cls()
+        index.extend_columns(load_columns(path, MOVEMENT_FIELDS, exclude_players))
+        return index
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def player_ids(self) -> list[str]:
+        """Returns the ids of the indexed players, in code order."""
+        return list(self.ids.values)
+
+    def _code(self, player: str | int) -> int:
+        if isinstance(player, (int, np.integer)):
+            return int(player)
+        return self.ids.codes[player]
+
+    def extend(self, movement_events: list[dict]):
+        """Adds movement events to the index, keeping each player's samples sorted."""
+        self.extend_columns({
+            "epicId": np.array([e["epicId"] for e in movement_events], dtype=object),
+            "timestamp": np.array([e["timestamp"] for e in movement_events], dtype=np.int64),
+            "x": np.array([e["movementData"]["location"]["x"] for e in movement_events], dtype=np.float64),
+            "y": np.array([e["movementData"]["location"]["y"] for e in movement_events], dtype=np.float64),
+            "z": np.array([e["movementData"]["location"]["z"] for e in movement_events], dtype=np.float64),
+            "yaw": np.array([e["movementData"].get("rotationYaw", 0.0) for e in movement_events], dtype=np.float64),
+        })
+
+    def extend_columns(self, columns: dict[str, np.ndarray]):
+        """
+        Adds movement samples given as columns (see MOVEMENT_FIELDS), keeping
+        each player's samples sorted.
+        """
+        codes = self.ids.encode(columns["epicId"])
+        order = np.argsort(codes, kind="stable")
+        boundaries = np.flatnonzero(codes[order][1:] != codes[order][:-1]) + 1
+        all_xyz = np.column_stack([columns["x"], columns["y"], columns["z"]])
+
+        # groups come in code order, so new players are appended in order
+        for group in np.split(order, boundaries) if len(order) else []:
+            code = codes[group[0]]
+            if code == MISSING:
+                continue
+            ts = columns["timestamp"][group]
+            xyz = all_xyz[group]
+            yaw = columns["yaw"][group]
+
+            known = code < len(self.timestamps)
+            if known:
+                ts = np.concatenate([self.timestamps[code], ts])
+                xyz = np.concatenate([self.coords[code], xyz])
+                yaw = np.concatenate([self.yaws[code], yaw])
+
+            # Appending newer events keeps the arrays sorted; only re-sort if not
+            if len(ts) > 1 and np.any(ts[1:] < ts[:-1]):
+                order_ts = np.argsort(ts, kind="stable")
+                ts, xyz, yaw = ts[order_ts], xyz[order_ts], yaw[order_ts]
+
+            if known:
+                self.timestamps[code], self.coords[code], self.yaws[code] = ts, xyz, yaw
+            else:
+                self.timestamps.append(ts)
+                self.coords.append(xyz)
+                self.yaws.append(yaw)
+
+    def closest_index(self, player: str | int, target_ts: np.ndarray) -> np.ndarray:
+        """
+        Returns, for each timestamp in `target_ts`, the index of the player's
+        movement sample closest in time (the earlier one on ties).
+        """
+        event_ts = self.timestamps[self._code(player)]
+        target_ts = np.asarray(target_ts)
+        if len(event_ts) == 1:
+            return np.zeros(len(target_ts), dtype=np.int64)
+
+        indices = np.searchsorted(event_ts, target_ts)
+        indices = np.clip(indices, 1, len(event_ts) - 1)
+
+        before = event_ts[indices - 1]
+        after = event_ts[indices]
+
+        # pick the closer sample (in time)
+        choose_after = np.abs(after - target_ts) < np.abs(before - target_ts)
+        return np.where(choose_after, indices, indices - 1)
+
+    def closest(self, player_id: str, ts: int) -> np.ndarray | None:
+        """Returns the (x, y, z) of the player's sample closest in time to `ts`."""
+        if player_id not in self.ids:
+            return None
+        code = self.ids.codes[player_id]
+        return self.coords[code][self.closest_index(code, np.array([ts]))[0]]
+
+    def interpolate(
+        self,
+        player: str | int,
+        target_ts: np.ndarray,
+        max_gap: int | None = MAX_INTERPOLATION_GAP
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Linearly interpolates the player's position and yaw at each timestamp
+        in `target_ts` between the bracketing movement samples. Yaw is
+        interpolated along the shortest arc. Queries outside the sampled range
+        are clamped to the first/last sample, and queries between samples more
+        than `max_gap` microseconds apart snap to the closest one.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (N, 3) coordinates and (N,) yaws
+        """
+        code = self._code(player)
+        event_ts = self.timestamps[code]
+        coords = self.coords[code]
+        yaws = self.yaws[code]
+        target_ts = np.asarray(target_ts, dtype=np.int64)
+        if len(event_ts) == 1:
+            return np.repeat(coords, len(target_ts), axis=0), np.repeat(yaws, len(target_ts))
+
+        after = np.clip(np.searchsorted(event_ts, target_ts, side="right"), 1, len(event_ts) - 1)
+        before = after - 1
+        t0 = event_ts[before]
+        t1 = event_ts[after]
+        span = t1 - t0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.where(span > 0, (target_ts - t0) / span, 0.0)
+        frac = np.clip(frac, 0.0, 1.0)
+        if max_gap is not None:
+            # the earlier sample on ties, as in closest_index()
+            nearest = np.where((t1 - target_ts) < (target_ts - t0), 1.0, 0.0)
+            frac = np.where(span > max_gap, nearest, frac)
+
+        xyz = coords[before] + frac[:, None] * (coords[after] - coords[before])
+
+        # shortest signed angle between the two yaws, in degrees
+        delta = (yaws[after] - yaws[before] + 180.0) % 360.0 - 180.0
+        yaw = (yaws[before] + frac * delta + 180.0) % 360.0 - 180.0
+        return xyz, yaw
+
+    def lookup(
+        self,
+        player_ids,
+        timestamps,
+        interpolate: bool = False,
+        max_gap: int | None = MAX_INTERPOLATION_GAP,
+        with_yaw: bool = False
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """
+        Resolves the position of `player_ids[i]` at `timestamps[i]` for paired
+        arrays, using the sample closest in time, or interpolating between the
+        bracketing samples if `interpolate` (see interpolate()). Queries are
+        grouped by player, so each player's samples are searched once for all
+        of their queries. `player_ids` can be ids or integer codes from `ids`.
+
+        Returns:
+            np.ndarray: (N, 3) coordinates; rows are NaN for players without
+                any movement samples. With `with_yaw`, a tuple of the
+                coordinates and the (N,) yaws.
+        """
+        codes = np.asarray(player_ids)
+        if codes.dtype.kind not in "iu":
+            codes = self.ids.encode(codes, add=False)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        coords = np.full((len(codes), 3), np.nan)
+        yaws = np.full(len(codes), np.nan)
+
+        if len(codes) > 0:
+            order = np.argsort(codes, kind="stable")
+            sorted_codes = codes[order]
+            boundaries = np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1
+
+            for group in np.split(order, boundaries):
+                code = codes[group[0]]
+                # players without any movement samples
+                if code == MISSING:
+                    continue
+                if interpolate:
+                    coords[group], yaws[group] = self.interpolate(code, timestamps[group], max_gap)
+                else:
+                    closest = self.closest_index(code, timestamps[group])
+                    coords[group] = self.coords[code][closest]
+                    yaws[group] = self.yaws[code][closest]
+
+        if with_yaw:
+            return coords, yaws
+        return coords
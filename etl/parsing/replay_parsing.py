@@ -1,17 +1,16 @@
 import uuid
 import copy
-import json
 import logging
 import numpy as np
 
-import boto3
 from pathlib import Path
-from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
-from etl.parsing.cleaning import get_id_to_name_map
-from etl.api.preprocessing import get_players
+from etl import jsonio
+from etl.log import configure_logging
+from etl.parsing.match_parsing import excluded_player_ids, parse_match_players
+from etl.parsing.position_index import PositionIndex
 
 
 class ObjectWrapper:
@@ -39,6 +38,9 @@ class ObjectWrapper:
         """
         Deletes the object.
         """
+        # botocore comes with the boto3 resource wrapped here
+        from botocore.exceptions import ClientError
+
         try:
             self.object.delete()
             self.object.wait_until_not_exists()
@@ -59,7 +61,15 @@ class ObjectWrapper:
 def get_match_object(match_id: str, hz: int):
     """
     Parses the movement_events.json log of a match and returns a binary object
-    containing all player positions at regular intervals.
+    containing all player positions at regular intervals. Positions are
+    interpolated between movement samples at each frame time.
+
+    Events updating bots and spectators (their movement, health, or their
+    own elimination) are dropped as the logs are loaded.
+
+    Returns:
+        tuple: (player_index, frames), with player_index mapping Epic ids to
+            player rows and frames a (frames, players, 8) float32 array
     """
 
     match_path = Path(f"data/raw/match_{match_id}")
@@ -73,11 +83,21 @@ def get_match_object(match_id: str, hz: int):
         "reviveEvents",
         "rebootEvents",
     ]
-    info = json.loads((match_path / "info.json").read_text())
+    info = jsonio.load(match_path / "info.json")
+    excluded = excluded_player_ids(match_id)
+    # knocks and eliminations update their target, whoever the actor is (a
+    # bot can eliminate a player); the other logs update their epicId
+    player_keys = {"knockedDownEvents": "targetId", "eliminationEvents": "targetId"}
     data = {
-        name: json.loads((match_path / f"{name}.json").read_text())
+        name: jsonio.filter_events(
+            jsonio.load(match_path / f"{name}.json"), excluded, key=player_keys.get(name, "epicId")
+        )
         for name in match_logs
     }
+    logger.info("Dropping the events of %d bot(s)/spectator(s)", len(excluded))
+    if logger.isEnabledFor(logging.DEBUG):
+        for player_id in excluded:
+            logger.debug("Excluded player %s", player_id)
 
     all_events = []
 
@@ -120,17 +140,19 @@ def get_match_object(match_id: str, hz: int):
 
     all_events.sort(key=lambda x: x["timestamp"])
 
-    print(f"Merged {len(all_events)} total events:")
-    print(f"  - {sum(1 for e in all_events if e['type'] == 'movement')} movement events")
-    print(f"  - {sum(1 for e in all_events if e['type'] == 'elimination')} elimination events")
-    print(f"  - {sum(1 for e in all_events if e['type'] == 'health_update')} health updates")
-    print(f"  - {sum(1 for e in all_events if e['type'] == 'shield_update')} shield updates")
-    print(f"  - {sum(1 for e in all_events if e['type'] == 'revive')} revive updates")
-    print(f"  - {sum(1 for e in all_events if e['type'] == 'reboot')} reboot updates")
-
-    player_map: dict = get_id_to_name_map(match_id)
-
-    player_ids = list(player_map.keys())
+    logger.info(
+        "Merged %d total events: %d movement, %d elimination, %d health, %d shield, %d revive, %d reboot",
+        len(all_events),
+        len(data["movement_events"]),
+        len(data["eliminationEvents"]),
+        len(data["healthUpdateEvents"]),
+        len(data["shieldUpdateEvents"]),
+        len(data["reviveEvents"]),
+        len(data["rebootEvents"]),
+    )
+
+    positions = PositionIndex.from_events(data["movement_events"])
+    player_ids = [p["epic_id"] for p in parse_match_players(match_id)]
     player_index = {pid: i for i, pid in enumerate(player_ids)}
     N = len(player_ids)
 
@@ -146,10 +168,6 @@ def get_match_object(match_id: str, hz: int):
     for evt in all_events:
         evt["timestamp"] = (evt["timestamp"] - t_0) * 1e-6 # seconds
 
-    bot_players = get_players(match_id, is_bot=True)
-    for k, v in bot_players.items():
-        print(k)
-
     for i, evt in enumerate(all_events):
 
         evt_type = evt["type"]
@@ -159,9 +177,6 @@ def get_match_object(match_id: str, hz: int):
         id = data["epicId"]
         idx = player_index.get(id)
 
-        if data["epicId"] in bot_players.keys():
-            continue
-
         # for all frames between this event (state) and the previous
         # copy the state to the frame
         while next_t <= evt["timestamp"]:
@@ -171,7 +186,11 @@ def get_match_object(match_id: str, hz: int):
 
         target_id = data.get("targetId")
         target_idx = player_index.get(target_id)
-            
+
+        # a player without a row would index (and overwrite) every row
+        if (target_idx if evt_type in ("knock", "elimination") else idx) is None:
+            continue
+
         # update the state based on the event
         # 1: x
         # 2: y
@@ -182,10 +201,8 @@ def get_match_object(match_id: str, hz: int):
         # 7: knocked/dbno
         match evt["type"]:
             case "movement":
-                state[idx, 0] = data["movementData"]["location"]["x"]
-                state[idx, 1] = data["movementData"]["location"]["y"]
-                state[idx, 2] = data["movementData"]["location"]["z"]
-                state[idx, 3] = data["movementData"]["rotationYaw"]
+                # positions are interpolated onto the frames below
+                pass
             case "knock":
                 # NOTE: players can have shield and health when knocked
                 state[target_idx, 6] = 1.0
@@ -206,14 +223,28 @@ def get_match_object(match_id: str, hz: int):
                 state[idx, 6] = True
                 state[idx, 7] = False
             case _:
-                print(f"Current event for player {id} does not have an event type.")
+                logger.error("Current event for player %s does not have an event type.", id)
                 raise Exception
 
+    frames = np.stack(frames) if frames else np.empty((0, N, 8), dtype=np.float32)
+
+    # interpolate every player's position and yaw at each frame time,
+    # instead of holding the last movement sample until the next one
+    frame_ts = t_0 + np.round(np.arange(len(frames)) * dt * 1e6).astype(np.int64)
+    for pid, idx in player_index.items():
+        if pid not in positions:
+            continue
+        xyz, yaw = positions.interpolate(pid, frame_ts)
+        frames[:, idx, 0:3] = xyz
+        frames[:, idx, 3] = yaw
+
+    logger.info("Built %d frames at %d Hz for %d players", len(frames), hz, N)
     return player_index, frames
 
 
 
 if __name__ == "__main__":
+    configure_logging()
     match_id = "832ceecc424df110d58e3e96d3dff834"
     frames = get_match_object(match_id=match_id, hz=20)
     print(frames)
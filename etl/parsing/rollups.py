@@ -0,0 +1,119 @@
+import pandas as pd
+
+
+# weapon_type of events whose weapon is not in the catalog (or storm eliminations),
+# so it can be part of a unique key
+UNKNOWN_WEAPON_TYPE = "unknown"
+
+
+def _frame(rows: list[dict], columns: list[str]) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    if "weapon_type" in df:
+        df["weapon_type"] = df["weapon_type"].fillna(UNKNOWN_WEAPON_TYPE)
+    return df
+
+
+def compute_match_rollups(
+    match_id: str,
+    players: list[dict],
+    damage_events: list[dict],
+    elim_events: list[dict]
+) -> dict[str, list[dict]]:
+    """
+    Aggregates the parsed events of a match into the rows of the summary
+    tables, so analytics queries read a few rows per match instead of
+    scanning the event tables.
+
+    Args:
+        match_id: The match the events belong to
+        players: Player dictionaries from parse_match_players()
+        damage_events: Damage dictionaries from parse_damage_dealt(), with
+            weapon_type filled by WeaponCatalog.annotate()
+        elim_events: Elimination dictionaries from parse_elims(), with
+            weapon_type filled by WeaponCatalog.annotate()
+
+    Returns:
+        dict: Rows per summary table:
+            - match_stats: One row for the match
+            - player_match_stats: One row per player of the match
+            - player_weapon_stats: One row per player and weapon type used
+            - match_zone_stats: One row per zone with damage or eliminations
+    """
+    damage = _frame(damage_events, ["actor_id", "recipient_id", "weapon_type", "damage", "distance", "zone"])
+    elims = _frame(elim_events, ["actor_id", "recipient_id", "weapon_type", "distance", "zone"])
+
+    # Per player: every player of the match gets a row, even without events
+    player_ids = pd.Index([p["epic_id"] for p in players], name="epic_id")
+    dealt = damage.groupby("actor_id").agg(
+        damage_dealt=("damage", "sum"),
+        hits=("damage", "size"),
+        avg_hit_distance=("distance", "mean"),
+    )
+    taken = damage.groupby("recipient_id").agg(damage_taken=("damage", "sum"))
+    eliminations = elims.groupby("actor_id").agg(
+        eliminations=("distance", "size"),
+        avg_elim_distance=("distance", "mean"),
+    )
+    deaths = elims.groupby("recipient_id").agg(deaths=("distance", "size"))
+
+    per_player = (
+        pd.concat([dealt, taken, eliminations, deaths], axis=1)
+        .reindex(player_ids.union(dealt.index).union(eliminations.index))
+    )
+    counts = ["damage_dealt", "damage_taken", "hits", "eliminations", "deaths"]
+    per_player[counts] = per_player[counts].fillna(0)
+    per_player = per_player.rename_axis("epic_id").reset_index()
+
+    # Per player and weapon type
+    weapon_damage = damage.groupby(["actor_id", "weapon_type"]).agg(
+        damage_dealt=("damage", "sum"),
+        hits=("damage", "size"),
+        avg_hit_distance=("distance", "mean"),
+    )
+    weapon_elims = elims.groupby(["actor_id", "weapon_type"]).agg(eliminations=("distance", "size"))
+    per_weapon = pd.concat([weapon_damage, weapon_elims], axis=1)
+    per_weapon[["damage_dealt", "hits", "eliminations"]] = (
+        per_weapon[["damage_dealt", "hits", "eliminations"]].fillna(0)
+    )
+    per_weapon = per_weapon.rename_axis(["epic_id", "weapon_type"]).reset_index()
+
+    # Per zone
+    zone_damage = damage.groupby("zone").agg(
+        damage_dealt=("damage", "sum"),
+        hits=("damage", "size"),
+        avg_hit_distance=("distance", "mean"),
+    )
+    zone_elims = elims.groupby("zone").agg(
+        eliminations=("distance", "size"),
+        avg_elim_distance=("distance", "mean"),
+    )
+    per_zone = pd.concat([zone_damage, zone_elims], axis=1)
+    per_zone[["damage_dealt", "hits", "eliminations"]] = (
+        per_zone[["damage_dealt", "hits", "eliminations"]].fillna(0)
+    )
+    per_zone = per_zone.rename_axis("zone").reset_index()
+
+    match_stats = {
+        "match_id": match_id,
+        "players": len(players),
+        "damage_dealt": float(damage["damage"].sum()),
+        "hits": len(damage),
+        "eliminations": len(elims),
+        "avg_hit_distance": float(damage["distance"].mean()) if len(damage) else None,
+        "avg_elim_distance": float(elims["distance"].mean()) if len(elims) else None,
+    }
+
+    return {
+        "match_stats": [match_stats],
+        "player_match_stats": _records(per_player, match_id, ints=["hits", "eliminations", "deaths"]),
+        "player_weapon_stats": _records(per_weapon, match_id, ints=["hits", "eliminations"]),
+        "match_zone_stats": _records(per_zone, match_id, ints=["zone", "hits", "eliminations"]),
+    }
+
+
+def _records(df: pd.DataFrame, match_id: str, ints: list[str]) -> list[dict]:
+    """Converts an aggregate frame to plain-Python rows, with NaN means as None."""
+    df = df.astype({col: "int64" for col in ints})
+    df = df.astype(object).where(df.notna(), None)
+    df.insert(0, "match_id", match_id)
+    return df.to_dict("records")
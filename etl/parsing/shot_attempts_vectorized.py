@@ -1,4 +1,5 @@
 import json
+import logging
 from pprint import pprint
 import cProfile
 import math
@@ -7,74 +8,83 @@ import numpy as np
 from glob import glob
 from collections import defaultdict
 from bisect import bisect_left, bisect_right
-import matplotlib.pyplot as plt
 
-from pipeline.api import osirion_client as osr
 from geometry.vec3 import Vec3, normalize, dot
 from geometry.ray import Ray
 from geometry.sphere import Sphere
 
+from etl import jsonio
+from etl.log import configure_logging
+from etl.parsing.position_index import PositionIndex
 
-def get_hit_attempt_events(shot_events_path: str, movement_events_path: str):
+logger = logging.getLogger(__name__)
+
+
+def movement_at(player_id: str, ts: int, location: np.ndarray, yaw: float) -> dict:
+    """
+    Returns an interpolated position in the shape of a movement event.
+    """
+    return {
+        "epicId": player_id,
+        "timestamp": ts,
+        "movementData": {
+            "location": {"x": float(location[0]), "y": float(location[1]), "z": float(location[2])},
+            "rotationYaw": float(yaw),
+        },
+    }
+
+
+def get_hit_attempt_events(
+    shot_events_path: str,
+    movement_events_path: str,
+    exclude_players: set[str] | None = None
+):
     """
     Returns a list of all shots events which are attempts to hit exposed players
+
+    Shots and movement of `exclude_players` (e.g. excluded_player_ids() of
+    the match) are dropped as the logs are loaded.
     """
 
-    with open(movement_events_path, "r") as f:
-        movement_events = json.load(f)["events"]
-    with open(shot_events_path, "r") as f:
-        shot_events = json.load(f)["hitscanEvents"]
+    shot_events = jsonio.filter_events(jsonio.load(shot_events_path)["hitscanEvents"], exclude_players)
     with open("data/processed/test_teammate_map.json", "r") as f:
         team_player_ids = json.load(f)
-        print(f"Found {len(team_player_ids)} in match.")
+    logger.info("Found %d players in match", len(team_player_ids))
 
     hit_attempts = []
 
-    # target timestamps
-    target_ts = np.sort(np.array([se["timestamp"] for se in shot_events]), kind="stable")
-
-    sorted_movements_by_player = defaultdict(list)
-    for me in movement_events:
-        sorted_movements_by_player[me["epicId"]].append(me)
-    for player_id in sorted_movements_by_player:
-        sorted_movements_by_player[player_id].sort(key=lambda e: e["timestamp"])
-    
-    print(len(sorted_movements_by_player))
-
-    pos_cache = defaultdict(dict)
-    for player_id, movement_events in sorted_movements_by_player.items():
-        movement_ts = np.array([me["timestamp"] for me in movement_events])
-        indices = np.searchsorted(movement_ts, target_ts)
-        indices = np.clip(indices, 1, len(movement_ts)-1)
-
-        before = movement_ts[indices - 1]
-        after = movement_ts[indices]
-
-        # pick the closer shot (in time)
-        choose_after = np.abs(after - target_ts) < np.abs(before - target_ts)
-        closest_idxs = np.where(choose_after, indices, indices - 1)
+    shot_events.sort(key=lambda e: e["timestamp"])
+    target_ts = np.array([se["timestamp"] for se in shot_events], dtype=np.int64)
 
-        # Extract the movement events
-        closest_movements = [movement_events[i] for i in closest_idxs]
+    positions = PositionIndex.from_log(movement_events_path, exclude_players)
+    logger.info("Indexed movement of %d players", len(positions))
 
-        # Store results
-        pos_cache[player_id]["timestamps"] = movement_ts
-        pos_cache[player_id]["closest_indices"] = closest_idxs
-        pos_cache[player_id]["closest_events"] = closest_movements
+    # interpolated positions and yaws of every player (by code) at the time
+    # of every shot: (shots, players, 3) and (shots, players)
+    players = positions.ids
+    interpolated = [positions.interpolate(code, target_ts) for code in range(len(players))]
+    all_xyz = np.stack([xyz for xyz, _ in interpolated], axis=1) if interpolated else np.empty((len(target_ts), 0, 3))
+    all_yaw = np.stack([yaw for _, yaw in interpolated], axis=1) if interpolated else np.empty((len(target_ts), 0))
 
+    # candidates[a, b]: player b can be the target of a shot by player a
+    candidates = np.ones((len(players), len(players)), dtype=bool)
+    for player_id, teammates in team_player_ids.items():
+        if player_id in players:
+            candidates[players.codes[player_id]] = ~players.mask(teammates)
 
-    shot_events.sort(key=lambda e: e["timestamp"])
+    debug = logger.isEnabledFor(logging.DEBUG)
     counter = 0
+    rejected = 0
     for i, se in enumerate(shot_events):
         if se["hitPlayer"]:
             counter += 1
-        print(f"Evaluating shot {i}:")
+        if debug:
+            logger.debug("Evaluating shot %d", i)
         t = se["timestamp"]
 
         # get position of the actor (at the time)
-        actor_move_event = pos_cache[se["epicId"]]["closest_events"][i]
-        actor_loc = actor_move_event["movementData"]["location"]
-        p_actor = np.array([actor_loc["x"], actor_loc["y"], actor_loc["z"]]) # broadcasted
+        actor = players.codes[se["epicId"]]
+        p_actor = all_xyz[i, actor]
 
         # get ending position of the shot
         p_hit = se["location"]
@@ -84,19 +94,8 @@ def get_hit_attempt_events(shot_events_path: str, movement_events_path: str):
         dist_to_hit = np.linalg.norm(p_hit - p_actor)
 
         # get positions of all candidates (at the time)
-        cand_ids = [
-            player_id
-            for player_id in pos_cache.keys()
-            if player_id not in team_player_ids[se["epicId"]]
-        ]
-        p_cands = np.array([
-            [
-                pos_cache[player_id]["closest_events"][i]["movementData"]["location"]["x"],
-                pos_cache[player_id]["closest_events"][i]["movementData"]["location"]["y"],
-                pos_cache[player_id]["closest_events"][i]["movementData"]["location"]["z"]
-            ]
-            for player_id in cand_ids
-        ], dtype=np.float32)
+        cand_codes = np.flatnonzero(candidates[actor])
+        p_cands = all_xyz[i, cand_codes].astype(np.float32)
 
         # print(f"number of candidates for shot {i}: {len(p_cands)}")
         # print(p_cands)
@@ -135,9 +134,12 @@ def get_hit_attempt_events(shot_events_path: str, movement_events_path: str):
                 closest_idx = hit_indices[min_idx]
                 
                 # Pull data for this closest candidate
-                closest_cand_id = cand_ids[closest_idx]
+                closest_code = cand_codes[closest_idx]
+                closest_cand_id = players.values[closest_code]
                 closest_position = p_cands[closest_idx]
-                closest_event = pos_cache[closest_cand_id]["closest_events"][i]
+                closest_event = movement_at(
+                    closest_cand_id, t, closest_position, all_yaw[i, closest_code]
+                )
 
                 # Distance to the shot's end point
                 dist_to_build = np.linalg.norm(p_hit - p_actor)
@@ -149,14 +151,21 @@ def get_hit_attempt_events(shot_events_path: str, movement_events_path: str):
                         "intendedRecipient": closest_cand_id,
                         "targetMovement": closest_event,
                     })
-                    print(f"✅ Shot {i} added as hit attempt (exposed BB)")
+                    if debug:
+                        logger.debug("Shot %d added as hit attempt (exposed BB)", i)
                 else:
-                    print("❌ No potential candidates (stray shot)")
+                    rejected += 1
+                    if debug:
+                        logger.debug("Shot %d: closest candidate behind the build hit", i)
             else:
-                print("❌ No potential candidates (stray shot)")
-
-    print(len(hit_attempts))
-    print(f"number of hits: {counter}")
+                rejected += 1
+                if debug:
+                    logger.debug("Shot %d: no potential candidates (stray shot)", i)
+
+    logger.info(
+        "Evaluated %d shots: %d hit attempts (%d hits), %d rejected",
+        len(shot_events), len(hit_attempts), counter, rejected
+    )
     return hit_attempts
 
 
@@ -179,6 +188,7 @@ def get_hit_attempt_events(shot_events_path: str, movement_events_path: str):
 
 
 if __name__ == '__main__':
+    configure_logging()
     movement_events_path = "data/raw/match_movement_events.json"
     shot_events_path = "data/raw/match_shot_events.json"
     # attempts = get_hit_attempt_events(shot_events_path, movement_events_path)
@@ -0,0 +1,70 @@
+import pytest
+
+from etl.parsing.attribution import AttributionEngine
+from etl.parsing.match_parsing import parse_assists
+
+
+def test_drop_is_credited_to_the_last_hit():
+    engine = AttributionEngine(attribution_window_us=1000)
+    engine.hit(0, "a", "v")
+    engine.health_update(100, "v", 70.0)
+
+    assert engine.damage_dealt == {"a": 30.0}
+    assert engine.environmental_damage == 0.0
+
+
+def test_drop_logged_before_its_hit():
+    engine = AttributionEngine(attribution_window_us=1000)
+    engine.shield_update(0, "v", 0.0)  # no shield: not a drop
+    engine.health_update(100, "v", 80.0)
+    engine.hit(150, "a", "v")
+
+    assert engine.damage_dealt == {"a": 20.0}
+
+
+def test_unmatched_drops_are_environmental():
+    engine = AttributionEngine(attribution_window_us=1000)
+    engine.health_update(0, "v", 90.0)
+    # the next event on the player expires the pending drop
+    engine.health_update(5000, "v", 85.0)
+    assert engine.environmental_damage == 10.0
+
+    engine.finish()
+    assert engine.environmental_damage == 15.0
+    assert engine.damage_dealt == {}
+
+
+def test_assists_exclude_the_eliminator_and_old_damage():
+    engine = AttributionEngine(attribution_window_us=1000, assist_window_s=1.0)
+    engine.hit(0, "old", "v")
+    engine.health_update(0, "v", 90.0)
+    engine.hit(2_000_000, "helper", "v")
+    engine.health_update(2_000_000, "v", 60.0)
+    engine.hit(2_500_000, "killer", "v")
+    engine.health_update(2_500_000, "v", 0.0)
+    engine.elimination(2_600_000, "killer", "v")
+
+    assert [(a["actor_id"], a["damage"]) for a in engine.assists] == [("helper", 30.0)]
+    assert engine.assists[0]["eliminator_id"] == "killer"
+    # the eliminated player starts over if rebooted
+    assert engine.players["v"].hp == 100.0
+
+
+def test_parse_assists_on_a_synthetic_match(synthetic_match):
+    assists = parse_assists(synthetic_match)
+    assert all(a["actor_id"] not in (a["eliminator_id"], a["recipient_id"]) for a in assists)
+    assert all(a["damage"] > 0 for a in assists)
+    assert assists == sorted(assists, key=lambda a: a["timestamp"])
+    assert all(a["game_time_seconds"] >= 0 for a in assists)
+
+
+@pytest.mark.parametrize("window", [0, 10_000_000])
+def test_attribution_window_bounds_matching(window):
+    engine = AttributionEngine(attribution_window_us=window)
+    engine.hit(0, "a", "v")
+    engine.health_update(1_000_000, "v", 50.0)
+    engine.finish()
+
+    matched = window >= 1_000_000
+    assert engine.damage_dealt == ({"a": 50.0} if matched else {})
+    assert engine.environmental_damage == (0.0 if matched else 50.0)
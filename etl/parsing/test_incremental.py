@@ -0,0 +1,112 @@
+import pytest
+
+from etl import jsonio
+from etl.parsing.incremental import (
+    MAX_LATENESS_US,
+    ZONE_LOG,
+    IncrementalDamageParser,
+    IncrementalElimParser,
+    _IncrementalParser,
+)
+from etl.parsing.match_parsing import LAST_HIT_WINDOW_US, excluded_player_ids, parse_damage_dealt, parse_elims
+
+
+def _logs(match_id: str) -> dict[str, list[dict]]:
+    match_path = f"data/raw/match_{match_id}"
+    excluded = excluded_player_ids(match_id)
+    return {
+        "movement_events": jsonio.filter_events(jsonio.load(f"{match_path}/movement_events.json"), excluded),
+        "shot_events": jsonio.load(f"{match_path}/human_shot_events.json"),
+        "eliminationEvents": jsonio.load(f"{match_path}/human_elim_events.json"),
+    }
+
+
+def _batches(events: list[dict], size: int):
+    for i in range(0, len(events), size):
+        yield events[i:i + size]
+
+
+def test_damage_parser_matches_the_batch_parser(synthetic_match):
+    logs = _logs(synthetic_match)
+    parser = IncrementalDamageParser.for_match(synthetic_match)
+    parser.feed("movement_events", logs["movement_events"])
+
+    rows = []
+    for batch in _batches(logs["shot_events"], 50):
+        rows += parser.feed("shot_events", batch)
+
+    assert rows == parse_damage_dealt(synthetic_match)
+
+
+def test_late_and_boundary_events_are_parsed(synthetic_match):
+    logs = _logs(synthetic_match)
+    hits = sorted((e for e in logs["shot_events"] if e.get("hitPlayer")), key=lambda e: e["timestamp"])
+    parser = IncrementalDamageParser.for_match(synthetic_match)
+    parser.feed("movement_events", logs["movement_events"])
+
+    # the second batch re-delivers the boundary timestamp and a late event,
+    # as MatchTail's overlap does
+    first, late, rest = hits[:100], hits[50], hits[100:]
+    boundary = {**first[-1], "hitEpicId": "other", "damage": 1.0}
+    rows = parser.feed("shot_events", [e for e in first if e is not late])
+    rows += parser.feed("shot_events", [boundary, late] + rest)
+
+    key = lambda row: (row["timestamp"], row["actor_id"], row["recipient_id"], row["damage"])
+    expected = parse_damage_dealt(synthetic_match)
+    assert len(rows) == len(expected) + 1
+    assert sorted(map(key, expected)) == sorted(key(r) for r in rows if r["recipient_id"] != "other")
+
+
+def test_elim_parser_matches_the_batch_parser(synthetic_match):
+    logs = _logs(synthetic_match)
+    parser = IncrementalElimParser.for_match(synthetic_match)
+    parser.feed("movement_events", logs["movement_events"])
+
+    # shots and eliminations arrive together, as from a tail
+    shots = sorted(logs["shot_events"], key=lambda e: e["timestamp"])
+    elims = sorted(logs["eliminationEvents"], key=lambda e: e["timestamp"])
+    rows, fed = [], 0
+    for batch in _batches(elims, 5):
+        start, until = fed, batch[-1]["timestamp"]
+        while fed < len(shots) and shots[fed]["timestamp"] <= until:
+            fed += 1
+        parser.feed("shot_events", shots[start:fed])
+        rows += parser.feed("eliminationEvents", batch)
+
+    assert rows == parse_elims(synthetic_match)
+    # only the hits of the last minutes are kept
+    assert len(parser.hits) < len([e for e in logs["shot_events"] if e.get("hitPlayer")])
+
+
+def test_elim_parser_prunes_old_hits():
+    parser = IncrementalElimParser(0, [])
+    hit = {"epicId": "a", "hitEpicId": "v", "weaponId": "rifle", "hitPlayer": True}
+    parser.feed("shot_events", [{**hit, "timestamp": 0}])
+    parser.feed("shot_events", [{**hit, "timestamp": MAX_LATENESS_US + LAST_HIT_WINDOW_US + 1}])
+    assert parser.hits.timestamps.tolist() == [MAX_LATENESS_US + LAST_HIT_WINDOW_US + 1]
+
+
+def test_zone_timeline_grows_with_the_match():
+    zone_events = [{"currentPhase": 1, "shrinkEndTime": 100}]
+    parser = IncrementalDamageParser(0, [], zone_loader=lambda: zone_events)
+
+    parser._new_events([{"timestamp": 50}])
+    assert parser.zone_timeline == [100]
+
+    # the next shrink is only known once the storm reached it
+    zone_events.append({"currentPhase": 2, "shrinkEndTime": 200})
+    parser._new_events([{"timestamp": 80}])
+    assert parser.zone_timeline == [100]
+    parser._new_events([{"timestamp": 150}])
+    assert parser.zone_timeline == [100, 200]
+
+
+def test_fed_zone_updates_extend_the_timeline():
+    parser = IncrementalDamageParser(0, [100])
+    parser.feed(ZONE_LOG, [{"currentPhase": 1, "shrinkEndTime": 100}, {"currentPhase": 2, "shrinkEndTime": 200}])
+    assert parser.zone_timeline == [100, 200]
+
+
+def test_base_parser_is_abstract():
+    with pytest.raises(TypeError):
+        _IncrementalParser(0, [])
@@ -0,0 +1,40 @@
+import numpy as np
+
+from etl.parsing.match_parsing import LAST_HIT_WINDOW_US, last_hit_weapons, parse_elims, parse_match_players
+
+
+def _hit(ts: int, actor: str, recipient: str, weapon: str) -> dict:
+    return {"timestamp": ts, "epicId": actor, "hitEpicId": recipient, "weaponId": weapon, "hitPlayer": True}
+
+
+def test_last_hit_weapons():
+    hits = [
+        _hit(100, "a", "v", "rifle"),
+        _hit(200, "a", "v", "shotgun"),
+        _hit(300, "b", "v", "smg"),
+        _hit(400, "a", "other", "sniper"),
+    ]
+    weapons = last_hit_weapons(
+        np.array(["a", "a", "b", "c"]),
+        np.array(["v", "v", "v", "v"]),
+        np.array([150, 500, 250, 500]),
+        hits,
+    )
+    # no hit of b on v before 250, and c never hit anyone
+    assert weapons.tolist() == ["rifle", "shotgun", None, None]
+
+
+def test_last_hit_weapons_ignores_old_hits():
+    hits = [_hit(0, "a", "v", "rifle")]
+    weapons = last_hit_weapons(
+        np.array(["a", "a"]), np.array(["v", "v"]),
+        np.array([LAST_HIT_WINDOW_US, LAST_HIT_WINDOW_US + 1]),
+        hits,
+    )
+    assert weapons.tolist() == ["rifle", None]
+
+
+def test_bots_are_excluded(synthetic_match):
+    player_ids = {p["epic_id"] for p in parse_match_players(synthetic_match)}
+    assert player_ids
+    assert all(e["actor_id"] in player_ids for e in parse_elims(synthetic_match))
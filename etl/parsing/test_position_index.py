@@ -0,0 +1,34 @@
+import numpy as np
+
+from etl.parsing.interning import MISSING, Interner
+from etl.parsing.position_index import PositionIndex
+
+
+def _sample(player_id, timestamp, x):
+    return {
+        "epicId": player_id,
+        "timestamp": timestamp,
+        "movementData": {"location": {"x": x, "y": 0.0, "z": 0.0}, "rotationYaw": 0.0},
+    }
+
+
+def test_encode_interns_in_order_of_first_appearance():
+    ids = Interner(["b"])
+    assert ids.encode(["c", "b", "a", "c", None]).tolist() == [1, 0, 2, 1, MISSING]
+    assert ids.values == ["b", "c", "a"]
+
+    assert ids.encode(np.array(["a", "d"], dtype=object), add=False).tolist() == [2, MISSING]
+    assert "d" not in ids
+    assert ids.encode([]).tolist() == []
+
+
+def test_arrays_are_stored_by_player_code():
+    index = PositionIndex.from_events([_sample("b", 20, 2.0), _sample("a", 10, 1.0), _sample("b", 10, 1.0)])
+    index.extend([_sample("c", 5, 0.0), _sample("a", 5, 0.0)])
+
+    assert index.player_ids() == ["b", "a", "c"]
+    assert [ts.tolist() for ts in index.timestamps] == [[10, 20], [5, 10], [5]]
+    assert index.interpolate("b", np.array([15]))[0].tolist() == [[1.5, 0.0, 0.0]]
+    assert index.interpolate(0, np.array([15]))[0].tolist() == [[1.5, 0.0, 0.0]]
+    assert index.closest("a", 9).tolist() == [1.0, 0.0, 0.0]
+    assert index.closest("z", 9) is None
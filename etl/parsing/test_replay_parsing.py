@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from etl import jsonio
+from etl.parsing.replay_parsing import get_match_object
+
+
+@pytest.mark.parametrize("seed", [2, 3, 4, 5, 8, 9])
+def test_players_die_at_their_own_elimination(workdir, seed):
+    from benchmarks.synthetic import generate_match
+
+    generate_match("data/raw", "m1", players=30, duration=600, seed=seed)
+    player_index, frames = get_match_object("m1", hz=1)
+
+    match_path = "data/raw/match_m1"
+    match_start = jsonio.load(f"{match_path}/info.json")["aircraftStartTime"]
+    elims = jsonio.load(f"{match_path}/eliminationEvents.json")
+    # bots are eliminated too, but have no row
+    assert any(e["targetId"] not in player_index for e in elims)
+
+    # a frame holds the state before the events at its own time
+    death_time = {
+        player_index[e["targetId"]]: (e["timestamp"] - match_start) / 1e6
+        for e in elims if e["targetId"] in player_index
+    }
+    for idx in player_index.values():
+        alive = frames[:, idx, 6]
+        expected = np.arange(len(frames)) <= death_time.get(idx, np.inf)
+        assert (alive == 1.0).tolist() == expected.tolist()
@@ -0,0 +1,65 @@
+import pytest
+
+from etl.parsing.rollups import UNKNOWN_WEAPON_TYPE, compute_match_rollups
+
+
+PLAYERS = [{"epic_id": "a"}, {"epic_id": "b"}, {"epic_id": "idle"}]
+DAMAGE = [
+    {"actor_id": "a", "recipient_id": "b", "weapon_type": "rifle", "damage": 30.0, "distance": 10.0, "zone": 1},
+    {"actor_id": "a", "recipient_id": "b", "weapon_type": "rifle", "damage": 20.0, "distance": 30.0, "zone": 2},
+    {"actor_id": "b", "recipient_id": "a", "weapon_type": None, "damage": 5.0, "distance": 5.0, "zone": 2},
+]
+ELIMS = [
+    {"actor_id": "a", "recipient_id": "b", "weapon_type": "rifle", "distance": 30.0, "zone": 2},
+]
+
+
+@pytest.fixture
+def rollups():
+    return compute_match_rollups("m1", PLAYERS, DAMAGE, ELIMS)
+
+
+def test_match_stats(rollups):
+    assert rollups["match_stats"] == [{
+        "match_id": "m1",
+        "players": 3,
+        "damage_dealt": 55.0,
+        "hits": 3,
+        "eliminations": 1,
+        "avg_hit_distance": 15.0,
+        "avg_elim_distance": 30.0,
+    }]
+
+
+def test_every_player_gets_a_row(rollups):
+    per_player = {row["epic_id"]: row for row in rollups["player_match_stats"]}
+    assert set(per_player) == {"a", "b", "idle"}
+
+    a = per_player["a"]
+    assert (a["damage_dealt"], a["damage_taken"], a["hits"], a["eliminations"], a["deaths"]) == (50.0, 5.0, 2, 1, 0)
+    assert a["avg_hit_distance"] == 20.0
+
+    idle = per_player["idle"]
+    assert (idle["damage_dealt"], idle["hits"], idle["eliminations"], idle["deaths"]) == (0, 0, 0, 0)
+    assert idle["avg_hit_distance"] is None
+
+
+def test_unknown_weapons_get_a_placeholder_type(rollups):
+    per_weapon = {(row["epic_id"], row["weapon_type"]): row for row in rollups["player_weapon_stats"]}
+    assert set(per_weapon) == {("a", "rifle"), ("b", UNKNOWN_WEAPON_TYPE)}
+    assert per_weapon[("a", "rifle")]["eliminations"] == 1
+    assert per_weapon[("b", UNKNOWN_WEAPON_TYPE)]["eliminations"] == 0
+
+
+def test_zone_stats(rollups):
+    per_zone = {row["zone"]: row for row in rollups["match_zone_stats"]}
+    assert per_zone[1]["hits"] == 1 and per_zone[1]["eliminations"] == 0
+    assert per_zone[2]["damage_dealt"] == 25.0 and per_zone[2]["eliminations"] == 1
+
+
+def test_match_without_events():
+    rollups = compute_match_rollups("m1", PLAYERS, [], [])
+    assert rollups["match_stats"][0]["avg_hit_distance"] is None
+    assert len(rollups["player_match_stats"]) == 3
+    assert rollups["player_weapon_stats"] == []
+    assert rollups["match_zone_stats"] == []
@@ -14,6 +14,8 @@ import json
 import sys
 from pathlib import Path
 
+from etl import jsonio
+
 
 def normalize_movement_events_file(file_path: Path) -> bool:
     """
@@ -23,8 +25,7 @@ def normalize_movement_events_file(file_path: Path) -> bool:
         True if the file was modified, False otherwise
     """
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = jsonio.load(file_path)
         
         # Check if it needs normalization (is a dict with "events" key)
         if isinstance(data, dict) and "events" in data:
@@ -15,7 +15,7 @@ def build_colors(num_players: int):
 
 
 def compute_bounds(frames, sample_stride: int = 50):
-    if not frames:
+    if len(frames) == 0:
         return (-1, 1, -1, 1)
     sample = frames[::sample_stride]
     xs = np.concatenate([f[:, 0] for f in sample])
@@ -33,7 +33,7 @@ def compute_bounds(frames, sample_stride: int = 50):
 
 
 def summarize_frames(frames, alive_only: bool = False):
-    if not frames:
+    if len(frames) == 0:
         return "No frames."
     sample = frames[:: max(1, len(frames) // 10)]
     xs = np.concatenate([f[:, 0] for f in sample])
@@ -64,7 +64,7 @@ def animate_frames(
     save_gif: str | None = None,
     save_static: str | None = None,
 ):
-    if not frames:
+    if len(frames) == 0:
         raise ValueError("No frames to animate.")
 
     interp = max(1, int(interp))